@@ -1,64 +1,397 @@
 """
 Farm API endpoints.
 """
+from collections.abc import AsyncIterator, Callable
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.compression import negotiate_encoding
 from app.core.config import get_settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_async_sessionmaker
+from app.core.http_cache import etag_matches, http_date, is_not_modified, make_etag
 from app.core.logging import get_logger
-from app.schemas.farm import FarmListResponse, FarmResponse, PointSearchRequest, RadiusSearchRequest
-from app.services.farm_queries import FarmQueryService
+from app.schemas.farm import (
+    BatchLookupRequest,
+    BatchLookupResponse,
+    BatchPointSearchRequest,
+    BatchPointSearchResponse,
+    CountMode,
+    ExportFormat,
+    FarmListResponse,
+    FarmResponse,
+    GeometryMode,
+    NameSearchMode,
+    NameSearchResponse,
+    NearestFarmsResponse,
+    PointSearchRequest,
+    RadiusSearchRequest,
+)
+from app.services.cache import PointLookupCache, get_point_cache
+from app.services.dataset_version import DatasetVersionTracker, get_dataset_version_tracker
+from app.services.document_cache import FarmDocumentCache, get_document_cache
+from app.services.farm_documents import (
+    FarmDocumentLoader,
+    render_farm_document,
+    render_farm_list,
+    render_nearest_list,
+    stream_farm_batch,
+    stream_features,
+)
+from app.services.farm_queries import (
+    AsyncFarmQueryService,
+    FarmPage,
+    GeometryRender,
+    Projection,
+    normalize_search_text,
+)
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.services.tile_cache import get_tile_cache, tile_key
 
 logger = get_logger(__name__)
 router = APIRouter()
 settings = get_settings()
 
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
 
-def _build_farm_response(farm, db: Session) -> FarmResponse:
-    """Helper para montar a resposta da fazenda com geometria GeoJSON."""
-    geojson = FarmQueryService.farm_to_geojson(farm, db)
-    return FarmResponse(
-        ogc_fid=farm.ogc_fid,
-        cod_imovel=farm.cod_imovel,
-        num_area=farm.num_area,
-        municipio=farm.municipio,
-        cod_estado=farm.cod_estado,
-        cod_tema=farm.cod_tema,
-        nom_tema=farm.nom_tema,
-        mod_fiscal=farm.mod_fiscal,
-        ind_status=farm.ind_status,
-        ind_tipo=farm.ind_tipo,
-        des_condic=farm.des_condic,
-        dat_criaca=farm.dat_criaca,
-        dat_atuali=farm.dat_atuali,
-        geometry=geojson,
+# As buscas mudam só com a carga do dataset: o cliente revalida pelo ETag
+SEARCH_CACHE_CONTROL = "no-cache"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.GEOJSON: "application/geo+json",
+}
+EXPORT_RESPONSES = {
+    200: {
+        "description": "Fazendas como Features GeoJSON, em streaming",
+        "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+    }
+}
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Converte o cursor opaco da requisição no ``ogc_fid`` de partida."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Cursor inválido") from None
+
+
+def _projection(document_cache: Optional[FarmDocumentCache]) -> Projection:
+    """Com cache de documentos as buscas retornam só ``ogc_fid``; sem ele, linhas completas."""
+    return Projection.IDS if document_cache is not None else Projection.COLUMNS
+
+
+def _geometry_render(
+    geometry: GeometryMode = GeometryMode.FULL,
+    zoom: Optional[int] = None,
+    precision: Optional[int] = None,
+) -> GeometryRender:
+    """Renderização da geometria pedida, com os padrões do ``.env``."""
+    return GeometryRender(
+        mode=geometry,
+        max_decimal_digits=(
+            precision if precision is not None else settings.geojson_max_decimal_digits
+        ),
+        zoom=zoom if zoom is not None else settings.geometry_simplify_zoom,
+    )
+
+
+def _export_response(
+    sessions: async_sessionmaker[AsyncSession],
+    export_format: ExportFormat,
+    stream: Callable[[AsyncFarmQueryService], AsyncIterator],
+) -> StreamingResponse:
+    """
+    Helper para exportar o resultado de uma busca em streaming.
+
+    A sessão é aberta dentro do corpo da resposta e as linhas vêm de um cursor
+    no servidor, então a memória não cresce com o número de fazendas.
+    """
+
+    async def body():
+        async with sessions() as db:
+            rows = stream(AsyncFarmQueryService(db))
+            async for chunk in stream_features(rows, export_format, settings.export_chunk_bytes):
+                yield chunk
+
+    return StreamingResponse(body(), media_type=EXPORT_MEDIA_TYPES[export_format])
+
+
+async def _build_list_response(
+    result: FarmPage,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count: CountMode,
+    loader: FarmDocumentLoader,
+    etag: str,
+) -> Response:
+    """
+    Helper para montar a resposta paginada, com ``next_cursor`` se houver mais resultados.
+
+    Os documentos das fazendas entram já serializados no corpo da resposta.
+    """
+    next_cursor = encode_cursor(result.last_id) if result.has_more else None
+    metadata = FarmListResponse(
+        total=result.total,
+        total_capped=result.total_capped,
+        count=count,
+        has_more=result.has_more,
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        farms=[],
+    ).model_dump(mode="json", exclude={"farms"})
+
+    documents = await loader.load(result.farms)
+    return Response(
+        render_farm_list(metadata, documents),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": SEARCH_CACHE_CONTROL},
+    )
+
+
+def _search_not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """Resposta ``304`` quando o cliente já tem o resultado dessa busca."""
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": SEARCH_CACHE_CONTROL}
+        )
+    return None
+
+
+@router.get(
+    "/fazendas/tiles/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={
+        200: {"description": "Vector tile (MVT)", "content": {MVT_MEDIA_TYPE: {}}},
+        304: {"description": "Tile não modificado (If-None-Match)"},
+    },
+    tags=["Fazendas"],
+)
+async def get_tile(
+    z: int = Path(..., ge=0, le=22, description="Zoom"),
+    x: int = Path(..., ge=0, description="Coluna do tile"),
+    y: int = Path(..., ge=0, description="Linha do tile"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    tile_cache: Optional[FarmDocumentCache] = Depends(get_tile_cache),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
+):
+    """
+    Vector tile (MVT) com os contornos das fazendas.
+
+    Renderizado pelo PostGIS com ``ST_AsMVT``/``ST_AsMVTGeom``, com
+    simplificação e atributos que dependem do zoom. O ETag deriva da versão
+    do dataset e de z/x/y, então ``If-None-Match`` responde ``304`` sem
+    consultar as fazendas.
+
+    Args:
+        z: Zoom (0 a 22)
+        x: Coluna do tile
+        y: Linha do tile
+
+    Returns:
+        Tile MVT da camada ``fazendas``
+    """
+    if x >= 2**z or y >= 2**z:
+        raise HTTPException(status_code=400, detail="Tile fora da grade do zoom")
+
+    version = await versions.current(db)
+    etag = f'"{version}-{z}-{x}-{y}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.tile_max_age_s}"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if z < settings.tile_min_zoom:
+        # Um tile nesse zoom cobriria o estado inteiro; o mapa deve aproximar
+        return Response(b"", media_type=MVT_MEDIA_TYPE, headers=headers)
+
+    key = tile_key(version, z, x, y)
+    cached = await tile_cache.get_many([key]) if tile_cache else {}
+    tile = cached.get(key)
+    if tile is None:
+        service = AsyncFarmQueryService(db)
+        tile = await service.get_tile(z, x, y, settings.tile_extent, settings.tile_buffer)
+        if tile_cache:
+            await tile_cache.set_many({key: tile})
+
+    return Response(tile, media_type=MVT_MEDIA_TYPE, headers=headers)
+
+
+@router.get(
+    "/fazendas/busca-nome",
+    response_model=NameSearchResponse,
+    responses={304: {"description": "Resultado não modificado (If-None-Match)"}},
+    tags=["Fazendas"],
+)
+async def search_by_name(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=100, description="Código do imóvel ou município"),
+    mode: NameSearchMode = Query(
+        NameSearchMode.SIMILAR,
+        description="similar (tolera erros de digitação) ou prefix (autocompletar)",
+    ),
+    page: int = Query(1, ge=1, description="Número da página"),
+    page_size: int = Query(20, ge=1, le=100, description="Resultados por página"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
+):
+    """
+    Busca fazendas por código do imóvel ou município.
+
+    Não diferencia maiúsculas nem acentos (``sao jose`` encontra "São José").
+    Os resultados vêm ordenados por similaridade de trigramas (``pg_trgm``),
+    sem geometria; use ``GET /fazendas/{cod_imovel}`` para o polígono.
+
+    Args:
+        q: Texto buscado
+        mode: ``similar`` ou ``prefix``
+        page: Número da página
+        page_size: Quantidade de resultados por página
+
+    Returns:
+        Fazendas encontradas com a similaridade de cada uma
+    """
+    logger.info("GET /fazendas/busca-nome - q: %s, mode: %s", q, mode.value)
+
+    version = await versions.current(db)
+    etag = make_etag("busca-nome", version, normalize_search_text(q), mode.value, page, page_size)
+    if (not_modified := _search_not_modified(if_none_match, etag)) is not None:
+        return not_modified
+
+    service = AsyncFarmQueryService(db)
+    rows, has_more = await service.search_by_name(q, mode, page, page_size)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SEARCH_CACHE_CONTROL
+    return NameSearchResponse(
+        mode=mode,
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        results=[row._asdict() for row in rows],
     )
 
 
-@router.get("/fazendas/{farm_id}", response_model=FarmResponse, tags=["Fazendas"])
-async def get_farm(farm_id: str, db: Session = Depends(get_db)):
+@router.get(
+    "/fazendas/{farm_id}",
+    response_model=FarmResponse,
+    responses={304: {"description": "Fazenda não modificada (If-None-Match/If-Modified-Since)"}},
+    tags=["Fazendas"],
+)
+async def get_farm(
+    farm_id: str,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    document_cache: Optional[FarmDocumentCache] = Depends(get_document_cache),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
+):
     """
     Busca uma fazenda específica por ID.
 
+    O ETag deriva de ``dat_atuali`` e da versão do dataset, e ``Last-Modified``
+    é a data da última carga. Requisições condicionais (``If-None-Match`` /
+    ``If-Modified-Since``) respondem ``304`` sem carregar a geometria. Com
+    ``DOCUMENT_CACHE_PRECOMPRESSED`` o documento é servido já comprimido do cache.
+
     Args:
         farm_id: ID da fazenda
 
     Returns:
         Detalhes da fazenda com geometria em formato GeoJSON
     """
-    logger.info(f"GET /fazendas/{farm_id}")
+    logger.info("GET /fazendas/%s", farm_id)
+
+    version = await versions.current(db)
+    service = AsyncFarmQueryService(db)
+    revision = await service.get_farm_revision(farm_id)
 
-    service = FarmQueryService(db)
-    farm = service.get_farm_by_id(farm_id)
+    if not revision:
+        logger.warning("Farm %s not found", farm_id)
+        raise HTTPException(status_code=404, detail="Fazenda não encontrada")
+
+    render = _geometry_render()
+    etag = make_etag(version, revision.ogc_fid, revision.dat_atuali, render.variant)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.http_cache_max_age_s}"}
+    if versions.updated_at is not None:
+        headers["Last-Modified"] = http_date(versions.updated_at)
+
+    if is_not_modified(etag, versions.updated_at, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+
+    loader = FarmDocumentLoader(db, document_cache, version, render)
+    encoding = None
+    if settings.compression_enabled and settings.document_cache_precompressed and document_cache:
+        encoding = negotiate_encoding(accept_encoding)
+
+    if encoding:
+        document = await loader.load_compressed(
+            revision.ogc_fid, encoding, settings.compression_levels
+        )
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+        headers["ETag"] = f"W/{etag}"
+    else:
+        documents = await loader.load([revision.ogc_fid])
+        document = documents[0] if documents else None
 
-    if not farm:
-        logger.warning(f"Farm {farm_id} not found")
+    if document is None:
         raise HTTPException(status_code=404, detail="Fazenda não encontrada")
 
-    return _build_farm_response(farm, db)
+    return Response(document, media_type="application/json", headers=headers)
+
+
+@router.post("/fazendas/lote", response_model=BatchLookupResponse, tags=["Fazendas"])
+async def get_farms_batch(
+    request: BatchLookupRequest,
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
+):
+    """
+    Busca várias fazendas por ID numa única consulta.
+
+    Resolve todos os IDs com ``= ANY(:ids)`` e envia as fazendas em streaming,
+    à medida que são lidas do banco. IDs sem fazenda correspondente são
+    listados em ``missing``.
+
+    Args:
+        request: IDs das fazendas e a chave usada (``cod_imovel`` ou ``ogc_fid``)
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
+
+    Returns:
+        Fazendas encontradas e IDs ausentes
+    """
+    logger.info("POST /fazendas/lote - %d IDs por %s", len(request.ids), request.id_type.value)
+
+    render = _geometry_render(geometry, zoom, precision)
+
+    async def body():
+        async with sessions() as db:
+            service = AsyncFarmQueryService(db)
+            rows = service.stream_farms_by_keys(request.ids, request.id_type, render)
+            async for chunk in stream_farm_batch(rows, request.ids, request.id_type):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.post("/fazendas/busca-ponto", response_model=FarmListResponse, tags=["Fazendas"])
@@ -66,34 +399,259 @@ async def search_by_point(
     request: PointSearchRequest,
     page: int = Query(1, ge=1, description="Número da página"),
     page_size: int = Query(50, ge=1, le=100, description="Resultados por página"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor opaco de next_cursor (paginação por chave; ignora page)"
+    ),
+    count: CountMode = Query(
+        CountMode.EXACT,
+        description="Contagem do total: exact, estimate (limitada) ou none (apenas has_more)",
+    ),
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    point_cache: Optional[PointLookupCache] = Depends(get_point_cache),
+    document_cache: Optional[FarmDocumentCache] = Depends(get_document_cache),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
 ):
     """
     Busca fazendas que contêm um ponto específico.
 
     Utiliza PostGIS ST_Contains para encontrar fazendas cujo polígono contém as coordenadas informadas.
+    Com ``POINT_CACHE_ENABLED`` o ponto é arredondado para ``POINT_CACHE_PRECISION``
+    casas decimais e os ``ogc_fid`` encontrados ficam em cache até a próxima
+    carga do dataset; sem ele a busca usa as coordenadas exatas.
+    O ETag deriva dos parâmetros normalizados e da versão do dataset; com
+    ``If-None-Match`` igual a busca responde ``304`` sem consultar as fazendas.
 
     Args:
         request: Coordenadas do ponto (latitude, longitude)
         page: Número da página para paginação
         page_size: Quantidade de resultados por página
+        cursor: Cursor opaco retornado em ``next_cursor`` pela página anterior
+        count: Estratégia de contagem do total
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
 
     Returns:
         Lista de fazendas que contêm o ponto
     """
-    logger.info(f"POST /fazendas/busca-ponto - lat: {request.latitude}, lon: {request.longitude}")
+    logger.info(
+        "POST /fazendas/busca-ponto - lat: %s, lon: %s", request.latitude, request.longitude
+    )
+
+    after_id = _decode_cursor(cursor)
+    render = _geometry_render(geometry, zoom, precision)
+    page_size = min(page_size, settings.max_page_size)
 
-    service = FarmQueryService(db)
-    farms, total = service.search_by_point(
+    version = await versions.current(db)
+    etag = make_etag(
+        "busca-ponto",
+        version,
+        request.latitude,
+        request.longitude,
+        None if cursor else page,
+        page_size,
+        cursor,
+        count.value,
+        render.variant,
+    )
+    if (not_modified := _search_not_modified(if_none_match, etag)) is not None:
+        return not_modified
+
+    service = AsyncFarmQueryService(db, point_cache=point_cache, dataset_version=version)
+    result = await service.search_by_point(
         latitude=request.latitude,
         longitude=request.longitude,
         page=page,
-        page_size=min(page_size, settings.max_page_size),
+        page_size=page_size,
+        projection=_projection(document_cache),
+        render=render,
+        after_id=after_id,
+        count_mode=count,
+        count_cap=settings.count_estimate_cap,
+    )
+
+    loader = FarmDocumentLoader(db, document_cache, version, render)
+    return await _build_list_response(result, page, page_size, cursor, count, loader, etag)
+
+
+@router.post("/fazendas/busca-proximas", response_model=NearestFarmsResponse, tags=["Fazendas"])
+async def search_nearest(
+    request: PointSearchRequest,
+    k: int = Query(10, ge=1, le=100, description="Número de fazendas mais próximas"),
+    max_distance_m: Optional[float] = Query(
+        None, gt=0, le=100_000, description="Distância máxima ao ponto, em metros"
+    ),
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    document_cache: Optional[FarmDocumentCache] = Depends(get_document_cache),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
+):
+    """
+    Busca as ``k`` fazendas mais próximas de um ponto.
+
+    As fazendas vêm do índice espacial na ordem do operador ``<->`` do PostGIS
+    e são reordenadas pela distância geodésica exata, em metros (0 para a
+    fazenda que contém o ponto). O custo depende de ``k``, não do raio, então
+    não é preciso repetir a busca por raio com raios cada vez maiores.
+
+    Args:
+        request: Coordenadas do ponto (latitude, longitude)
+        k: Quantidade de fazendas retornadas
+        max_distance_m: Corte opcional de distância (pode retornar menos que ``k``)
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
+
+    Returns:
+        Fazendas mais próximas com a distância de cada uma
+    """
+    logger.info(
+        "POST /fazendas/busca-proximas - lat: %s, lon: %s, k: %d",
+        request.latitude,
+        request.longitude,
+        k,
     )
 
-    farm_responses = [_build_farm_response(farm, db) for farm in farms]
+    render = _geometry_render(geometry, zoom, precision)
+    version = await versions.current(db)
+    etag = make_etag(
+        "busca-proximas",
+        version,
+        request.latitude,
+        request.longitude,
+        k,
+        max_distance_m,
+        render.variant,
+    )
+    if (not_modified := _search_not_modified(if_none_match, etag)) is not None:
+        return not_modified
+
+    projection = _projection(document_cache)
+    service = AsyncFarmQueryService(db)
+    rows = await service.search_nearest(
+        latitude=request.latitude,
+        longitude=request.longitude,
+        k=k,
+        max_distance_m=max_distance_m,
+        projection=projection,
+        render=render,
+    )
+
+    if projection == Projection.IDS:
+        loader = FarmDocumentLoader(db, document_cache, version, render)
+        documents = await loader.load_by_id([row.ogc_fid for row in rows])
+        results = [
+            (row.distance_m, documents[row.ogc_fid]) for row in rows if row.ogc_fid in documents
+        ]
+    else:
+        results = [(row.distance_m, render_farm_document(row)) for row in rows]
+
+    metadata = {"k": k, "max_distance_m": max_distance_m}
+    return Response(
+        render_nearest_list(metadata, results),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": SEARCH_CACHE_CONTROL},
+    )
+
+
+@router.post("/fazendas/busca-pontos", response_model=BatchPointSearchResponse, tags=["Fazendas"])
+async def search_by_points(
+    request: BatchPointSearchRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Busca as fazendas que contêm cada um de vários pontos.
+
+    Resolve todos os pontos numa única junção espacial (``unnest`` das
+    coordenadas com ``ST_Covers``), para trilhas de GPS e grades de amostragem.
+
+    Args:
+        request: Pontos como pares [latitude, longitude]
+
+    Returns:
+        ``ogc_fid`` das fazendas que cobrem cada ponto, na ordem da requisição
+    """
+    logger.info("POST /fazendas/busca-pontos - %d pontos", len(request.points))
+
+    service = AsyncFarmQueryService(db)
+    results = await service.search_by_points(request.points)
+    return BatchPointSearchResponse(results=results, matched=sum(1 for ids in results if ids))
 
-    return FarmListResponse(total=total, page=page, page_size=page_size, farms=farm_responses)
+
+@router.post(
+    "/fazendas/busca-ponto/exportar",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES,
+    tags=["Fazendas"],
+)
+async def export_by_point(
+    request: PointSearchRequest,
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON,
+        alias="format",
+        description="ndjson (uma Feature por linha) ou geojson (FeatureCollection)",
+    ),
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
+):
+    """
+    Exporta todas as fazendas que contêm um ponto, em streaming.
+
+    Args:
+        request: Coordenadas do ponto (latitude, longitude)
+        export_format: ``ndjson`` ou ``geojson``
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
+
+    Returns:
+        Features GeoJSON das fazendas que contêm o ponto
+    """
+    logger.info(
+        "POST /fazendas/busca-ponto/exportar - lat: %s, lon: %s, format: %s",
+        request.latitude,
+        request.longitude,
+        export_format.value,
+    )
+
+    render = _geometry_render(geometry, zoom, precision)
+    return _export_response(
+        sessions,
+        export_format,
+        lambda service: service.stream_by_point(
+            request.latitude, request.longitude, render, settings.export_yield_per
+        ),
+    )
 
 
 @router.post("/fazendas/busca-raio", response_model=FarmListResponse, tags=["Fazendas"])
@@ -104,12 +662,34 @@ async def search_by_radius(
     name: Optional[str] = Query(None, description="Filtrar por nome da fazenda (busca parcial)"),
     min_area: Optional[float] = Query(None, ge=0, description="Área mínima em hectares"),
     max_area: Optional[float] = Query(None, ge=0, description="Área máxima em hectares"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor opaco de next_cursor (paginação por chave; ignora page)"
+    ),
+    count: CountMode = Query(
+        CountMode.EXACT,
+        description="Contagem do total: exact, estimate (limitada) ou none (apenas has_more)",
+    ),
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    document_cache: Optional[FarmDocumentCache] = Depends(get_document_cache),
+    versions: DatasetVersionTracker = Depends(get_dataset_version_tracker),
 ):
     """
     Busca fazendas dentro de um raio a partir de um ponto.
 
     Utiliza PostGIS ST_DWithin para encontrar fazendas dentro da distância especificada.
+    O ETag deriva dos parâmetros normalizados e da versão do dataset; com
+    ``If-None-Match`` igual a busca responde ``304`` sem consultar as fazendas.
 
     Args:
         request: Coordenadas do ponto e raio de busca em quilômetros
@@ -118,27 +698,133 @@ async def search_by_radius(
         name: Filtro opcional de nome (busca parcial)
         min_area: Filtro opcional de área mínima
         max_area: Filtro opcional de área máxima
+        cursor: Cursor opaco retornado em ``next_cursor`` pela página anterior
+        count: Estratégia de contagem do total
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
 
     Returns:
         Lista de fazendas dentro do raio especificado
     """
     logger.info(
-        f"POST /fazendas/busca-raio - lat: {request.latitude}, "
-        f"lon: {request.longitude}, radius: {request.raio_km}km"
+        "POST /fazendas/busca-raio - lat: %s, lon: %s, radius: %skm",
+        request.latitude,
+        request.longitude,
+        request.raio_km,
     )
 
-    service = FarmQueryService(db)
-    farms, total = service.search_by_radius(
+    after_id = _decode_cursor(cursor)
+    render = _geometry_render(geometry, zoom, precision)
+    page_size = min(page_size, settings.max_page_size)
+
+    version = await versions.current(db)
+    etag = make_etag(
+        "busca-raio",
+        version,
+        request.latitude,
+        request.longitude,
+        request.raio_km,
+        normalize_search_text(name) if name else None,
+        min_area,
+        max_area,
+        None if cursor else page,
+        page_size,
+        cursor,
+        count.value,
+        render.variant,
+    )
+    if (not_modified := _search_not_modified(if_none_match, etag)) is not None:
+        return not_modified
+
+    service = AsyncFarmQueryService(db)
+    result = await service.search_by_radius(
         latitude=request.latitude,
         longitude=request.longitude,
         radius_km=request.raio_km,
         page=page,
-        page_size=min(page_size, settings.max_page_size),
+        page_size=page_size,
         name_filter=name,
         min_area=min_area,
         max_area=max_area,
+        projection=_projection(document_cache),
+        render=render,
+        after_id=after_id,
+        count_mode=count,
+        count_cap=settings.count_estimate_cap,
     )
 
-    farm_responses = [_build_farm_response(farm, db) for farm in farms]
+    loader = FarmDocumentLoader(db, document_cache, version, render)
+    return await _build_list_response(result, page, page_size, cursor, count, loader, etag)
+
+
+@router.post(
+    "/fazendas/busca-raio/exportar",
+    response_class=StreamingResponse,
+    responses=EXPORT_RESPONSES,
+    tags=["Fazendas"],
+)
+async def export_by_radius(
+    request: RadiusSearchRequest,
+    name: Optional[str] = Query(None, description="Filtrar por nome da fazenda (busca parcial)"),
+    min_area: Optional[float] = Query(None, ge=0, description="Área mínima em hectares"),
+    max_area: Optional[float] = Query(None, ge=0, description="Área máxima em hectares"),
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON,
+        alias="format",
+        description="ndjson (uma Feature por linha) ou geojson (FeatureCollection)",
+    ),
+    geometry: GeometryMode = Query(
+        GeometryMode.FULL,
+        description="Geometria retornada: full, simplified, bbox, centroid ou none",
+    ),
+    zoom: Optional[int] = Query(
+        None, ge=0, le=22, description="Zoom que define a tolerância de geometry=simplified"
+    ),
+    precision: Optional[int] = Query(
+        None, ge=0, le=15, description="Casas decimais das coordenadas (truncadas no banco)"
+    ),
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
+):
+    """
+    Exporta todas as fazendas dentro de um raio, em streaming.
+
+    Sem paginação: as fazendas são lidas por um cursor no servidor e enviadas
+    à medida que chegam, com memória constante mesmo para raios grandes.
 
-    return FarmListResponse(total=total, page=page, page_size=page_size, farms=farm_responses)
+    Args:
+        request: Coordenadas do ponto e raio de busca em quilômetros
+        name: Filtro opcional de nome (busca parcial)
+        min_area: Filtro opcional de área mínima
+        max_area: Filtro opcional de área máxima
+        export_format: ``ndjson`` ou ``geojson``
+        geometry: Forma da geometria de cada fazenda
+        zoom: Zoom da simplificação (``geometry=simplified``)
+        precision: Casas decimais das coordenadas
+
+    Returns:
+        Features GeoJSON das fazendas dentro do raio
+    """
+    logger.info(
+        "POST /fazendas/busca-raio/exportar - lat: %s, lon: %s, radius: %skm, format: %s",
+        request.latitude,
+        request.longitude,
+        request.raio_km,
+        export_format.value,
+    )
+
+    render = _geometry_render(geometry, zoom, precision)
+    return _export_response(
+        sessions,
+        export_format,
+        lambda service: service.stream_by_radius(
+            request.latitude,
+            request.longitude,
+            request.raio_km,
+            name_filter=name,
+            min_area=min_area,
+            max_area=max_area,
+            render=render,
+            yield_per=settings.export_yield_per,
+        ),
+    )
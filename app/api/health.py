@@ -3,10 +3,10 @@ Health check endpoint.
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.core.logging import get_logger
 from app.schemas.farm import HealthResponse
 
@@ -16,7 +16,7 @@ settings = get_settings()
 
 
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """
     teste de conexão com banco de dados.
 
@@ -25,7 +25,7 @@ async def health_check(db: Session = Depends(get_db)):
     """
     try:
         # Test database connection
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
         logger.info("Health check passed")
     except Exception as err:
@@ -0,0 +1,119 @@
+"""
+Internal diagnostics endpoints.
+"""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.db import pool_status, slow_query_recorder
+from app.core.metrics import registry
+from app.schemas.farm import CacheStatsResponse, PoolStatusResponse, SlowQueryResponse
+from app.services.cache import point_cache
+from app.services.document_cache import document_cache
+from app.services.tile_cache import tile_cache
+
+settings = get_settings()
+
+
+def _check_token(authorization: Optional[str]) -> None:
+    """Exige ``Authorization: Bearer INTERNAL_TOKEN`` (``401`` caso contrário)."""
+    expected = f"Bearer {settings.internal_token}".encode()
+    if authorization is None or not hmac.compare_digest(authorization.encode(), expected):
+        raise HTTPException(
+            status_code=401, detail="Token inválido", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+def require_internal_access(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Libera ``/internal/*`` em DEBUG ou com ``Authorization: Bearer INTERNAL_TOKEN``.
+
+    Eles expõem SQL com parâmetros (coordenadas e textos buscados) e planos de
+    execução. Sem token configurado e fora de DEBUG respondem ``404``.
+    """
+    if settings.debug:
+        return
+    if not settings.internal_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    _check_token(authorization)
+
+
+def require_metrics_access(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Libera ``/metrics`` sem token por padrão, para o scrape do Prometheus.
+
+    As métricas trazem só rotas e agregados. Com ``INTERNAL_TOKEN`` configurado
+    o scrape precisa enviá-lo (``authorization`` no scrape config).
+    """
+    if settings.debug or not settings.internal_token:
+        return
+    _check_token(authorization)
+
+
+router = APIRouter()
+diagnostics = APIRouter(dependencies=[Depends(require_internal_access)])
+
+
+@diagnostics.get("/internal/pool", response_model=PoolStatusResponse, tags=["Interno"])
+async def get_pool_status():
+    """
+    Estado do pool de conexões da API.
+
+    Returns:
+        Conexões em uso, overflow e tempo de espera por conexão
+    """
+    return PoolStatusResponse(**pool_status())
+
+
+@diagnostics.get("/internal/cache", response_model=dict[str, CacheStatsResponse], tags=["Interno"])
+async def get_cache_stats():
+    """
+    Contadores dos caches em memória do processo.
+
+    Returns:
+        Acertos, falhas e descartes de cada cache
+    """
+    stats = {"point": point_cache.stats()}
+    if document_cache is not None:
+        stats["document"] = document_cache.stats()
+    if tile_cache is not None:
+        stats["tile"] = tile_cache.stats()
+    return stats
+
+
+@diagnostics.get("/internal/slow-queries", response_model=list[SlowQueryResponse], tags=["Interno"])
+async def get_slow_queries(limit: int = Query(20, ge=1, le=1000)):
+    """
+    Últimas consultas acima de SLOW_QUERY_THRESHOLD_MS.
+
+    Args:
+        limit: Quantidade de consultas retornadas (mais recentes primeiro)
+
+    Returns:
+        SQL, parâmetros, duração e, quando amostrado, o plano do EXPLAIN ANALYZE
+        com as tabelas lidas por seq scan
+    """
+    return slow_query_recorder.entries()[:limit]
+
+
+router.include_router(diagnostics)
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["Interno"],
+    dependencies=[Depends(require_metrics_access)],
+)
+async def get_metrics():
+    """
+    Métricas por rota no formato de texto do Prometheus.
+
+    Returns:
+        Latência, consultas e tempo de banco, linhas, bytes enviados e tempo
+        de serialização dos documentos
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
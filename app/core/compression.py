@@ -0,0 +1,203 @@
+"""
+Compressão das respostas HTTP (gzip; brotli e zstd quando instalados).
+"""
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+
+@dataclass(frozen=True)
+class CompressionLevels:
+    """Nível de compressão de cada algoritmo."""
+
+    gzip: int = 6
+    brotli: int = 4
+    zstd: int = 3
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Codificações suportadas, em ordem de preferência do servidor."""
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], encodings: Optional[tuple[str, ...]] = None
+) -> Optional[str]:
+    """
+    Escolhe a codificação a partir do ``Accept-Encoding`` do cliente.
+
+    Entre as aceitas (q > 0), vence a de maior ``q``; no empate, a ordem de
+    preferência do servidor.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings or available_encodings():
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Interface comum (``compress``/``flush``) aos compressores incrementais."""
+
+    def __init__(self, encoding: str, levels: CompressionLevels):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=levels.brotli)
+            self.compress = compressor.process
+            self.flush = compressor.finish
+        elif encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=levels.zstd).compressobj()
+            self.compress = compressor.compress
+            self.flush = compressor.flush
+        else:
+            compressor = zlib.compressobj(levels.gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress = compressor.compress
+            self.flush = compressor.flush
+
+
+def compress(data: bytes, encoding: str, levels: Optional[CompressionLevels] = None) -> bytes:
+    """Comprime ``data`` de uma vez na codificação informada."""
+    levels = levels or CompressionLevels()
+    if encoding == "br":
+        return brotli.compress(data, quality=levels.brotli)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=levels.zstd).compress(data)
+    return gzip.compress(data, compresslevel=levels.gzip, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Comprime as respostas conforme o ``Accept-Encoding`` do cliente.
+
+    Respostas menores que ``minimum_size`` (num único bloco) saem sem
+    compressão. Respostas em streaming são comprimidas bloco a bloco. Respostas
+    que já trazem ``Content-Encoding`` (documentos pré-comprimidos) passam
+    intactas.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        levels: Optional[CompressionLevels] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels or CompressionLevels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size, self.levels)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Comprime a resposta de uma requisição na codificação negociada."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int, levels: CompressionLevels):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.levels = levels
+        self.send: Send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # Já comprimida, sem corpo ou não modificada: envia como está
+            self.passthrough = "content-encoding" in headers or message["status"] in (204, 304)
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # Os bytes enviados mudam com a codificação: o ETag passa a ser fraco
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            self.compressor = _Compressor(self.encoding, self.levels)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
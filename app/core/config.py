@@ -2,6 +2,8 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.core.compression import CompressionLevels
+
 
 class Settings(BaseSettings):
     """Configurações da aplicação."""
@@ -10,6 +12,12 @@ class Settings(BaseSettings):
     app_name: str = "MeuAT Fazendas API"
     app_version: str = "1.0.0"
     debug: bool = False
+    # Bearer token de /internal/* (vazio: só com DEBUG); se definido, /metrics também o exige
+    internal_token: str = ""
+
+    # Logs
+    log_queue_size: int = 10_000  # Fila do QueueListener; 0 escreve direto no stdout
+    log_info_sample_rate: float = 1.0  # Fração mantida das linhas INFO por chamada
 
     # Configurações do Banco de Dados
     postgres_user: str = "postgres"
@@ -18,9 +26,67 @@ class Settings(BaseSettings):
     postgres_port: int = 5432
     postgres_db: str = "meuat_fazendas"
 
+    # Pool de conexões
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Espera máxima por uma conexão (segundos)
+    db_pool_recycle: int = 1800  # Recicla conexões mais antigas (segundos); -1 desliga
+    db_pool_pre_ping: bool = True  # Ping a cada checkout; False confia no recycle
+    db_statement_timeout_ms: int = 0  # statement_timeout das consultas; 0 desliga
+
+    # Consultas lentas (log + buffer em /internal/slow-queries)
+    slow_query_threshold_ms: int = 500  # 0 desliga
+    slow_query_buffer_size: int = 100  # Últimas consultas lentas guardadas
+    slow_query_explain_sample_rate: float = 0.1  # Fração com EXPLAIN (ANALYZE, BUFFERS)
+    slow_query_explain_timeout_ms: int = 10_000  # statement_timeout do EXPLAIN ANALYZE
+
     # Paginação
     default_page_size: int = 50
     max_page_size: int = 100
+    count_estimate_cap: int = 1000  # Limite do count=estimate
+
+    # Cache de busca por ponto (ogc_fids por coordenada arredondada)
+    point_cache_enabled: bool = False  # Arredonda o ponto da busca (opt-in)
+    point_cache_size: int = 10_000
+    point_cache_ttl_s: float = 300
+    point_cache_precision: int = 5  # Casas decimais (5 ≈ 1,1 m)
+
+    # Cache de documentos de fazendas (JSON pré-serializado)
+    document_cache_backend: str = "memory"  # memory | redis | none
+    document_cache_max_bytes: int = 256 * 1024 * 1024  # Limite total (memory)
+    document_cache_max_item_bytes: int = 8 * 1024 * 1024  # Documentos maiores não são cacheados
+    document_cache_ttl_s: int = 3600  # TTL no Redis
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Versão do dataset (bump pelo seed); relida do banco a cada N segundos
+    dataset_version_ttl_s: float = 5
+
+    # GeoJSON
+    geojson_max_decimal_digits: int = 9  # maxdecimaldigits do ST_AsGeoJSON
+    geometry_simplify_zoom: int = 12  # Zoom padrão de geometry=simplified
+
+    # Compressão das respostas (gzip; br e zstd se brotli/zstandard estiverem instalados)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # Respostas menores saem sem compressão
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    document_cache_precompressed: bool = False  # Guarda também os documentos comprimidos
+
+    # Cache HTTP
+    http_cache_max_age_s: int = 60  # Cache-Control de GET /fazendas/{id}
+
+    # Vector tiles (MVT)
+    tile_min_zoom: int = 6  # Abaixo disso os tiles saem vazios (estado inteiro num tile)
+    tile_extent: int = 4096  # Resolução interna do tile
+    tile_buffer: int = 64  # Margem, em unidades do tile, para não cortar contornos
+    tile_cache_max_bytes: int = 128 * 1024 * 1024  # 0 desliga o cache de tiles
+    tile_cache_max_item_bytes: int = 4 * 1024 * 1024
+    tile_max_age_s: int = 3600  # Cache-Control dos tiles
+
+    # Exportação em streaming
+    export_yield_per: int = 1000  # Linhas lidas do cursor por vez
+    export_chunk_bytes: int = 64 * 1024  # Tamanho dos blocos enviados ao cliente
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -28,6 +94,14 @@ class Settings(BaseSettings):
         extra="ignore",  # Ignora campos extras do .env
     )
 
+    @property
+    def compression_levels(self) -> CompressionLevels:
+        return CompressionLevels(
+            gzip=self.compression_gzip_level,
+            brotli=self.compression_brotli_quality,
+            zstd=self.compression_zstd_level,
+        )
+
     @property
     def database_url(self) -> str:
         """Obtém URL de conexão do banco."""
@@ -36,6 +110,11 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """Obtém URL de conexão do banco para o driver assíncrono (asyncpg)."""
+        return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,21 +1,140 @@
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import instrument_engine
+from app.core.slow_queries import SlowQueryRecorder
 
 settings = get_settings()
 
-# Cria engine do banco
-engine = create_engine(settings.database_url, pool_pre_ping=True, echo=settings.debug)
+
+class PoolMetrics:
+    """Métricas acumuladas de checkout do pool de conexões."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_s += seconds
+            self.wait_max_s = max(self.wait_max_s, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            avg = self.wait_total_s / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(avg * 1000, 3),
+                "wait_ms_max": round(self.wait_max_s * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Pool assíncrono que mede a espera por conexão e os timeouts de checkout."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def _engine_options() -> dict:
+    """Opções de pool compartilhadas pelas engines síncrona e assíncrona."""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "echo": settings.debug,
+    }
+
+
+def _statement_timeout_args(asyncpg: bool) -> dict:
+    """``connect_args`` que aplicam o ``statement_timeout`` a cada conexão."""
+    timeout_ms = settings.db_statement_timeout_ms
+    if not timeout_ms:
+        return {}
+    if asyncpg:
+        return {"server_settings": {"statement_timeout": str(timeout_ms)}}
+    return {"options": f"-c statement_timeout={timeout_ms}"}
+
+
+# Cria engine do banco (síncrona: seed, testes e benchmarks)
+engine = create_engine(
+    settings.database_url,
+    connect_args=_statement_timeout_args(asyncpg=False),
+    **_engine_options(),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona (asyncpg) usada pelas rotas da API
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_statement_timeout_args(asyncpg=True),
+    **_engine_options(),
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Tempo de banco e linhas por requisição (ver app.core.metrics)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Consultas lentas com plano de execução amostrado (ver app.core.slow_queries)
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=settings.slow_query_threshold_ms,
+    capacity=settings.slow_query_buffer_size,
+    explain_sample_rate=settings.slow_query_explain_sample_rate,
+    explain_timeout_ms=settings.slow_query_explain_timeout_ms,
+)
+if settings.slow_query_threshold_ms:
+    slow_query_recorder.attach(engine)
+    slow_query_recorder.attach(async_engine)
+
 Base = declarative_base()
 
 
+def pool_status() -> dict:
+    """Estado atual do pool da engine assíncrona mais as métricas de espera."""
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+        **pool_metrics.snapshot(),
+    }
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependência para obter sessão do banco.
@@ -28,3 +147,25 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependência para obter a fábrica de sessões assíncronas.
+
+    Usada por respostas em streaming, que leem do banco depois que as
+    dependências com ``yield`` já foram encerradas e por isso abrem a
+    própria sessão.
+    """
+    return AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependência para obter sessão assíncrona do banco.
+
+    Yields:
+        Sessão assíncrona do banco de dados
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
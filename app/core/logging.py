@@ -1,19 +1,43 @@
 """
 Structured logging configuration.
+
+Em modo fila (``queue_size > 0``) os handlers só enfileiram o registro; a
+formatação (``%`` da mensagem e JSON) e a escrita no stdout acontecem numa
+thread do ``QueueListener``, fora do event loop.
 """
-import json
+import atexit
 import logging
+import queue
+import random
 import sys
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.serialization import dumps
+
+# Loggers com uma linha INFO por chamada, sujeitos à amostragem
+SAMPLED_LOGGERS = ("app.api.farms", "app.services.farm_queries", "app.services.farm_documents")
 
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured JSON logs."""
 
+    _second: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """Horário UTC do registro; o prefixo até os segundos é reaproveitado."""
+        second, prefix = self._second
+        if int(created) != second:
+            second = int(created)
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as structured JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -27,29 +51,95 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
 
-        return json.dumps(log_data)
+        return dumps(log_data, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Mantém só ``rate`` dos registros INFO (e abaixo); avisos e erros passam sempre."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` que enfileira o registro sem formatá-lo.
+
+    O ``QueueHandler`` padrão formata a mensagem na thread que loga; aqui o
+    registro segue intacto (a fila é do próprio processo) e a formatação fica
+    com os handlers do listener. Com a fila cheia o registro é descartado em
+    vez de bloquear a requisição.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
 
+_listener: Optional[QueueListener] = None
 
-def setup_logging(level: str = "INFO") -> None:
+
+def stop_log_listener() -> None:
+    """Esvazia a fila e encerra a thread do listener, se houver."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_log_listener)
+
+
+def setup_logging(level: str = "INFO", queue_size: int = 0, info_sample_rate: float = 1.0) -> None:
     """
     Setup structured logging for the application.
 
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        queue_size: Capacidade da fila de logs; 0 escreve direto no stdout
+        info_sample_rate: Fração mantida das linhas INFO de ``SAMPLED_LOGGERS``
     """
+    global _listener
+
     # Get root logger
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, level.upper()))
 
     # Remove existing handlers
     logger.handlers.clear()
+    stop_log_listener()
 
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(StructuredFormatter())
 
-    # Add handler to logger
-    logger.addHandler(console_handler)
+    if queue_size > 0:
+        log_queue = queue.Queue(queue_size)
+        _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(LazyQueueHandler(log_queue))
+    else:
+        # Add handler to logger
+        logger.addHandler(console_handler)
+
+    for name in SAMPLED_LOGGERS:
+        sampled = logging.getLogger(name)
+        sampled.filters = [f for f in sampled.filters if not isinstance(f, SamplingFilter)]
+        if info_sample_rate < 1:
+            sampled.addFilter(SamplingFilter(info_sample_rate))
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,289 @@
+"""
+Métricas por rota no formato de texto do Prometheus.
+
+O ``MetricsMiddleware`` mede cada requisição; os hooks da engine SQLAlchemy
+(``instrument_engine``) e a serialização dos documentos acumulam o tempo de
+banco, as linhas e o tempo de renderização da requisição corrente num
+``ContextVar``.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import get_logger
+
+access_logger = get_logger("app.access")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [
+        f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values, strict=True)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Contador monotônico com rótulos."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+                for labels, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos (``_bucket``, ``_sum`` e ``_count``)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+                    cumulative += count
+                    le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                label_str = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_str} {total[0]}")
+                lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas expostas em ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+
+    def register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+ROUTE_LABELS = ("method", "route")
+
+http_requests = registry.register(
+    Counter("http_requests_total", "Requisições HTTP", ("method", "route", "status"))
+)
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "Latência das requisições", ROUTE_LABELS)
+)
+http_response_bytes = registry.register(
+    Histogram(
+        "http_response_size_bytes", "Bytes enviados por resposta", ROUTE_LABELS, BYTES_BUCKETS
+    )
+)
+db_queries = registry.register(
+    Histogram(
+        "db_queries_per_request", "Consultas ao banco por requisição", ROUTE_LABELS, COUNT_BUCKETS
+    )
+)
+db_duration = registry.register(
+    Histogram("db_query_duration_seconds", "Tempo de banco por requisição", ROUTE_LABELS)
+)
+db_rows = registry.register(Counter("db_rows_total", "Linhas retornadas pelo banco", ROUTE_LABELS))
+render_duration = registry.register(
+    Histogram(
+        "document_render_duration_seconds",
+        "Tempo de serialização dos documentos GeoJSON por requisição",
+        ROUTE_LABELS,
+    )
+)
+
+
+@dataclass
+class RequestStats:
+    """Acumuladores da requisição corrente."""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    render_seconds: float = 0.0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def record_render(seconds: float) -> None:
+    """Soma tempo de serialização de documentos à requisição corrente."""
+    stats = request_stats.get()
+    if stats is not None:
+        stats.render_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount and rowcount > 0:
+            stats.rows += rowcount
+
+
+def _handle_error(exception_context) -> None:
+    # Consultas que falharam não chegam ao after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra os hooks de tempo de consulta numa engine (síncrona)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _route_template(scope: Scope) -> str:
+    """Caminho da rota (``/fazendas/{farm_id}``), para não criar uma série por ID."""
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "desconhecida"
+
+
+class MetricsMiddleware:
+    """
+    Mede cada requisição HTTP e registra o log de acesso estruturado.
+
+    Deve ser o middleware mais externo, para contar os bytes efetivamente
+    enviados (depois da compressão).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+        response_bytes = 0
+        start = time.perf_counter()
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            duration = time.perf_counter() - start
+            request_stats.reset(token)
+            self._record(scope, status, duration, response_bytes, stats)
+
+    @staticmethod
+    def _record(
+        scope: Scope, status: int, duration: float, response_bytes: int, stats: RequestStats
+    ) -> None:
+        route = _route_template(scope)
+        labels = (scope["method"], route)
+        http_requests.inc((*labels, str(status)))
+        http_request_duration.observe(labels, duration)
+        http_response_bytes.observe(labels, response_bytes)
+        db_queries.observe(labels, stats.db_queries)
+        db_duration.observe(labels, stats.db_seconds)
+        db_rows.inc(labels, stats.rows)
+        render_duration.observe(labels, stats.render_seconds)
+
+        access_logger.info(
+            "%s %s %s",
+            scope["method"],
+            scope["path"],
+            status,
+            extra={
+                "extra_fields": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route,
+                    "status": status,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_queries": stats.db_queries,
+                    "db_ms": round(stats.db_seconds * 1000, 2),
+                    "db_rows": stats.rows,
+                    "render_ms": round(stats.render_seconds * 1000, 2),
+                    "response_bytes": response_bytes,
+                }
+            },
+        )
@@ -0,0 +1,31 @@
+"""
+Serialização JSON rápida (orjson quando disponível, senão a biblioteca padrão).
+"""
+import json
+from collections.abc import Callable
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+
+def dumps(content: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serializa ``content`` como JSON compacto em UTF-8.
+
+    ``default`` converte objetos que o encoder não conhece (como no ``json``).
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` serializada com ``dumps`` (no estilo da ``ORJSONResponse``)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,254 @@
+"""
+Registro de consultas lentas com plano de execução.
+
+Consultas acima do limite são registradas no log (SQL, parâmetros e duração)
+e guardadas num buffer circular exposto em ``/internal/slow-queries``. Numa
+amostra delas o plano é capturado fora do caminho da requisição: numa task do
+event loop para a engine assíncrona e numa thread para a síncrona. Só um
+SELECT simples é repetido com ``EXPLAIN (ANALYZE, BUFFERS)``; as demais
+consultas (inclusive ``WITH``, que pode conter escritas) recebem só ``EXPLAIN``.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+EXPLAIN_ANALYZE_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+EXPLAIN_PREFIX = "EXPLAIN (FORMAT JSON) "
+
+# Comandos aceitos pelo EXPLAIN; só o SELECT é executado de novo (ANALYZE)
+EXPLAINABLE = re.compile(r"\s*(SELECT|WITH|INSERT|UPDATE|DELETE|VALUES)\b", re.IGNORECASE)
+ANALYZABLE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+
+# Opção de execução das consultas do próprio recorder, que não são registradas
+EXPLAIN_OPTION = "slow_query_explain"
+
+MAX_PARAM_ITEMS = 20
+MAX_PARAM_CHARS = 200
+
+
+def _param_summary(value: Any) -> Any:
+    """Parâmetro em forma serializável, truncando listas e textos longos."""
+    if isinstance(value, list | tuple):
+        items = [_param_summary(item) for item in value[:MAX_PARAM_ITEMS]]
+        if len(value) > MAX_PARAM_ITEMS:
+            items.append(f"... (+{len(value) - MAX_PARAM_ITEMS})")
+        return items
+    if isinstance(value, dict):
+        return {str(key): _param_summary(item) for key, item in value.items()}
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    text = value.hex() if isinstance(value, bytes | memoryview) else str(value)
+    return text if len(text) <= MAX_PARAM_CHARS else text[:MAX_PARAM_CHARS] + "..."
+
+
+def plan_nodes(plan: dict):
+    """Percorre todos os nós de um plano EXPLAIN em formato JSON."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain_statement(statement: str) -> str:
+    """EXPLAIN de uma consulta lenta: com ANALYZE só para SELECT, que não escreve ao ser repetido."""
+    prefix = EXPLAIN_ANALYZE_PREFIX if ANALYZABLE.match(statement) else EXPLAIN_PREFIX
+    return prefix + statement
+
+
+@dataclass
+class SlowQuery:
+    """Uma consulta acima do limite e, se amostrada, o seu plano."""
+
+    sql: str
+    parameters: Any
+    duration_ms: float
+    recorded_at: datetime
+    plan_status: str = "skipped"  # skipped | pending | captured | error
+    plan: Optional[dict] = None
+    plan_analyzed: bool = False  # Plano com ANALYZE (tempos e buffers reais)
+    seq_scans: list[str] = field(default_factory=list)  # Tabelas lidas sem índice
+    error: Optional[str] = None
+
+
+class SlowQueryRecorder:
+    """
+    Registra as consultas mais lentas que ``threshold_ms``.
+
+    Guarda as últimas ``capacity`` num buffer circular. O plano só é capturado
+    em ``explain_sample_rate`` das consultas lentas, um de cada vez. O
+    ``EXPLAIN ANALYZE`` executa a consulta de novo, por isso fica restrito a
+    SELECT; escritas e ``WITH`` (que pode conter DELETE/UPDATE) recebem o
+    plano estimado, sem ANALYZE.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        capacity: int = 100,
+        explain_sample_rate: float = 0.1,
+        explain_timeout_ms: int = 10_000,
+    ):
+        self.threshold_s = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self._entries: deque[SlowQuery] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._explaining = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def attach(self, engine: Engine | AsyncEngine) -> None:
+        """Registra os hooks de tempo de consulta numa engine."""
+        if isinstance(engine, AsyncEngine):
+            sync_engine = engine.sync_engine
+
+            def schedule(entry: SlowQuery, parameters: Any) -> None:
+                task = asyncio.get_running_loop().create_task(
+                    self._explain_async(engine, entry, parameters)
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        else:
+            sync_engine = engine
+
+            def schedule(entry: SlowQuery, parameters: Any) -> None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(1, thread_name_prefix="slow-query")
+                self._executor.submit(self._explain_sync, engine, entry, parameters)
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+            if elapsed >= self.threshold_s and not context.execution_options.get(EXPLAIN_OPTION):
+                self.record(statement, parameters, elapsed, schedule)
+
+        def handle_error(exception_context) -> None:
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("slow_query_start"):
+                connection.info["slow_query_start"].pop()
+
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(sync_engine, "handle_error", handle_error)
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        seconds: float,
+        explain: Optional[Callable[[SlowQuery, Any], None]] = None,
+    ) -> SlowQuery:
+        """Guarda a consulta lenta, registra no log e agenda o EXPLAIN se amostrada."""
+        entry = SlowQuery(
+            sql=statement,
+            parameters=_param_summary(parameters),
+            duration_ms=round(seconds * 1000, 2),
+            recorded_at=datetime.now(UTC),
+        )
+        with self._lock:
+            self._entries.append(entry)
+            explain_now = (
+                explain is not None
+                and not self._explaining
+                and EXPLAINABLE.match(statement)
+                and random.random() < self.explain_sample_rate
+            )
+            if explain_now:
+                self._explaining = True
+                entry.plan_status = "pending"
+
+        logger.warning(
+            "Consulta lenta (%s ms)",
+            entry.duration_ms,
+            extra={
+                "extra_fields": {
+                    "sql": statement,
+                    "parameters": entry.parameters,
+                    "duration_ms": entry.duration_ms,
+                }
+            },
+        )
+
+        if explain_now:
+            try:
+                explain(entry, parameters)
+            except Exception as exc:
+                self._finish(entry, error=exc)
+        return entry
+
+    def entries(self) -> list[dict]:
+        """Consultas registradas, da mais recente para a mais antiga."""
+        with self._lock:
+            return [asdict(entry) for entry in reversed(self._entries)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _finish(self, entry: SlowQuery, plan: Any = None, error: Optional[Exception] = None):
+        """Anexa o plano (ou o erro) à consulta e libera o próximo EXPLAIN."""
+        if error is not None:
+            entry.plan_status = "error"
+            entry.error = str(error)
+            logger.warning("Falha no EXPLAIN da consulta lenta: %s", error)
+        else:
+            if isinstance(plan, str):  # asyncpg devolve json como texto
+                plan = json.loads(plan)
+            entry.plan = plan[0]
+            entry.plan_analyzed = bool(ANALYZABLE.match(entry.sql))
+            entry.seq_scans = sorted(
+                {
+                    node["Relation Name"]
+                    for node in plan_nodes(entry.plan["Plan"])
+                    if node["Node Type"] == "Seq Scan" and "Relation Name" in node
+                }
+            )
+            entry.plan_status = "captured"
+        with self._lock:
+            self._explaining = False
+
+    def _explain_sync(self, engine: Engine, entry: SlowQuery, parameters: Any) -> None:
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(**{EXPLAIN_OPTION: True})
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {self.explain_timeout_ms}")
+                plan = conn.exec_driver_sql(explain_statement(entry.sql), parameters).scalar()
+                conn.rollback()
+        except Exception as exc:
+            self._finish(entry, error=exc)
+        else:
+            self._finish(entry, plan)
+
+    async def _explain_async(self, engine: AsyncEngine, entry: SlowQuery, parameters: Any):
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(**{EXPLAIN_OPTION: True})
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {self.explain_timeout_ms}"
+                )
+                result = await conn.exec_driver_sql(explain_statement(entry.sql), parameters)
+                plan = result.scalar()
+                await conn.rollback()
+        except Exception as exc:
+            self._finish(entry, error=exc)
+        else:
+            self._finish(entry, plan)
@@ -1,17 +1,37 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.api import farms, health
+from app.api import farms, health, internal
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
-from app.core.logging import setup_logging
+from app.core.db import async_engine, pool_status
+from app.core.logging import get_logger, setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.serialization import FastJSONResponse
 
 settings = get_settings()
 
 # Configura logs
-setup_logging(level="DEBUG" if settings.debug else "INFO")
+setup_logging(
+    level="DEBUG" if settings.debug else "INFO",
+    queue_size=settings.log_queue_size,
+    info_sample_rate=settings.log_info_sample_rate,
+)
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Fecha as conexões do pool assíncrono no desligamento, no mesmo event loop que as abriu."""
+    yield
+    await async_engine.dispose()
+
 
 # Cria aplicação FastAPI
 app = FastAPI(
@@ -31,10 +51,12 @@ app = FastAPI(
 
     * FastAPI
     * PostgreSQL + PostGIS
-    * SQLAlchemy + GeoAlchemy2
+    * SQLAlchemy (asyncio + asyncpg) + GeoAlchemy2
     """,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -43,6 +65,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": str(exc.detail)},  # Garantees detail is string
+        headers=getattr(exc, "headers", None),  # p.ex. WWW-Authenticate do 401
     )
 
 
@@ -62,6 +85,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    logger.error("Timeout aguardando conexão do pool: %s", pool_status())
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Banco de dados sobrecarregado, tente novamente."},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
@@ -79,9 +111,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão das respostas (gzip/br/zstd conforme Accept-Encoding)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        levels=settings.compression_levels,
+    )
+
+# Métricas e log de acesso; o mais externo, para medir os bytes já comprimidos
+app.add_middleware(MetricsMiddleware)
+
 # Inclui rotas
 app.include_router(health.router)
 app.include_router(farms.router)
+app.include_router(internal.router)
 
 
 @app.get("/", tags=["Root"])
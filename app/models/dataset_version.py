@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer
+
+from app.core.db import Base
+
+
+class DatasetVersion(Base):
+    __tablename__ = "dataset_version"
+
+    # Tabela de linha única (id = 1), atualizada pelo seed a cada carga
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DatasetVersion(version={self.version}, updated_at={self.updated_at})>"
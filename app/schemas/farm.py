@@ -1,9 +1,56 @@
 """
 Schemas Pydantic para a API.
 """
+from datetime import datetime
+from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Máximo de IDs aceitos por requisição de busca em lote
+BATCH_MAX_IDS = 10_000
+
+# Máximo de pontos aceitos por requisição de busca por pontos em lote
+BATCH_MAX_POINTS = 100_000
+
+
+class CountMode(str, Enum):
+    """Estratégia de contagem do total de resultados de uma busca."""
+
+    EXACT = "exact"  # count(*) completo do predicado espacial
+    ESTIMATE = "estimate"  # count(*) limitado a COUNT_ESTIMATE_CAP linhas
+    NONE = "none"  # sem contagem; apenas has_more
+
+
+class GeometryMode(str, Enum):
+    """Como a geometria de cada fazenda é retornada nas listagens."""
+
+    FULL = "full"  # Polígono completo
+    SIMPLIFIED = "simplified"  # ST_SimplifyPreserveTopology com tolerância pelo zoom
+    BBOX = "bbox"  # Retângulo envolvente (ST_Envelope)
+    CENTROID = "centroid"  # Ponto central (ST_Centroid)
+    NONE = "none"  # Sem geometria
+
+
+class ExportFormat(str, Enum):
+    """Formato da exportação em streaming."""
+
+    NDJSON = "ndjson"  # Uma Feature GeoJSON por linha
+    GEOJSON = "geojson"  # Uma FeatureCollection
+
+
+class NameSearchMode(str, Enum):
+    """Modo da busca por nome."""
+
+    SIMILAR = "similar"  # Similaridade de trigramas (tolera erros de digitação)
+    PREFIX = "prefix"  # Autocompletar: começa com o texto
+
+
+class BatchIdType(str, Enum):
+    """Chave usada na busca em lote."""
+
+    COD_IMOVEL = "cod_imovel"
+    OGC_FID = "ogc_fid"
 
 
 class PointSearchRequest(BaseModel):
@@ -64,6 +111,57 @@ class RadiusSearchRequest(BaseModel):
         }
 
 
+class BatchPointSearchRequest(BaseModel):
+    """Schema para busca por vários pontos."""
+
+    points: list[tuple[float, float]] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_POINTS,
+        description="Pontos como pares [latitude, longitude]",
+    )
+
+    @field_validator("points")
+    @classmethod
+    def validate_points(cls, v: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        for index, (latitude, longitude) in enumerate(v):
+            if not -90 <= latitude <= 90:
+                raise ValueError(f"Ponto {index}: a latitude deve estar entre -90 e 90.")
+            if not -180 <= longitude <= 180:
+                raise ValueError(f"Ponto {index}: a longitude deve estar entre -180 e 180.")
+        return v
+
+    class Config:
+        json_schema_extra = {"example": {"points": [[-23.5505, -46.6333], [-22.1234, -47.5678]]}}
+
+
+class BatchLookupRequest(BaseModel):
+    """Schema para busca em lote por ID."""
+
+    ids: list[int | str] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_IDS, description="IDs das fazendas"
+    )
+    id_type: BatchIdType = Field(BatchIdType.COD_IMOVEL, description="Chave dos IDs informados")
+
+    @model_validator(mode="after")
+    def normalize_ids(self) -> "BatchLookupRequest":
+        """Converte os IDs para o tipo da chave e remove duplicados, mantendo a ordem."""
+        if self.id_type == BatchIdType.OGC_FID:
+            try:
+                ids = [int(v) for v in self.ids]
+            except ValueError:
+                raise ValueError("Com id_type=ogc_fid os IDs devem ser inteiros.") from None
+        else:
+            ids = [str(v) for v in self.ids]
+        self.ids = list(dict.fromkeys(ids))
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {"ids": ["SP-3500105-0A1B2C3D4E5F", "SP-3500204-9F8E7D6C5B4A"]}
+        }
+
+
 class FarmBase(BaseModel):
     """Schema base da fazenda."""
 
@@ -94,10 +192,63 @@ class FarmResponse(FarmBase):
 class FarmListResponse(BaseModel):
     """Resposta paginada da lista de fazendas."""
 
-    total: int
+    total: Optional[int] = None  # None com count=none
+    total_capped: bool = False  # total é um limite inferior (count=estimate)
+    count: CountMode = CountMode.EXACT
+    has_more: bool = False
+    page: Optional[int] = None  # None na paginação por cursor
+    page_size: int
+    next_cursor: Optional[str] = None  # Presente quando há mais resultados
+    farms: list[FarmResponse]
+
+
+class FarmNameMatch(BaseModel):
+    """Fazenda encontrada pela busca por nome (sem geometria)."""
+
+    ogc_fid: int
+    cod_imovel: Optional[str] = None
+    municipio: Optional[str] = None
+    num_area: Optional[float] = None
+    score: float  # Similaridade com o texto buscado (0 a 1)
+
+
+class NameSearchResponse(BaseModel):
+    """Resposta da busca por nome, ordenada por similaridade."""
+
+    mode: NameSearchMode
     page: int
     page_size: int
+    has_more: bool = False
+    results: list[FarmNameMatch]
+
+
+class NearestFarm(BaseModel):
+    """Fazenda da busca por vizinhos mais próximos."""
+
+    distance_m: float  # Distância geodésica ao ponto (0 se o contém)
+    farm: FarmResponse
+
+
+class NearestFarmsResponse(BaseModel):
+    """Resposta da busca pelas k fazendas mais próximas, da mais próxima à mais distante."""
+
+    k: int
+    max_distance_m: Optional[float] = None
+    results: list[NearestFarm]
+
+
+class BatchLookupResponse(BaseModel):
+    """Resposta da busca em lote: fazendas encontradas e IDs ausentes."""
+
     farms: list[FarmResponse]
+    missing: list[int | str]
+
+
+class BatchPointSearchResponse(BaseModel):
+    """Resposta da busca por vários pontos."""
+
+    results: list[list[int]]  # ogc_fid que cobrem cada ponto, na ordem da requisição
+    matched: int  # Pontos cobertos por ao menos uma fazenda
 
 
 class HealthResponse(BaseModel):
@@ -106,3 +257,47 @@ class HealthResponse(BaseModel):
     status: str
     database: str
     version: str
+
+
+class PoolStatusResponse(BaseModel):
+    """Estado do pool de conexões do banco."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+class SlowQueryResponse(BaseModel):
+    """Consulta acima do limite de lentidão."""
+
+    sql: str
+    parameters: Any
+    duration_ms: float
+    recorded_at: datetime
+    plan_status: str  # skipped | pending | captured | error
+    plan: Optional[dict[str, Any]] = None  # EXPLAIN (FORMAT JSON), com ANALYZE se plan_analyzed
+    plan_analyzed: bool = False  # Só SELECT é executado de novo com ANALYZE
+    seq_scans: list[str]  # Tabelas lidas sem índice no plano
+    error: Optional[str] = None
+
+
+class CacheStatsResponse(BaseModel):
+    """Contadores de um cache."""
+
+    backend: str = "memory"
+    size: Optional[int] = None
+    maxsize: Optional[int] = None
+    hits: int
+    misses: int
+    evictions: Optional[int] = None
+    expirations: Optional[int] = None
+    skipped: Optional[int] = None  # Documentos acima do limite por item
+    bytes: Optional[int] = None
+    max_bytes: Optional[int] = None
+    hit_ratio: float
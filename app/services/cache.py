@@ -0,0 +1,104 @@
+"""
+Caches em memória do processo.
+"""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class LRUCache:
+    """Cache LRU limitado por número de entradas, com expiração por TTL."""
+
+    def __init__(self, maxsize: int, ttl_s: float):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o valor da chave, ou ``None`` se ausente ou expirado."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Armazena o valor, descartando as entradas menos usadas se necessário."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class PointLookupCache(LRUCache):
+    """
+    Cache dos ``ogc_fid`` que cobrem um ponto.
+
+    As coordenadas são arredondadas para ``precision`` casas decimais (5 casas
+    ≈ 1,1 m), de modo que leituras de GPS do mesmo local compartilham a entrada.
+    A versão do dataset faz parte da chave: uma nova carga do seed invalida tudo.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float, precision: int):
+        super().__init__(maxsize, ttl_s)
+        self.precision = precision
+
+    def snap(self, latitude: float, longitude: float) -> tuple[float, float]:
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    @staticmethod
+    def key(dataset_version: int, latitude: float, longitude: float) -> tuple:
+        return (dataset_version, latitude, longitude)
+
+
+point_cache = PointLookupCache(
+    maxsize=settings.point_cache_size,
+    ttl_s=settings.point_cache_ttl_s,
+    precision=settings.point_cache_precision,
+)
+
+
+def get_point_cache() -> Optional[PointLookupCache]:
+    """Dependência que fornece o cache de busca por ponto (``None`` se desligado)."""
+    return point_cache if settings.point_cache_enabled else None
@@ -0,0 +1,68 @@
+"""
+Versão do dataset de fazendas, incrementada pelo seed a cada carga.
+"""
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.models.dataset_version import DatasetVersion
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class DatasetVersionTracker:
+    """
+    Mantém a versão atual do dataset, relida do banco no máximo a cada ``ttl_s``.
+
+    Sem a tabela ``dataset_version`` (seed antigo) a versão é 0.
+    """
+
+    def __init__(self, ttl_s: float):
+        self.ttl_s = ttl_s
+        self.version = 0
+        self.updated_at: Optional[datetime] = None
+        self._checked_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.ttl_s
+
+    async def current(self, db: AsyncSession) -> int:
+        """Retorna a versão do dataset, consultando o banco se o valor expirou."""
+        if self.is_stale():
+            stmt = select(DatasetVersion.version, DatasetVersion.updated_at).where(
+                DatasetVersion.id == 1
+            )
+            try:
+                row = (await db.execute(stmt)).first()
+            except DBAPIError as err:
+                logger.warning("Versão do dataset indisponível: %s", err)
+                await db.rollback()
+                row = None
+
+            version, updated_at = row if row else (0, None)
+            if version != self.version:
+                logger.info("Versão do dataset: %s -> %s", self.version, version)
+            self.version, self.updated_at = version, updated_at
+            self._checked_at = time.monotonic()
+
+        return self.version
+
+
+dataset_version = DatasetVersionTracker(ttl_s=settings.dataset_version_ttl_s)
+
+
+def get_dataset_version_tracker() -> DatasetVersionTracker:
+    """
+    Dependência que fornece o rastreador da versão do dataset.
+
+    A versão é obtida com ``await tracker.current(db)`` dentro da rota, depois
+    da validação da requisição, para que erros 422 não consultem o banco.
+    """
+    return dataset_version
@@ -0,0 +1,184 @@
+"""
+Cache de documentos de fazendas (``FarmResponse`` já serializado em JSON).
+
+Os documentos são chaveados por ``ogc_fid``, versão do dataset e variante de
+renderização, e guardados como bytes: um acerto dispensa o PostGIS e o Pydantic.
+"""
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # pragma: no cover - dependência opcional
+    redis = None
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def document_key(dataset_version: int, ogc_fid: int, variant: str) -> str:
+    """Chave do documento de uma fazenda numa versão do dataset."""
+    return f"farm:{dataset_version}:{ogc_fid}:{variant}"
+
+
+class FarmDocumentCache(ABC):
+    """Interface dos backends de cache de documentos."""
+
+    backend = "none"
+
+    def __init__(self, max_item_bytes: int):
+        self.max_item_bytes = max_item_bytes
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0  # Documentos maiores que ``max_item_bytes``
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Retorna os documentos encontrados, indexados pela chave."""
+
+    @abstractmethod
+    async def set_many(self, documents: dict[str, bytes]) -> None:
+        """Armazena os documentos que cabem no limite por item."""
+
+    def _cacheable(self, documents: dict[str, bytes]) -> dict[str, bytes]:
+        cacheable = {key: doc for key, doc in documents.items() if len(doc) <= self.max_item_bytes}
+        self.skipped += len(documents) - len(cacheable)
+        return cacheable
+
+    def _count(self, requested: int, found: int) -> None:
+        self.hits += found
+        self.misses += requested - found
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped": self.skipped,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InMemoryDocumentCache(FarmDocumentCache):
+    """Cache LRU em memória do processo, limitado pelo total de bytes armazenados."""
+
+    backend = "memory"
+
+    def __init__(self, max_bytes: int, max_item_bytes: int):
+        super().__init__(max_item_bytes)
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                doc = self._data.get(key)
+                if doc is not None:
+                    self._data.move_to_end(key)
+                    found[key] = doc
+            self._count(len(keys), len(found))
+        return found
+
+    async def set_many(self, documents: dict[str, bytes]) -> None:
+        with self._lock:
+            for key, doc in self._cacheable(documents).items():
+                previous = self._data.pop(key, None)
+                if previous is not None:
+                    self.bytes -= len(previous)
+                self._data[key] = doc
+                self.bytes += len(doc)
+
+            while self.bytes > self.max_bytes and self._data:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **super().stats(),
+                "size": len(self._data),
+                "evictions": self.evictions,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class RedisDocumentCache(FarmDocumentCache):
+    """
+    Cache compartilhado entre workers num servidor Redis (ou compatível).
+
+    O descarte por memória fica a cargo do servidor (``maxmemory`` com política
+    ``allkeys-lru``); aqui só se aplica o TTL e o limite por item.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, ttl_s: int, max_item_bytes: int):
+        super().__init__(max_item_bytes)
+        self.client = client
+        self.ttl_s = ttl_s
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        if not keys:
+            return {}
+        values = await self.client.mget(list(keys))
+        found = {key: value for key, value in zip(keys, values, strict=True) if value is not None}
+        self._count(len(keys), len(found))
+        return found
+
+    async def set_many(self, documents: dict[str, bytes]) -> None:
+        cacheable = self._cacheable(documents)
+        if not cacheable:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, doc in cacheable.items():
+                pipe.set(key, doc, ex=self.ttl_s)
+            await pipe.execute()
+
+
+def build_document_cache() -> Optional[FarmDocumentCache]:
+    """Cria o backend configurado em ``DOCUMENT_CACHE_BACKEND`` (memory, redis ou none)."""
+    backend = settings.document_cache_backend.lower()
+
+    if backend == "memory":
+        return InMemoryDocumentCache(
+            max_bytes=settings.document_cache_max_bytes,
+            max_item_bytes=settings.document_cache_max_item_bytes,
+        )
+
+    if backend == "redis":
+        if redis is None:
+            logger.warning("Pacote redis não instalado; cache de documentos desligado")
+            return None
+        return RedisDocumentCache(
+            client=redis.from_url(settings.redis_url),
+            ttl_s=settings.document_cache_ttl_s,
+            max_item_bytes=settings.document_cache_max_item_bytes,
+        )
+
+    return None
+
+
+document_cache = build_document_cache()
+
+
+def get_document_cache() -> Optional[FarmDocumentCache]:
+    """Dependência que fornece o cache de documentos (``None`` se desligado)."""
+    return document_cache
@@ -0,0 +1,226 @@
+"""
+Documentos JSON de fazendas: renderização e carga com cache por ``ogc_fid``.
+"""
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Optional
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import CompressionLevels, compress
+from app.core.logging import get_logger
+from app.core.metrics import record_render
+from app.core.serialization import dumps
+from app.schemas.farm import BatchIdType, ExportFormat, FarmResponse
+from app.services.document_cache import FarmDocumentCache, document_key
+from app.services.farm_queries import (
+    DEFAULT_RENDER,
+    FARM_ATTRIBUTE_COLUMNS,
+    AsyncFarmQueryService,
+    GeometryRender,
+    Projection,
+)
+
+logger = get_logger(__name__)
+
+# Campos de ``FarmResponse`` na ordem do schema, exceto a geometria
+FARM_DOCUMENT_FIELDS = tuple(name for name in FarmResponse.model_fields if name != "geometry")
+
+
+def _geometry_bytes(row: Row) -> bytes:
+    """GeoJSON renderizado pelo PostGIS, como texto (``null`` sem geometria)."""
+    return row.geojson.encode() if row.geojson else b"null"
+
+
+def render_farm_document(row: Row) -> bytes:
+    """
+    Serializa uma linha projetada (atributos + GeoJSON) no formato de ``FarmResponse``.
+
+    Os atributos passam pelo encoder rápido e o GeoJSON do PostGIS entra no
+    documento como texto, sem ser decodificado nem percorrido de novo.
+    """
+    start = time.perf_counter()
+    attributes = dumps({name: getattr(row, name) for name in FARM_DOCUMENT_FIELDS})
+    document = attributes[:-1] + b',"geometry":' + _geometry_bytes(row) + b"}"
+    record_render(time.perf_counter() - start)
+    return document
+
+
+def render_farm_list(metadata: dict, documents: Sequence[bytes]) -> bytes:
+    """
+    Monta o JSON de uma resposta paginada a partir dos documentos já serializados.
+
+    ``metadata`` traz os campos de ``FarmListResponse`` exceto ``farms``.
+    """
+    head = dumps(metadata)
+    return head[:-1] + b',"farms":[' + b",".join(documents) + b"]}"
+
+
+def render_nearest_list(metadata: dict, results: Sequence[tuple[float, bytes]]) -> bytes:
+    """
+    Monta o JSON de ``NearestFarmsResponse`` a partir de pares (distância, documento).
+
+    ``metadata`` traz os campos da resposta exceto ``results``.
+    """
+    head = dumps(metadata)
+    items = (
+        b'{"distance_m":' + dumps(distance) + b',"farm":' + document + b"}"
+        for distance, document in results
+    )
+    return head[:-1] + b',"results":[' + b",".join(items) + b"]}"
+
+
+async def stream_farm_batch(
+    rows: AsyncIterable[Row], ids: Sequence[int | str], id_type: BatchIdType
+) -> AsyncIterator[bytes]:
+    """
+    Serializa o resultado de uma busca em lote como ``BatchLookupResponse``.
+
+    Cada fazenda é enviada assim que chega do banco; os IDs sem fazenda
+    correspondente vão em ``missing`` no final do documento.
+    """
+    pending = set(ids)
+    found = 0
+    yield b'{"farms":['
+    async for row in rows:
+        yield (b"," if found else b"") + render_farm_document(row)
+        pending.discard(getattr(row, id_type.value))
+        found += 1
+
+    missing = [value for value in ids if value in pending]
+    logger.info("Busca em lote: %d fazendas, %d IDs ausentes", found, len(missing))
+    yield b'],"missing":' + dumps(missing) + b"}"
+
+
+def render_feature(row: Row) -> bytes:
+    """
+    Serializa uma linha projetada como Feature GeoJSON.
+
+    O GeoJSON da geometria, já renderizado pelo PostGIS, entra no documento
+    sem ser decodificado.
+    """
+    start = time.perf_counter()
+    properties = {column.key: getattr(row, column.key) for column in FARM_ATTRIBUTE_COLUMNS}
+    feature = (
+        b'{"type":"Feature","id":'
+        + str(row.ogc_fid).encode()
+        + b',"geometry":'
+        + _geometry_bytes(row)
+        + b',"properties":'
+        + dumps(properties)
+        + b"}"
+    )
+    record_render(time.perf_counter() - start)
+    return feature
+
+
+async def stream_features(
+    rows: AsyncIterable[Row], export_format: ExportFormat, chunk_bytes: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Serializa as linhas como NDJSON (uma Feature por linha) ou FeatureCollection.
+
+    As Features são agrupadas em blocos de ~``chunk_bytes`` para não enviar um
+    pedaço da resposta por fazenda.
+    """
+    ndjson = export_format == ExportFormat.NDJSON
+    buffer = bytearray() if ndjson else bytearray(b'{"type":"FeatureCollection","features":[')
+    exported = 0
+    async for row in rows:
+        if ndjson:
+            buffer += render_feature(row) + b"\n"
+        else:
+            buffer += (b"," if exported else b"") + render_feature(row)
+        exported += 1
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if not ndjson:
+        buffer += b"]}"
+    if buffer:
+        yield bytes(buffer)
+    logger.info("Exportação %s: %d fazendas", export_format.value, exported)
+
+
+class FarmDocumentLoader:
+    """
+    Carrega os documentos das fazendas de uma página.
+
+    Linhas projetadas são renderizadas diretamente. ``ogc_fid`` (buscas com
+    ``Projection.IDS``) são procurados no cache; só as ausentes vão ao banco,
+    numa única consulta ``= ANY(:ids)``, e voltam para o cache.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        cache: Optional[FarmDocumentCache],
+        dataset_version: int,
+        render: GeometryRender = DEFAULT_RENDER,
+    ):
+        self.db = db
+        self.cache = cache
+        self.dataset_version = dataset_version
+        self.render = render
+
+    @property
+    def variant(self) -> str:
+        """Identifica a renderização (parte da chave do cache)."""
+        return self.render.variant
+
+    async def load(self, farms: Sequence[Row | int]) -> list[bytes]:
+        """Documentos na mesma ordem da página."""
+        if not farms:
+            return []
+        if not isinstance(farms[0], int):
+            return [render_farm_document(row) for row in farms]
+
+        documents = await self.load_by_id(farms)
+        # Fazendas removidas entre a busca e a carga (reseed) são omitidas
+        return [documents[ogc_fid] for ogc_fid in farms if ogc_fid in documents]
+
+    async def load_by_id(self, ogc_fids: Sequence[int]) -> dict[int, bytes]:
+        """Documentos por ``ogc_fid``; os que não existem mais ficam de fora."""
+        keys = {
+            ogc_fid: document_key(self.dataset_version, ogc_fid, self.variant)
+            for ogc_fid in ogc_fids
+        }
+        found = await self.cache.get_many(list(keys.values())) if self.cache else {}
+
+        missing = [ogc_fid for ogc_fid in ogc_fids if keys[ogc_fid] not in found]
+        if missing:
+            service = AsyncFarmQueryService(self.db)
+            rows = await service.get_farms_by_ids(
+                missing, projection=Projection.COLUMNS, render=self.render
+            )
+            rendered = {keys[row.ogc_fid]: render_farm_document(row) for row in rows}
+            if self.cache:
+                await self.cache.set_many(rendered)
+            found.update(rendered)
+
+        return {ogc_fid: found[key] for ogc_fid, key in keys.items() if key in found}
+
+    async def load_compressed(
+        self, ogc_fid: int, encoding: str, levels: CompressionLevels
+    ) -> Optional[bytes]:
+        """
+        Documento de uma fazenda já comprimido em ``encoding``.
+
+        A versão comprimida fica no cache ao lado da original, então a
+        compressão acontece uma vez por documento e não a cada requisição.
+        """
+        key = document_key(self.dataset_version, ogc_fid, f"{self.variant}:{encoding}")
+        found = await self.cache.get_many([key]) if self.cache else {}
+        if key in found:
+            return found[key]
+
+        documents = await self.load([ogc_fid])
+        if not documents:
+            return None
+
+        compressed = compress(documents[0], encoding, levels)
+        if self.cache:
+            await self.cache.set_many({key: compressed})
+        return compressed
@@ -1,29 +1,588 @@
 """
 Serviço de consultas de fazendas com operações espaciais PostGIS.
 """
-import json
+import bisect
+import math
+import unicodedata
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from enum import Enum
 from typing import Optional
 
 from geoalchemy2.functions import ST_Covers
-from sqlalchemy import func
+from sqlalchemy import (
+    Float,
+    Integer,
+    Select,
+    String,
+    any_,
+    bindparam,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
 from app.models.farm import Farm
+from app.schemas.farm import BatchIdType, CountMode, GeometryMode, NameSearchMode
+from app.services.cache import PointLookupCache
 
 logger = get_logger(__name__)
 
+# Colunas de atributos selecionadas no modo de projeção (tudo exceto a geometria)
+FARM_ATTRIBUTE_COLUMNS = (
+    Farm.ogc_fid,
+    Farm.cod_imovel,
+    Farm.num_area,
+    Farm.municipio,
+    Farm.cod_estado,
+    Farm.cod_tema,
+    Farm.nom_tema,
+    Farm.mod_fiscal,
+    Farm.ind_status,
+    Farm.ind_tipo,
+    Farm.des_condic,
+    Farm.dat_criaca,
+    Farm.dat_atuali,
+)
 
-class FarmQueryService:
+# Precisão padrão do ST_AsGeoJSON no PostGIS
+DEFAULT_GEOJSON_DIGITS = 9
+
+# Zoom usado na simplificação quando a requisição não informa um
+DEFAULT_SIMPLIFY_ZOOM = 12
+
+# Atributos incluídos nos vector tiles a partir de cada zoom
+TILE_ATTRIBUTES_BY_ZOOM = (
+    (0, (Farm.ogc_fid,)),
+    (10, (Farm.cod_imovel, Farm.municipio, Farm.num_area)),
+    (13, (Farm.cod_tema, Farm.nom_tema, Farm.mod_fiscal, Farm.ind_status, Farm.ind_tipo)),
+)
+
+# Nome da camada das fazendas nos vector tiles
+TILE_LAYER = "fazendas"
+
+# Metros por grau no elipsoide WGS84: menor valor de um grau de latitude (no
+# equador) e um grau de longitude no equador. A folga cobre a diferença entre a
+# aproximação esférica e o cálculo geodésico do ST_DWithin em geography.
+METERS_PER_DEGREE_LAT = 110_574.0
+METERS_PER_DEGREE_LON = 111_320.0
+ENVELOPE_MARGIN = 1.05
+
+# Candidatos por vizinho pedido na busca dos mais próximos: o ``<->`` ordena
+# pela distância planar em graus, que difere da geodésica fora do equador
+NEAREST_CANDIDATE_FACTOR = 4
+
+
+def radius_envelope(
+    latitude: float, longitude: float, radius_m: float
+) -> tuple[float, float, float, float]:
+    """
+    Calcula um envelope (xmin, ymin, xmax, ymax) em graus que contém o círculo
+    geodésico de raio ``radius_m`` ao redor do ponto.
+
+    O envelope é conservador: pode incluir fazendas fora do raio (descartadas
+    pelo teste geodésico exato), mas nunca exclui uma fazenda dentro dele.
+    """
+    radius_m *= ENVELOPE_MARGIN
+    delta_lat = radius_m / METERS_PER_DEGREE_LAT
+    ymin = max(latitude - delta_lat, -90.0)
+    ymax = min(latitude + delta_lat, 90.0)
+
+    # Um grau de longitude é mais estreito na latitude mais distante do equador
+    max_abs_lat = max(abs(ymin), abs(ymax))
+    cos_lat = math.cos(math.radians(max_abs_lat))
+    if cos_lat <= 1e-6:
+        return -180.0, ymin, 180.0, ymax
+
+    delta_lon = radius_m / (METERS_PER_DEGREE_LON * cos_lat)
+    xmin = longitude - delta_lon
+    xmax = longitude + delta_lon
+    # Envelopes que cruzam o antimeridiano cobrem todas as longitudes
+    if xmin < -180.0 or xmax > 180.0:
+        return -180.0, ymin, 180.0, ymax
+
+    return xmin, ymin, xmax, ymax
+
+
+def normalize_search_text(value: str) -> str:
+    """
+    Texto de busca sem acentos e em minúsculas.
+
+    Equivalente, para o português, à função ``unaccent_lower`` criada pelo seed
+    e usada nos índices de trigramas de ``municipio`` e ``cod_imovel``.
+    """
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def search_text(column):
+    """Expressão indexada (GIN ``gin_trgm_ops``) de uma coluna de texto."""
+    return func.unaccent_lower(column)
+
+
+def zoom_tolerance(zoom: int) -> float:
+    """Tamanho de um pixel (tiles de 256 px) em graus no zoom informado."""
+    return 360.0 / (256 * 2**zoom)
+
+
+@dataclass(frozen=True)
+class GeometryRender:
+    """
+    Como a geometria de cada fazenda é renderizada em GeoJSON pelo PostGIS.
+
+    ``max_decimal_digits`` trunca as coordenadas no próprio banco; ``zoom``
+    define a tolerância do modo ``simplified`` (um pixel naquele zoom).
+    """
+
+    mode: GeometryMode = GeometryMode.FULL
+    max_decimal_digits: int = DEFAULT_GEOJSON_DIGITS
+    zoom: int = DEFAULT_SIMPLIFY_ZOOM
+
+    @property
+    def variant(self) -> str:
+        """Identifica a renderização (parte da chave do cache de documentos)."""
+        if self.mode == GeometryMode.SIMPLIFIED:
+            return f"{self.mode.value}:z{self.zoom}:d{self.max_decimal_digits}"
+        return f"{self.mode.value}:d{self.max_decimal_digits}"
+
+    def geojson_column(self):
+        """Expressão SQL ``geojson`` (texto GeoJSON ou NULL)."""
+        if self.mode == GeometryMode.NONE:
+            return null().label("geojson")
+
+        geometry = Farm.geometry
+        if self.mode == GeometryMode.SIMPLIFIED:
+            geometry = func.ST_SimplifyPreserveTopology(geometry, zoom_tolerance(self.zoom))
+        elif self.mode == GeometryMode.BBOX:
+            geometry = func.ST_Envelope(geometry)
+        elif self.mode == GeometryMode.CENTROID:
+            geometry = func.ST_Centroid(geometry)
+
+        return func.ST_AsGeoJSON(geometry, self.max_decimal_digits).label("geojson")
+
+
+DEFAULT_RENDER = GeometryRender()
+
+
+def tile_attribute_columns(zoom: int) -> list:
+    """Colunas de atributos dos vector tiles no zoom informado."""
+    return [
+        column
+        for min_zoom, columns in TILE_ATTRIBUTES_BY_ZOOM
+        if zoom >= min_zoom
+        for column in columns
+    ]
+
+
+class Projection(str, Enum):
+    """O que as buscas retornam para cada fazenda."""
+
+    ENTITY = "entity"  # Entidade ORM ``Farm`` (geometria em WKB)
+    COLUMNS = "columns"  # Linha com atributos + GeoJSON renderizado pelo PostGIS
+    IDS = "ids"  # Apenas o ``ogc_fid`` (documentos vêm do cache)
+
+
+@dataclass
+class FarmPage:
+    """Página de resultados de uma busca."""
+
+    farms: list[Farm | Row | int]
+    total: Optional[int]
+    has_more: bool
+    total_capped: bool = False
+
+    @property
+    def last_id(self) -> Optional[int]:
+        """``ogc_fid`` do último item da página (base do ``next_cursor``)."""
+        if not self.farms:
+            return None
+        last = self.farms[-1]
+        return last if isinstance(last, int) else last.ogc_fid
+
+
+class BaseFarmQueryService:
+    """
+    Montagem das instruções SQL das buscas.
+
+    Compartilhada pelo serviço síncrono (``Session``, usado pelo seed, testes e
+    benchmarks) e pelo assíncrono (``AsyncSession``, usado pelas rotas).
+    """
+
+    @staticmethod
+    def _select(projection: Projection, render: GeometryRender) -> Select:
+        """
+        SELECT base das buscas.
+
+        No modo ``COLUMNS`` seleciona as colunas de atributos mais o GeoJSON
+        renderizado pelo PostGIS conforme ``render``, evitando uma ida ao banco
+        por fazenda.
+        """
+        if projection == Projection.ENTITY:
+            return select(Farm)
+        if projection == Projection.IDS:
+            return select(Farm.ogc_fid)
+
+        return select(*FARM_ATTRIBUTE_COLUMNS, render.geojson_column())
+
+    @classmethod
+    def _by_id_statement(
+        cls, farm_id: str, projection: Projection, render: GeometryRender
+    ) -> Select:
+        return cls._select(projection, render).where(Farm.cod_imovel == farm_id).limit(1)
+
+    @classmethod
+    def _point_statement(
+        cls, latitude: float, longitude: float, projection: Projection, render: GeometryRender
+    ) -> Select:
+        # Ponto em WGS84 (SRID 4326). Ordem correta: (lon, lat)
+        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        return cls._select(projection, render).where(ST_Covers(Farm.geometry, point))
+
+    @classmethod
+    def _covering_ids_statement(cls, latitude: float, longitude: float) -> Select:
+        """``ogc_fid`` (ordenados) das fazendas que cobrem o ponto."""
+        stmt = cls._point_statement(latitude, longitude, Projection.IDS, DEFAULT_RENDER)
+        return stmt.with_only_columns(Farm.ogc_fid).order_by(Farm.ogc_fid)
+
+    @staticmethod
+    def _points_statement(points: Sequence[tuple[float, float]]) -> Select:
+        """
+        Pares (índice do ponto, ``ogc_fid``) de todas as fazendas que cobrem cada ponto.
+
+        As coordenadas vão como dois arrays, expandidos por ``unnest ... WITH
+        ORDINALITY`` e cruzados com ``farms`` por ``ST_Covers`` numa única
+        consulta; o índice (a partir de 1) segue a ordem de ``points``.
+        """
+        latitudes = bindparam("lats", [lat for lat, _ in points], type_=ARRAY(Float))
+        longitudes = bindparam("lons", [lon for _, lon in points], type_=ARRAY(Float))
+        coordinates = (
+            func.unnest(longitudes, latitudes)
+            .table_valued("lon", "lat", with_ordinality="idx")
+            .render_derived(name="points")
+        )
+        point = func.ST_SetSRID(func.ST_MakePoint(coordinates.c.lon, coordinates.c.lat), 4326)
+        return (
+            select(coordinates.c.idx, Farm.ogc_fid)
+            .select_from(coordinates)
+            .join(Farm, ST_Covers(Farm.geometry, point))
+            .order_by(coordinates.c.idx, Farm.ogc_fid)
+        )
+
+    @staticmethod
+    def _tile_statement(z: int, x: int, y: int, extent: int, buffer: int) -> Select:
+        """
+        Vector tile (MVT) das fazendas no tile z/x/y.
+
+        O envelope do tile (EPSG:3857) é levado para 4326 para o filtro ``&&``
+        usar o ``farms_geometry_idx``. As geometrias são simplificadas com
+        tolerância de um pixel no zoom e os atributos dependem do zoom.
+        """
+        bounds = func.ST_TileEnvelope(z, x, y)
+        geometry = func.ST_Transform(
+            func.ST_SimplifyPreserveTopology(Farm.geometry, zoom_tolerance(z)), 3857
+        )
+        features = (
+            select(
+                func.ST_AsMVTGeom(geometry, bounds, extent, buffer, True).label("geom"),
+                *tile_attribute_columns(z),
+            )
+            .where(Farm.geometry.op("&&")(func.ST_Transform(bounds, 4326)))
+            .subquery("tile")
+        )
+        return select(func.ST_AsMVT(features.table_valued(), TILE_LAYER, extent, "geom"))
+
+    @classmethod
+    def _nearest_statement(
+        cls,
+        latitude: float,
+        longitude: float,
+        k: int,
+        max_distance_m: Optional[float],
+        projection: Projection,
+        render: GeometryRender,
+    ) -> Select:
+        """
+        As ``k`` fazendas mais próximas do ponto, com a distância geodésica em metros.
+
+        Os candidatos vêm na ordem do índice GIST pelo operador ``<->``
+        (``NEAREST_CANDIDATE_FACTOR`` por vizinho pedido), então o custo
+        depende de ``k`` e não do raio. A distância exata (``ST_Distance`` em
+        geography, 0 para a fazenda que contém o ponto) reordena os
+        candidatos. Com ``max_distance_m`` os candidatos passam antes pelos
+        filtros da busca por raio.
+        """
+        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        candidates = (
+            select(Farm.ogc_fid)
+            .order_by(Farm.geometry.op("<->")(point))
+            .limit(k * NEAREST_CANDIDATE_FACTOR)
+        )
+        if max_distance_m is not None:
+            candidates = candidates.where(
+                *cls.radius_filters(latitude, longitude, max_distance_m / 1000)
+            )
+        candidates = candidates.subquery("candidates")
+
+        distance = func.ST_Distance(func.Geography(Farm.geometry), func.Geography(point))
+        return (
+            cls._select(projection, render)
+            .add_columns(distance.label("distance_m"))
+            .join(candidates, candidates.c.ogc_fid == Farm.ogc_fid)
+            .order_by(distance, Farm.ogc_fid)
+            .limit(k)
+        )
+
+    @staticmethod
+    def _group_by_point(rows: Sequence[Row], count: int) -> list[list[int]]:
+        """Agrupa os pares (índice, ``ogc_fid``) numa lista por ponto."""
+        results: list[list[int]] = [[] for _ in range(count)]
+        for idx, ogc_fid in rows:
+            results[idx - 1].append(ogc_fid)
+        return results
+
+    @classmethod
+    def _ids_statement(
+        cls, ids: Sequence[int], projection: Projection, render: GeometryRender
+    ) -> Select:
+        """Busca fazendas por ``ogc_fid = ANY(:ids)``, ordenadas por ``ogc_fid``."""
+        ids_param = bindparam("ids", list(ids), type_=ARRAY(Integer))
+        return (
+            cls._select(projection, render)
+            .where(Farm.ogc_fid == any_(ids_param))
+            .order_by(Farm.ogc_fid)
+        )
+
+    @classmethod
+    def _batch_statement(
+        cls, ids: Sequence[int | str], id_type: BatchIdType, render: GeometryRender
+    ) -> Select:
+        """Busca em lote por ``ogc_fid`` ou ``cod_imovel`` com ``= ANY(:ids)``, sem ordenação."""
+        if id_type == BatchIdType.OGC_FID:
+            column, ids_type = Farm.ogc_fid, ARRAY(Integer)
+        else:
+            column, ids_type = Farm.cod_imovel, ARRAY(String)
+        ids_param = bindparam("ids", list(ids), type_=ids_type)
+        return cls._select(Projection.COLUMNS, render).where(column == any_(ids_param))
+
+    @staticmethod
+    def _slice_ids(
+        ids: Sequence[int], page: int, page_size: int, after_id: Optional[int]
+    ) -> tuple[Sequence[int], bool]:
+        """
+        Pagina uma lista ordenada de ``ogc_fid`` já conhecida (cache de pontos).
+
+        Returns:
+            (ids da página, se existe próxima página)
+        """
+        if after_id is not None:
+            start = bisect.bisect_right(ids, after_id)
+        else:
+            start = (page - 1) * page_size
+        return ids[start : start + page_size], start + page_size < len(ids)
+
+    @classmethod
+    def _radius_statement(
+        cls,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        name_filter: Optional[str],
+        min_area: Optional[float],
+        max_area: Optional[float],
+        projection: Projection,
+        render: GeometryRender,
+    ) -> Select:
+        stmt = cls._select(projection, render).where(
+            *cls.radius_filters(latitude, longitude, radius_km)
+        )
+
+        # Filtros opcionais; o LIKE sobre unaccent_lower usa os índices de trigramas
+        if name_filter:
+            term = normalize_search_text(name_filter)
+            stmt = stmt.where(
+                or_(
+                    search_text(Farm.cod_imovel).contains(term, autoescape=True),
+                    search_text(Farm.municipio).contains(term, autoescape=True),
+                )
+            )
+
+        if min_area is not None:
+            stmt = stmt.where(Farm.num_area >= min_area)
+
+        if max_area is not None:
+            stmt = stmt.where(Farm.num_area <= max_area)
+
+        return stmt
+
+    @staticmethod
+    def _name_statement(query: str, mode: NameSearchMode, limit: int, offset: int) -> Select:
+        """
+        Busca por ``cod_imovel`` ou ``municipio``, ordenada por similaridade.
+
+        ``similar`` usa o operador ``<%`` (``word_similarity`` acima de
+        ``pg_trgm.word_similarity_threshold``) e ``prefix`` um ``LIKE 'texto%'``;
+        ambos são atendidos pelos índices GIN de trigramas sobre
+        ``unaccent_lower``. Empates seguem o ``ogc_fid``.
+        """
+        term = normalize_search_text(query)
+        columns = (search_text(Farm.cod_imovel), search_text(Farm.municipio))
+        if mode == NameSearchMode.PREFIX:
+            predicates = [column.startswith(term, autoescape=True) for column in columns]
+        else:
+            predicates = [literal(term).op("<%")(column) for column in columns]
+        score = func.greatest(*(func.word_similarity(term, column) for column in columns))
+        return (
+            select(
+                Farm.ogc_fid,
+                Farm.cod_imovel,
+                Farm.municipio,
+                Farm.num_area,
+                score.label("score"),
+            )
+            .where(or_(*predicates))
+            .order_by(score.desc(), Farm.ogc_fid)
+            .offset(offset)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def _page_statement(
+        stmt: Select, page: int, page_size: int, after_id: Optional[int]
+    ) -> tuple[Select, int]:
+        """
+        Aplica ordenação estável por ``ogc_fid`` e pagina a instrução.
+
+        Sem ``after_id`` usa offset (compatível com ``page``); com ``after_id``
+        busca a partir da chave, mantendo o custo constante em páginas profundas.
+        Busca uma linha a mais para saber se existe próxima página.
+
+        Returns:
+            (instrução paginada, offset aplicado)
+        """
+        paged = stmt.order_by(Farm.ogc_fid)
+        offset = 0
+        if after_id is not None:
+            paged = paged.where(Farm.ogc_fid > after_id)
+        else:
+            offset = (page - 1) * page_size
+            paged = paged.offset(offset)
+        return paged.limit(page_size + 1), offset
+
+    @staticmethod
+    def _count_statement(stmt: Select, count_mode: CountMode, count_cap: int) -> Select:
+        """``count(*)`` do predicado; limitado a ``count_cap`` linhas no modo estimate."""
+        counted = stmt.with_only_columns(Farm.ogc_fid).order_by(None)
+        if count_mode == CountMode.ESTIMATE:
+            counted = counted.limit(count_cap)
+        return select(func.count()).select_from(counted.subquery())
+
+    @staticmethod
+    def _build_page(
+        rows: list,
+        page_size: int,
+        offset: int,
+        after_id: Optional[int],
+        count_mode: CountMode,
+    ) -> tuple[FarmPage, bool]:
+        """
+        Monta a página a partir das ``page_size + 1`` linhas buscadas.
+
+        O total depende de ``count_mode``:
+
+        - ``exact``: ``count(*)`` do predicado completo;
+        - ``estimate``: ``count(*)`` que para em ``count_cap`` linhas;
+        - ``none``: sem contagem (apenas ``has_more``).
+
+        Quando a página já revela o total (última página via offset), a
+        contagem é dispensada em qualquer modo.
+
+        Returns:
+            (página, se ainda é preciso executar a contagem)
+        """
+        has_more = len(rows) > page_size
+        result = FarmPage(farms=rows[:page_size], total=None, has_more=has_more)
+
+        if count_mode == CountMode.NONE:
+            return result, False
+
+        if after_id is None and not has_more and (result.farms or offset == 0):
+            result.total = offset + len(result.farms)
+            return result, False
+
+        return result, True
+
+    @staticmethod
+    def _apply_count(result: FarmPage, total: int, count_mode: CountMode, count_cap: int) -> None:
+        result.total = total
+        result.total_capped = count_mode == CountMode.ESTIMATE and total >= count_cap
+
+    @staticmethod
+    def radius_filters(latitude: float, longitude: float, radius_km: float) -> tuple:
+        """
+        Filtros da busca por raio em duas fases.
+
+        1. ``geometry && envelope``: pré-filtro por bounding box, atendido pelo
+           índice GIST em ``farms.geometry`` (sem cast na coluna).
+        2. ``ST_DWithin`` em geography: teste geodésico exato (metros), avaliado
+           apenas nas fazendas que passaram pelo pré-filtro.
+        """
+        # Ponto em WGS84 (SRID 4326)
+        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+
+        # Converte km para metros (ST_DWithin em geography usa metros)
+        radius_m = radius_km * 1000
+
+        envelope = func.ST_MakeEnvelope(*radius_envelope(latitude, longitude, radius_m), 4326)
+
+        return (
+            Farm.geometry.op("&&")(envelope),
+            func.ST_DWithin(
+                func.Geography(Farm.geometry),
+                func.Geography(point),
+                radius_m,
+            ),
+        )
+
+
+class FarmQueryService(BaseFarmQueryService):
     """Executa consultas espaciais de fazendas."""
 
     def __init__(self, db: Session):
         self.db = db
 
-    def get_farm_by_id(self, farm_id: int) -> Optional[Farm]:
-        """Busca fazenda por ID (ogc_fid)."""
-        logger.info(f"Buscando fazenda ID: {farm_id}")
-        return self.db.query(Farm).filter(Farm.cod_imovel == farm_id).first()
+    def _fetch(self, stmt: Select, projection: Projection) -> list[Farm | Row | int]:
+        if projection == Projection.COLUMNS:
+            return list(self.db.execute(stmt).all())
+        return list(self.db.scalars(stmt).all())
+
+    def get_farm_by_id(
+        self,
+        farm_id: str,
+        projection: Projection = Projection.ENTITY,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> Optional[Farm | Row]:
+        """Busca fazenda por ID (cod_imovel)."""
+        logger.info("Buscando fazenda ID: %s", farm_id)
+        rows = self._fetch(self._by_id_statement(farm_id, projection, render), projection)
+        return rows[0] if rows else None
+
+    def get_farms_by_ids(
+        self,
+        ids: Sequence[int],
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> list[Farm | Row]:
+        """Busca várias fazendas por ``ogc_fid`` numa única consulta."""
+        if not ids:
+            return []
+        return self._fetch(self._ids_statement(ids, projection, render), projection)
 
     def search_by_point(
         self,
@@ -31,25 +590,27 @@ class FarmQueryService:
         longitude: float,
         page: int = 1,
         page_size: int = 50,
-    ) -> tuple[list[Farm], int]:
+        projection: Projection = Projection.ENTITY,
+        render: GeometryRender = DEFAULT_RENDER,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        count_cap: int = 1000,
+    ) -> FarmPage:
         """
         Busca fazendas contendo o ponto (ST_Covers).
-        Retorna (lista_fazendas, total).
-        """
-        logger.info(f"Buscando fazendas contendo ponto: ({latitude}, {longitude})")
-
-        # Ponto em WGS84 (SRID 4326). Ordem correta: (lon, lat)
-        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
-
-        query = self.db.query(Farm).filter(ST_Covers(Farm.geometry, point))
 
-        total = query.count()
+        Com ``after_id`` pagina por chave (``ogc_fid > after_id``) em vez de offset.
+        ``count_mode`` define como o total é calculado (ver ``_build_page``).
+        """
+        logger.info("Buscando fazendas contendo ponto: (%s, %s)", latitude, longitude)
 
-        offset = (page - 1) * page_size
-        farms = query.offset(offset).limit(page_size).all()
+        stmt = self._point_statement(latitude, longitude, projection, render)
+        result = self._paginate(stmt, projection, page, page_size, after_id, count_mode, count_cap)
 
-        logger.info(f"Encontradas {total} fazendas contendo o ponto")
-        return farms, total
+        logger.info(
+            "Encontradas %s fazendas contendo o ponto (count=%s)", result.total, count_mode.value
+        )
+        return result
 
     def search_by_radius(
         self,
@@ -61,52 +622,394 @@ class FarmQueryService:
         name_filter: Optional[str] = None,
         min_area: Optional[float] = None,
         max_area: Optional[float] = None,
-    ) -> tuple[list[Farm], int]:
+        projection: Projection = Projection.ENTITY,
+        render: GeometryRender = DEFAULT_RENDER,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        count_cap: int = 1000,
+    ) -> FarmPage:
         logger.info(
-            f"Buscando fazendas num raio de {radius_km}km do ponto: ({latitude}, {longitude})"
+            "Buscando fazendas num raio de %skm do ponto: (%s, %s)", radius_km, latitude, longitude
         )
 
-        # Ponto em WGS84 (SRID 4326)
-        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        stmt = self._radius_statement(
+            latitude,
+            longitude,
+            radius_km,
+            name_filter,
+            min_area,
+            max_area,
+            projection,
+            render,
+        )
+        result = self._paginate(stmt, projection, page, page_size, after_id, count_mode, count_cap)
 
-        # Converte km para metros (ST_DWithin em geography usa metros)
-        radius_m = radius_km * 1000
+        logger.info(
+            "Encontradas %s fazendas no raio de %skm (count=%s)",
+            result.total,
+            radius_km,
+            count_mode.value,
+        )
+        return result
 
-        # ST_DWithin usando geography para distância real (metros)
-        query = self.db.query(Farm).filter(
-            func.ST_DWithin(
-                func.Geography(Farm.geometry),
-                func.Geography(point),
-                radius_m,
-            )
+    def search_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        max_distance_m: Optional[float] = None,
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> list[Row]:
+        """
+        Busca as ``k`` fazendas mais próximas do ponto (KNN com ``<->``).
+
+        Returns:
+            Linhas da projeção mais ``distance_m``, da mais próxima à mais distante
+        """
+        logger.info("Buscando %d fazendas mais próximas de (%s, %s)", k, latitude, longitude)
+        stmt = self._nearest_statement(latitude, longitude, k, max_distance_m, projection, render)
+        return list(self.db.execute(stmt).all())
+
+    def search_by_name(
+        self,
+        query: str,
+        mode: NameSearchMode = NameSearchMode.SIMILAR,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> tuple[list[Row], bool]:
+        """
+        Busca fazendas por ``cod_imovel`` ou município, sem diferenciar acentos.
+
+        Returns:
+            (linhas com ``score`` da página, se existe próxima página)
+        """
+        logger.info("Buscando fazendas por nome: %s (%s)", query, mode.value)
+        stmt = self._name_statement(query, mode, page_size + 1, (page - 1) * page_size)
+        rows = list(self.db.execute(stmt).all())
+        return rows[:page_size], len(rows) > page_size
+
+    def search_by_points(self, points: Sequence[tuple[float, float]]) -> list[list[int]]:
+        """
+        Busca, numa única consulta, as fazendas que contêm cada ponto.
+
+        Args:
+            points: Pares (latitude, longitude)
+
+        Returns:
+            ``ogc_fid`` das fazendas que cobrem cada ponto, na ordem de ``points``
+        """
+        logger.info("Buscando fazendas contendo %d pontos", len(points))
+        rows = self.db.execute(self._points_statement(points)).all()
+        return self._group_by_point(rows, len(points))
+
+    def _paginate(
+        self,
+        stmt: Select,
+        projection: Projection,
+        page: int,
+        page_size: int,
+        after_id: Optional[int],
+        count_mode: CountMode,
+        count_cap: int,
+    ) -> FarmPage:
+        paged, offset = self._page_statement(stmt, page, page_size, after_id)
+        rows = self._fetch(paged, projection)
+
+        result, needs_count = self._build_page(rows, page_size, offset, after_id, count_mode)
+        if needs_count:
+            total = self.db.scalar(self._count_statement(stmt, count_mode, count_cap))
+            self._apply_count(result, total, count_mode, count_cap)
+        return result
+
+
+class AsyncFarmQueryService(BaseFarmQueryService):
+    """
+    Versão assíncrona do ``FarmQueryService``.
+
+    Usa ``AsyncSession`` (asyncpg), de modo que as consultas PostGIS não
+    bloqueiam o event loop do uvicorn.
+
+    Com ``point_cache`` a busca por ponto arredonda as coordenadas e reaproveita
+    os ``ogc_fid`` que cobrem o ponto para a versão ``dataset_version`` do dataset.
+    O ``ST_Covers`` roda sobre o ponto arredondado: perto da divisa entre duas
+    fazendas o resultado pode diferir do ponto exato (até ~1,1 m com 5 casas).
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        point_cache: Optional[PointLookupCache] = None,
+        dataset_version: int = 0,
+    ):
+        self.db = db
+        self.point_cache = point_cache
+        self.dataset_version = dataset_version
+
+    async def _fetch(self, stmt: Select, projection: Projection) -> list[Farm | Row | int]:
+        if projection == Projection.COLUMNS:
+            return list((await self.db.execute(stmt)).all())
+        return list((await self.db.scalars(stmt)).all())
+
+    async def get_farm_by_id(
+        self,
+        farm_id: str,
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> Optional[Farm | Row]:
+        """Busca fazenda por ID (cod_imovel)."""
+        logger.info("Buscando fazenda ID: %s", farm_id)
+        stmt = self._by_id_statement(farm_id, projection, render)
+        rows = await self._fetch(stmt, projection)
+        return rows[0] if rows else None
+
+    async def get_farm_revision(self, farm_id: str) -> Optional[Row]:
+        """``ogc_fid`` e ``dat_atuali`` de uma fazenda (cod_imovel), sem a geometria."""
+        stmt = (
+            select(Farm.ogc_fid, Farm.dat_atuali)
+            .where(Farm.cod_imovel == farm_id)
+            .order_by(Farm.ogc_fid)
+            .limit(1)
         )
+        return (await self.db.execute(stmt)).first()
 
-        # Filtros opcionais
-        if name_filter:
-            query = query.filter(
-                (Farm.cod_imovel.ilike(f"%{name_filter}%"))
-                | (Farm.municipio.ilike(f"%{name_filter}%"))
+    async def get_farms_by_ids(
+        self,
+        ids: Sequence[int],
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> list[Farm | Row]:
+        """Busca várias fazendas por ``ogc_fid`` numa única consulta."""
+        if not ids:
+            return []
+        return await self._fetch(self._ids_statement(ids, projection, render), projection)
+
+    async def stream_farms_by_keys(
+        self,
+        ids: Sequence[int | str],
+        id_type: BatchIdType = BatchIdType.COD_IMOVEL,
+        render: GeometryRender = DEFAULT_RENDER,
+        yield_per: int = 500,
+    ) -> AsyncIterator[Row]:
+        """
+        Busca várias fazendas por ``ogc_fid`` ou ``cod_imovel`` numa única consulta.
+
+        As linhas (atributos + GeoJSON) são lidas do cursor em lotes de
+        ``yield_per`` à medida que são consumidas, sem materializar o resultado.
+        """
+        logger.info("Buscando %d fazendas em lote por %s", len(ids), id_type.value)
+        async for row in self._stream(self._batch_statement(ids, id_type, render), yield_per):
+            yield row
+
+    async def stream_by_point(
+        self,
+        latitude: float,
+        longitude: float,
+        render: GeometryRender = DEFAULT_RENDER,
+        yield_per: int = 500,
+    ) -> AsyncIterator[Row]:
+        """Todas as fazendas que contêm o ponto, lidas por cursor no servidor."""
+        logger.info("Exportando fazendas contendo ponto: (%s, %s)", latitude, longitude)
+        stmt = self._point_statement(latitude, longitude, Projection.COLUMNS, render)
+        async for row in self._stream(stmt, yield_per):
+            yield row
+
+    async def stream_by_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        name_filter: Optional[str] = None,
+        min_area: Optional[float] = None,
+        max_area: Optional[float] = None,
+        render: GeometryRender = DEFAULT_RENDER,
+        yield_per: int = 500,
+    ) -> AsyncIterator[Row]:
+        """Todas as fazendas dentro do raio, lidas por cursor no servidor."""
+        logger.info(
+            "Exportando fazendas no raio de %skm de (%s, %s)", radius_km, latitude, longitude
+        )
+        stmt = self._radius_statement(
+            latitude,
+            longitude,
+            radius_km,
+            name_filter,
+            min_area,
+            max_area,
+            Projection.COLUMNS,
+            render,
+        )
+        async for row in self._stream(stmt, yield_per):
+            yield row
+
+    async def _stream(self, stmt: Select, yield_per: int) -> AsyncIterator[Row]:
+        """
+        Executa ``stmt`` com cursor no servidor (``AsyncSession.stream``).
+
+        As linhas chegam em lotes de ``yield_per``; a memória usada não depende
+        do total de fazendas encontradas.
+        """
+        result = await self.db.stream(stmt.execution_options(yield_per=yield_per))
+        async for row in result:
+            yield row
+
+    async def search_by_point(
+        self,
+        latitude: float,
+        longitude: float,
+        page: int = 1,
+        page_size: int = 50,
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        count_cap: int = 1000,
+    ) -> FarmPage:
+        """Busca fazendas contendo o ponto (ST_Covers). Ver ``FarmQueryService``."""
+        logger.info("Buscando fazendas contendo ponto: (%s, %s)", latitude, longitude)
+
+        if self.point_cache is not None:
+            latitude, longitude = self.point_cache.snap(latitude, longitude)
+            ids = await self._covering_ids(latitude, longitude)
+            result = await self._paginate_ids(
+                ids, projection, render, page, page_size, after_id, count_mode
+            )
+        else:
+            stmt = self._point_statement(latitude, longitude, projection, render)
+            result = await self._paginate(
+                stmt, projection, page, page_size, after_id, count_mode, count_cap
             )
 
-        if min_area is not None:
-            query = query.filter(Farm.num_area >= min_area)
+        logger.info(
+            "Encontradas %s fazendas contendo o ponto (count=%s)", result.total, count_mode.value
+        )
+        return result
 
-        if max_area is not None:
-            query = query.filter(Farm.num_area <= max_area)
+    async def search_by_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        page: int = 1,
+        page_size: int = 50,
+        name_filter: Optional[str] = None,
+        min_area: Optional[float] = None,
+        max_area: Optional[float] = None,
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+        after_id: Optional[int] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        count_cap: int = 1000,
+    ) -> FarmPage:
+        """Busca fazendas num raio a partir do ponto. Ver ``FarmQueryService``."""
+        logger.info(
+            "Buscando fazendas num raio de %skm do ponto: (%s, %s)", radius_km, latitude, longitude
+        )
 
-        total = query.count()
+        stmt = self._radius_statement(
+            latitude,
+            longitude,
+            radius_km,
+            name_filter,
+            min_area,
+            max_area,
+            projection,
+            render,
+        )
+        result = await self._paginate(
+            stmt, projection, page, page_size, after_id, count_mode, count_cap
+        )
 
-        offset = (page - 1) * page_size
-        farms = query.offset(offset).limit(page_size).all()
+        logger.info(
+            "Encontradas %s fazendas no raio de %skm (count=%s)",
+            result.total,
+            radius_km,
+            count_mode.value,
+        )
+        return result
 
-        logger.info(f"Encontradas {total} fazendas no raio de {radius_km}km")
-        return farms, total
+    async def search_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        max_distance_m: Optional[float] = None,
+        projection: Projection = Projection.COLUMNS,
+        render: GeometryRender = DEFAULT_RENDER,
+    ) -> list[Row]:
+        """Busca as ``k`` fazendas mais próximas do ponto. Ver ``FarmQueryService``."""
+        logger.info("Buscando %d fazendas mais próximas de (%s, %s)", k, latitude, longitude)
+        stmt = self._nearest_statement(latitude, longitude, k, max_distance_m, projection, render)
+        return list((await self.db.execute(stmt)).all())
 
-    @staticmethod
-    def farm_to_geojson(farm: Farm, db: Session) -> dict | None:
-        """Converte geometria da fazenda para GeoJSON."""
-        if not farm.geometry:
-            return None
+    async def search_by_name(
+        self,
+        query: str,
+        mode: NameSearchMode = NameSearchMode.SIMILAR,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> tuple[list[Row], bool]:
+        """Busca fazendas por ``cod_imovel`` ou município. Ver ``FarmQueryService``."""
+        logger.info("Buscando fazendas por nome: %s (%s)", query, mode.value)
+        stmt = self._name_statement(query, mode, page_size + 1, (page - 1) * page_size)
+        rows = list((await self.db.execute(stmt)).all())
+        return rows[:page_size], len(rows) > page_size
+
+    async def get_tile(self, z: int, x: int, y: int, extent: int = 4096, buffer: int = 64) -> bytes:
+        """Vector tile (MVT) das fazendas no tile z/x/y, renderizado pelo PostGIS."""
+        logger.info("Renderizando tile %d/%d/%d", z, x, y)
+        tile = await self.db.scalar(self._tile_statement(z, x, y, extent, buffer))
+        return bytes(tile) if tile else b""
+
+    async def search_by_points(self, points: Sequence[tuple[float, float]]) -> list[list[int]]:
+        """Busca as fazendas que contêm cada ponto. Ver ``FarmQueryService``."""
+        logger.info("Buscando fazendas contendo %d pontos", len(points))
+        rows = (await self.db.execute(self._points_statement(points))).all()
+        return self._group_by_point(rows, len(points))
+
+    async def _paginate(
+        self,
+        stmt: Select,
+        projection: Projection,
+        page: int,
+        page_size: int,
+        after_id: Optional[int],
+        count_mode: CountMode,
+        count_cap: int,
+    ) -> FarmPage:
+        paged, offset = self._page_statement(stmt, page, page_size, after_id)
+        rows = await self._fetch(paged, projection)
+
+        result, needs_count = self._build_page(rows, page_size, offset, after_id, count_mode)
+        if needs_count:
+            total = await self.db.scalar(self._count_statement(stmt, count_mode, count_cap))
+            self._apply_count(result, total, count_mode, count_cap)
+        return result
 
-        geojson_str = db.scalar(func.ST_AsGeoJSON(farm.geometry))
-        return json.loads(geojson_str) if geojson_str else None
+    async def _covering_ids(self, latitude: float, longitude: float) -> Sequence[int]:
+        """``ogc_fid`` que cobrem o ponto, servidos pelo cache quando possível."""
+        key = self.point_cache.key(self.dataset_version, latitude, longitude)
+        ids = self.point_cache.get(key)
+        if ids is None:
+            stmt = self._covering_ids_statement(latitude, longitude)
+            ids = tuple((await self.db.scalars(stmt)).all())
+            self.point_cache.set(key, ids)
+        return ids
+
+    async def _paginate_ids(
+        self,
+        ids: Sequence[int],
+        projection: Projection,
+        render: GeometryRender,
+        page: int,
+        page_size: int,
+        after_id: Optional[int],
+        count_mode: CountMode,
+    ) -> FarmPage:
+        page_ids, has_more = self._slice_ids(ids, page, page_size, after_id)
+        farms = list(page_ids) if projection == Projection.IDS else []
+        if page_ids and projection != Projection.IDS:
+            stmt = self._ids_statement(page_ids, projection, render)
+            farms = await self._fetch(stmt, projection)
+        total = None if count_mode == CountMode.NONE else len(ids)
+        return FarmPage(farms=farms, total=total, has_more=has_more)
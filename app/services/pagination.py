@@ -0,0 +1,35 @@
+"""
+Cursores opacos para paginação por chave (keyset).
+"""
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou adulterado."""
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codifica o último ``ogc_fid`` da página num cursor opaco (base64 URL-safe)."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decodifica um cursor gerado por ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: se o cursor não puder ser decodificado
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as err:
+        raise InvalidCursorError("Cursor inválido.") from err
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError("Cursor inválido.")
+    return last_id
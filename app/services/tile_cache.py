@@ -0,0 +1,32 @@
+"""
+Cache de vector tiles (MVT) já renderizados pelo PostGIS.
+
+Os tiles são chaveados por versão do dataset e z/x/y, e guardados num LRU
+em memória limitado por bytes (o mesmo do cache de documentos).
+"""
+from typing import Optional
+
+from app.core.config import get_settings
+from app.services.document_cache import FarmDocumentCache, InMemoryDocumentCache
+
+settings = get_settings()
+
+
+def tile_key(dataset_version: int, z: int, x: int, y: int) -> str:
+    """Chave de um tile numa versão do dataset."""
+    return f"tile:{dataset_version}:{z}/{x}/{y}"
+
+
+tile_cache: Optional[FarmDocumentCache] = (
+    InMemoryDocumentCache(
+        max_bytes=settings.tile_cache_max_bytes,
+        max_item_bytes=settings.tile_cache_max_item_bytes,
+    )
+    if settings.tile_cache_max_bytes > 0
+    else None
+)
+
+
+def get_tile_cache() -> Optional[FarmDocumentCache]:
+    """Dependência que fornece o cache de tiles (``None`` se desligado)."""
+    return tile_cache
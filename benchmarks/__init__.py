@@ -0,0 +1 @@
+"""Benchmarks de desempenho da API (executados contra o PostGIS local)."""
@@ -0,0 +1,103 @@
+"""
+Benchmark: buscas por raio concorrentes num único event loop.
+
+Modo em processo (padrão): dispara N buscas simultâneas no mesmo event loop
+e compara o caminho antigo (``Session`` síncrona chamada dentro de uma rota
+``async def``, que bloqueia o loop) com o ``AsyncFarmQueryService`` (asyncpg).
+
+Modo HTTP (``--base-url``): dispara N requisições simultâneas contra um worker
+uvicorn em execução; rode antes e depois da mudança para comparar.
+
+Uso (com o banco do docker-compose no ar e populado):
+
+    python -m benchmarks.bench_async_concurrency --requests 200
+    python -m benchmarks.bench_async_concurrency --requests 200 --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.db import AsyncSessionLocal, SessionLocal, async_engine
+from app.services.farm_queries import AsyncFarmQueryService, FarmQueryService, Projection
+
+
+async def _sync_search(args) -> None:
+    # Reproduz a rota antiga: consulta síncrona dentro de uma corrotina
+    with SessionLocal() as db:
+        FarmQueryService(db).search_by_radius(
+            args.latitude, args.longitude, args.radius_km, projection=Projection.COLUMNS
+        )
+
+
+async def _async_search(args) -> None:
+    async with AsyncSessionLocal() as db:
+        await AsyncFarmQueryService(db).search_by_radius(
+            args.latitude, args.longitude, args.radius_km
+        )
+
+
+def _http_search(client, args):
+    async def _search(args) -> None:
+        payload = {
+            "latitude": args.latitude,
+            "longitude": args.longitude,
+            "raio_km": args.radius_km,
+        }
+        response = await client.post("/fazendas/busca-raio", json=payload)
+        response.raise_for_status()
+
+    return _search
+
+
+async def _run(search, args) -> tuple[float, list[float]]:
+    async def _timed() -> float:
+        start = time.perf_counter()
+        await search(args)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(_timed() for _ in range(args.requests)))
+    return time.perf_counter() - start, list(latencies)
+
+
+def _report(label: str, elapsed: float, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<8} {len(latencies) / elapsed:>10.1f} {quantiles[49]:>9.1f} "
+        f"{quantiles[94]:>9.1f} {quantiles[98]:>9.1f}"
+    )
+
+
+async def main_async(args) -> None:
+    print(f"{'modo':<8} {'req/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+
+    if args.base_url:
+        import httpx
+
+        limits = httpx.Limits(max_connections=args.requests)
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+            search = _http_search(client, args)
+            await search(args)  # Aquecimento
+            _report("http", *await _run(search, args))
+        return
+
+    for label, search in (("sync", _sync_search), ("async", _async_search)):
+        await search(args)  # Aquecimento
+        _report(label, *await _run(search, args))
+
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latitude", type=float, default=-23.5505)
+    parser.add_argument("--longitude", type=float, default=-46.6333)
+    parser.add_argument("--radius-km", type=float, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--base-url", default=None, help="URL de um worker da API (modo HTTP)")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
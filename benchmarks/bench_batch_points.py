@@ -0,0 +1,100 @@
+"""
+Benchmark: busca por vários pontos numa junção espacial vs. uma busca por ponto.
+
+Para cada quantidade de pontos (aleatórios dentro do estado de SP), mede o
+tempo de uma única ``search_by_points`` (``unnest`` + ``ST_Covers``) e o de N
+buscas individuais. Com muitos pontos as buscas individuais são amostradas
+(``--individual-limit``) e o tempo total é extrapolado.
+
+Modo HTTP (``--base-url``): compara ``POST /fazendas/busca-pontos`` com N
+chamadas a ``POST /fazendas/busca-ponto`` contra um worker em execução.
+
+Uso (com o banco do docker-compose no ar e populado):
+
+    python -m benchmarks.bench_batch_points --points 1000 10000 100000
+    python -m benchmarks.bench_batch_points --points 1000 --base-url http://localhost:8000
+"""
+import argparse
+import random
+import time
+
+from app.core.db import SessionLocal
+from app.services.farm_queries import FarmQueryService
+from benchmarks.common import SP_LATITUDES, SP_LONGITUDES
+
+
+def _random_points(count: int, seed: int) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(*SP_LATITUDES), rng.uniform(*SP_LONGITUDES)) for _ in range(count)]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _in_process(points: list[tuple[float, float]], sample: list[tuple[float, float]]):
+    with SessionLocal() as session:
+        service = FarmQueryService(session)
+
+        def batch() -> None:
+            service.search_by_points(points)
+
+        def individual() -> None:
+            for latitude, longitude in sample:
+                session.scalars(service._covering_ids_statement(latitude, longitude)).all()
+
+        return _timed(batch), _timed(individual)
+
+
+def _http(client, points: list[tuple[float, float]], sample: list[tuple[float, float]]):
+    def batch() -> None:
+        response = client.post("/fazendas/busca-pontos", json={"points": points})
+        response.raise_for_status()
+
+    def individual() -> None:
+        for latitude, longitude in sample:
+            payload = {"latitude": latitude, "longitude": longitude}
+            response = client.post("/fazendas/busca-ponto?count=none", json=payload)
+            response.raise_for_status()
+
+    return _timed(batch), _timed(individual)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--individual-limit", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", default=None, help="URL de um worker da API (modo HTTP)")
+    args = parser.parse_args()
+
+    client = None
+    if args.base_url:
+        import httpx
+
+        client = httpx.Client(base_url=args.base_url, timeout=600)
+
+    print(f"{'pontos':>8} {'lote (s)':>10} {'individual (s)':>15} {'amostra':>8} {'ganho':>7}")
+    for count in args.points:
+        points = _random_points(count, args.seed)
+        sample = points[: args.individual_limit]
+
+        if client is not None:
+            batch_s, sample_s = _http(client, points, sample)
+        else:
+            batch_s, sample_s = _in_process(points, sample)
+
+        individual_s = sample_s * count / len(sample)
+        print(
+            f"{count:>8} {batch_s:>10.2f} {individual_s:>15.2f} "
+            f"{len(sample):>8} {individual_s / batch_s:>6.1f}x"
+        )
+
+    if client is not None:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: bytes transferidos e latência das buscas por codificação.
+
+Para cada tamanho de página, repete a mesma busca por raio contra um worker
+em execução pedindo ``identity``, ``gzip``, ``br`` e ``zstd`` no
+``Accept-Encoding`` (as duas últimas só se o servidor tiver ``brotli`` /
+``zstandard``) e reporta os bytes recebidos e a latência p50/p95.
+
+Uso (API e banco do docker-compose no ar e populados):
+
+    python -m benchmarks.bench_compression --page-sizes 10 50 100 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+import httpx
+
+from benchmarks.common import percentile
+
+ENCODINGS = ("identity", "gzip", "br", "zstd")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--latitude", type=float, default=-23.5505)
+    parser.add_argument("--longitude", type=float, default=-46.6333)
+    parser.add_argument("--radius-km", type=float, default=50)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = {"latitude": args.latitude, "longitude": args.longitude, "raio_km": args.radius_km}
+    print(f"{'codificação':<12} {'page_size':>9} {'KB':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+
+    with httpx.Client(base_url=args.base_url, timeout=120) as client:
+        for page_size in args.page_sizes:
+            url = f"/fazendas/busca-raio?page_size={page_size}&count=none"
+            for encoding in ENCODINGS:
+                headers = {"Accept-Encoding": encoding}
+                # Aquecimento; também descobre se o servidor suporta a codificação
+                response = client.post(url, json=payload, headers=headers)
+                response.raise_for_status()
+                served = response.headers.get("content-encoding", "identity")
+                if served != encoding:
+                    continue
+
+                timings, sizes = [], []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    response = client.post(url, json=payload, headers=headers)
+                    response.read()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    sizes.append(response.num_bytes_downloaded)
+
+                kb = statistics.mean(sizes) / 1024 if sizes else 0.0
+                print(
+                    f"{encoding:<12} {page_size:>9} {kb:>9.1f} "
+                    f"{percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
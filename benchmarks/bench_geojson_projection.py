@@ -0,0 +1,99 @@
+"""
+Benchmark: GeoJSON renderizado na consulta principal vs. um ST_AsGeoJSON por fazenda.
+
+Compara, para cada tamanho de página, o número de idas ao banco e a latência
+(p50/p95) do caminho antigo (entidades ORM + um ``ST_AsGeoJSON`` por fazenda,
+reproduzido aqui) com o modo de projeção do ``FarmQueryService`` renderizado
+por ``render_farm_document``.
+
+Uso (com o banco do docker-compose no ar e populado):
+
+    python -m benchmarks.bench_geojson_projection --page-sizes 10 50 100 --repeat 30
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import event, func
+
+from app.core.db import SessionLocal, engine
+from app.schemas.farm import FarmResponse
+from app.services.farm_documents import FARM_DOCUMENT_FIELDS, render_farm_document
+from app.services.farm_queries import FarmQueryService, Projection
+from benchmarks.common import percentile
+
+
+class RoundTripCounter:
+    """Conta as instruções enviadas ao banco pela engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+
+def _run_page(session, page_size: int, projection: Projection, args) -> None:
+    service = FarmQueryService(session)
+    result = service.search_by_radius(
+        latitude=args.latitude,
+        longitude=args.longitude,
+        radius_km=args.radius_km,
+        page=1,
+        page_size=page_size,
+        projection=projection,
+    )
+    for farm in result.farms:
+        if projection == Projection.ENTITY:
+            _orm_document(farm, session)
+        else:
+            render_farm_document(farm)
+
+
+def _orm_document(farm, session) -> bytes:
+    """Caminho antigo: uma consulta ST_AsGeoJSON por fazenda e o documento via Pydantic."""
+    geojson = session.scalar(func.ST_AsGeoJSON(farm.geometry)) if farm.geometry else None
+    response = FarmResponse(
+        **{name: getattr(farm, name) for name in FARM_DOCUMENT_FIELDS},
+        geometry=json.loads(geojson) if geojson else None,
+    )
+    return response.model_dump_json().encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latitude", type=float, default=-23.5505)
+    parser.add_argument("--longitude", type=float, default=-46.6333)
+    parser.add_argument("--radius-km", type=float, default=50)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    counter = RoundTripCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+
+    print(f"{'modo':<10} {'page_size':>9} {'idas/pág':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    with SessionLocal() as session:
+        for page_size in args.page_sizes:
+            for label, projection in (("orm", Projection.ENTITY), ("projeção", Projection.COLUMNS)):
+                # Aquecimento (cache de planos e de páginas do Postgres)
+                _run_page(session, page_size, projection, args)
+
+                timings = []
+                counter.count = 0
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    _run_page(session, page_size, projection, args)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                round_trips = counter.count / max(args.repeat, 1)
+                print(
+                    f"{label:<10} {page_size:>9} {round_trips:>9.1f} "
+                    f"{percentile(timings, 50):>9.1f} {percentile(timings, 95):>9.1f}"
+                )
+
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+if __name__ == "__main__":
+    main()
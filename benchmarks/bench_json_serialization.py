@@ -0,0 +1,91 @@
+"""
+Microbenchmark: serialização dos documentos de fazendas com polígonos reais do CAR.
+
+Carrega as N fazendas com mais vértices (GeoJSON já renderizado pelo PostGIS)
+e compara, sem banco no laço medido:
+
+* ``jsonable``: ``json.loads`` do GeoJSON + ``FarmResponse`` + ``jsonable_encoder``
+  + ``json.dumps`` (caminho padrão do FastAPI com ``response_model``);
+* ``pydantic``: ``json.loads`` + ``FarmResponse.model_dump_json``;
+* ``splice``: atributos pelo encoder rápido e GeoJSON inserido como texto
+  (``render_farm_document``).
+
+Uso (com o banco do docker-compose no ar e populado):
+
+    python -m benchmarks.bench_json_serialization --farms 200 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+
+from app.core.db import SessionLocal
+from app.models.farm import Farm
+from app.schemas.farm import FarmResponse
+from app.services.farm_documents import render_farm_document
+from app.services.farm_queries import (
+    DEFAULT_RENDER,
+    FARM_ATTRIBUTE_COLUMNS,
+    FarmQueryService,
+    Projection,
+)
+
+
+def _load_rows(count: int) -> list:
+    with SessionLocal() as session:
+        stmt = (
+            FarmQueryService._select(Projection.COLUMNS, DEFAULT_RENDER)
+            .order_by(func.ST_NPoints(Farm.geometry).desc())
+            .limit(count)
+        )
+        return list(session.execute(stmt).all())
+
+
+def _model(row) -> FarmResponse:
+    values = {column.key: getattr(row, column.key) for column in FARM_ATTRIBUTE_COLUMNS}
+    return FarmResponse(**values, geometry=json.loads(row.geojson))
+
+
+def _jsonable(row) -> bytes:
+    return json.dumps(jsonable_encoder(_model(row))).encode()
+
+
+def _pydantic(row) -> bytes:
+    return _model(row).model_dump_json().encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--farms", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _load_rows(args.farms)
+    total_bytes = sum(len(row.geojson) for row in rows)
+    print(f"{len(rows)} fazendas, {total_bytes / 1e6:.1f} MB de GeoJSON")
+    print(f"{'caminho':<10} {'p50 (ms)':>9} {'µs/fazenda':>11} {'MB/s':>8}")
+
+    for label, render in (
+        ("jsonable", _jsonable),
+        ("pydantic", _pydantic),
+        ("splice", render_farm_document),
+    ):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for row in rows:
+                render(row)
+            timings.append(time.perf_counter() - start)
+
+        p50 = statistics.median(timings)
+        print(
+            f"{label:<10} {p50 * 1000:>9.1f} {p50 * 1e6 / len(rows):>11.1f} "
+            f"{total_bytes / 1e6 / p50:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Teste de carga: vazão e latência p50/p95/p99 por endpoint com concorrência fixa.
+
+Sorteia fazendas do banco (``cod_imovel`` e um ponto interno de cada)
+e dispara contra um worker em execução, com ``--concurrency`` requisições
+simultâneas, os workloads:
+
+* ``point``: ``POST /fazendas/busca-ponto``;
+* ``radius``: ``POST /fazendas/busca-raio`` (``--radius-km``);
+* ``id``: ``GET /fazendas/{cod_imovel}``;
+* ``batch``: ``POST /fazendas/lote`` com ``--batch-size`` IDs.
+
+O resultado vai para um JSON (commit, parâmetros, tamanho do dataset e as
+métricas de cada workload); ``--compare`` imprime a variação em relação a um
+JSON anterior, para comparar commits.
+
+Uso (API apontando para o banco populado, p.ex. por ``benchmarks.synthetic_farms``):
+
+    python -m benchmarks.bench_load --concurrency 32 --requests 2000
+    python -m benchmarks.bench_load --database meuat_bench --compare benchmarks/results/load-abc123.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+from benchmarks.common import percentile
+
+WORKLOADS = ("point", "radius", "id", "batch")
+
+SAMPLE_SQL = """
+    SELECT cod_imovel, ST_Y(p) AS latitude, ST_X(p) AS longitude
+    FROM (
+        SELECT cod_imovel, ST_PointOnSurface(geometry) AS p
+        FROM farms
+        ORDER BY random()
+        LIMIT :n
+    ) s
+"""
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _load_sample(database: str | None, size: int) -> tuple[int, list]:
+    url = make_url(get_settings().database_url)
+    engine = create_engine(url.set(database=database) if database else url)
+    with engine.connect() as conn:
+        total = conn.scalar(text("SELECT count(*) FROM farms"))
+        rows = conn.execute(text(SAMPLE_SQL), {"n": size}).all()
+    engine.dispose()
+    return total, rows
+
+
+def _requests(workload: str, sample: list, args, rng: random.Random):
+    """Gera (método, url, json) infinitamente para o workload."""
+    while True:
+        farm = rng.choice(sample)
+        if workload == "point":
+            payload = {"latitude": farm.latitude, "longitude": farm.longitude}
+            yield "POST", f"/fazendas/busca-ponto?count={args.count}", payload
+        elif workload == "radius":
+            payload = {
+                "latitude": farm.latitude,
+                "longitude": farm.longitude,
+                "raio_km": args.radius_km,
+            }
+            yield "POST", f"/fazendas/busca-raio?count={args.count}", payload
+        elif workload == "id":
+            yield "GET", f"/fazendas/{farm.cod_imovel}", None
+        else:
+            ids = [row.cod_imovel for row in rng.sample(sample, min(args.batch_size, len(sample)))]
+            yield "POST", "/fazendas/lote", {"ids": ids, "id_type": "cod_imovel"}
+
+
+async def _run_workload(client: httpx.AsyncClient, workload: str, sample: list, args) -> dict:
+    generator = _requests(workload, sample, args, random.Random(args.seed))
+    latencies: list[float] = []
+    errors = 0
+    received = 0
+
+    async def send() -> None:
+        nonlocal errors, received
+        method, url, payload = next(generator)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, json=payload)
+            received += len(response.content)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            errors += 1
+
+    for _ in range(args.warmup):
+        await send()
+    latencies.clear()
+    errors = received = 0
+
+    remaining = args.requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await send()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": args.requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "mb_received": round(received / 1e6, 2),
+    }
+
+
+def _print_results(results: dict, baseline: dict | None) -> None:
+    header = (
+        f"{'workload':<8} {'req/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'erros':>6}"
+    )
+    print(header + ("  vs. baseline (req/s, p95)" if baseline else ""))
+    for workload, metrics in results.items():
+        line = (
+            f"{workload:<8} {metrics['throughput_rps']:>9.1f} {metrics['p50_ms']:>9.1f} "
+            f"{metrics['p95_ms']:>9.1f} {metrics['p99_ms']:>9.1f} {metrics['errors']:>6}"
+        )
+        previous = (baseline or {}).get("results", {}).get(workload)
+        if previous and previous["throughput_rps"] and previous["p95_ms"]:
+            rps = metrics["throughput_rps"] / previous["throughput_rps"] - 1
+            p95 = metrics["p95_ms"] / previous["p95_ms"] - 1
+            line += f"  {rps:+8.1%} {p95:+8.1%}"
+        print(line)
+
+
+async def main_async(args) -> None:
+    total, sample = _load_sample(args.database, args.sample_size)
+    if not sample:
+        raise SystemExit("Tabela farms vazia")
+    print(f"{total} fazendas no banco, amostra de {len(sample)}")
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        results = {}
+        for workload in args.workloads:
+            results[workload] = await _run_workload(client, workload, sample, args)
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "base_url": args.base_url,
+        "farms": total,
+        "params": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "radius_km": args.radius_km,
+            "batch_size": args.batch_size,
+            "count": args.count,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    _print_results(results, baseline)
+
+    output = Path(args.output or f"benchmarks/results/load-{commit or 'local'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Resultado salvo em {output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--database", default=None, help="Banco da amostra (padrão: o da API)")
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por workload")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--radius-km", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--count", choices=("exact", "estimate", "none"), default="none")
+    parser.add_argument("--sample-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="JSON de saída")
+    parser.add_argument("--compare", default=None, help="JSON de uma execução anterior")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
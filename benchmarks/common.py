@@ -0,0 +1,15 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+"""
+import statistics
+
+# Bounding box aproximada do estado de São Paulo
+SP_LATITUDES = (-25.3, -19.8)
+SP_LONGITUDES = (-53.1, -44.2)
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    """Percentil ``pct`` das amostras (0.0 sem amostras, p.ex. com ``--repeat 0``)."""
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
@@ -0,0 +1,230 @@
+"""
+Gera um dataset sintético no formato do CAR (tabela ``farms``) para benchmarks.
+
+Os polígonos são gerados no próprio PostGIS, em lotes: centro uniforme na
+bounding box de SP, área log-normal (mediana ``--median-area-ha``) e número de
+vértices log-normal (mediana ``--median-vertices``, até ``--max-vertices``),
+com raio perturbado em cada vértice. Cada polígono é estrelado em relação ao
+centro, portanto sempre válido. Os mesmos ``--seed`` e ``--batch-size`` geram o
+mesmo dataset.
+
+Por padrão escreve num banco separado (``meuat_bench``), criado se preciso,
+com os mesmos índices e a tabela ``dataset_version`` do seed. Para apontar a
+API para ele: ``POSTGRES_DB=meuat_bench``.
+
+Uso (com o banco do docker-compose no ar):
+
+    python -m benchmarks.synthetic_farms --farms 100000
+    python -m benchmarks.synthetic_farms --farms 1000000 --batch-size 50000
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+from benchmarks.common import SP_LATITUDES, SP_LONGITUDES
+
+# Normal padrão por Box-Muller (random_normal() só existe a partir do PostgreSQL 16)
+NORMAL = "sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random())"
+
+CREATE_TABLE = """
+    CREATE TABLE farms (
+        ogc_fid INTEGER PRIMARY KEY,
+        cod_tema VARCHAR,
+        nom_tema VARCHAR,
+        cod_imovel VARCHAR,
+        mod_fiscal DOUBLE PRECISION,
+        num_area DOUBLE PRECISION,
+        ind_status VARCHAR,
+        ind_tipo VARCHAR,
+        des_condic VARCHAR,
+        municipio VARCHAR,
+        cod_estado VARCHAR,
+        dat_criaca VARCHAR,
+        dat_atuali VARCHAR,
+        geometry geometry(MultiPolygon, 4326) NOT NULL
+    )
+"""
+
+INSERT_BATCH = f"""
+    WITH params AS MATERIALIZED (
+        SELECT
+            id,
+            :lon_min + random() * (:lon_max - :lon_min) AS cx,
+            :lat_min + random() * (:lat_max - :lat_min) AS cy,
+            exp(ln(:median_area) + :area_sigma * {NORMAL}) AS area_ha,
+            least(
+                greatest(round(exp(ln(:median_vertices) + :vertex_sigma * {NORMAL})), 8),
+                :max_vertices
+            )::int AS n_vertices,
+            random() * 2 * pi() AS phase
+        FROM generate_series(:first_id, :last_id) AS id
+    )
+    INSERT INTO farms (
+        ogc_fid, cod_tema, nom_tema, cod_imovel, mod_fiscal, num_area, ind_status,
+        ind_tipo, des_condic, municipio, cod_estado, dat_criaca, dat_atuali, geometry
+    )
+    SELECT
+        p.id,
+        'AREA_IMOVEL',
+        'Area de Imovel Rural',
+        'SP-' || (3500000 + p.id % 645) || '-' || upper(md5(p.id::text)),
+        round((p.area_ha / 20)::numeric, 4),
+        round(p.area_ha::numeric, 4),
+        'AT',
+        'IRU',
+        'Aguardando analise',
+        (ARRAY['São José', 'Ribeirão', 'Santa Bárbara', 'Itaí', 'Conceição'])[1 + p.id % 5]
+            || ' ' || (1 + p.id % 645),
+        'SP',
+        '2016-05-04',
+        to_char(date '2016-05-04' + p.id % 3000, 'YYYY-MM-DD'),
+        ST_Multi(ST_MakePolygon(ST_AddPoint(ring.line, ST_StartPoint(ring.line))))
+    FROM params p
+    CROSS JOIN LATERAL (
+        SELECT ST_MakeLine(
+            ST_MakePoint(p.cx + v.r * cos(v.angle) / cos(radians(p.cy)), p.cy + v.r * sin(v.angle))
+            ORDER BY v.k
+        ) AS line
+        FROM (
+            SELECT
+                k,
+                p.phase + 2 * pi() * k / p.n_vertices AS angle,
+                sqrt(p.area_ha * 10000 / pi()) / 111320 * (0.75 + 0.5 * random()) AS r
+            FROM generate_series(0, p.n_vertices - 1) AS k
+        ) v
+    ) ring
+"""
+
+# As mesmas extensões, função e índices de seed/load_shapefiles.py
+EXTENSIONS = ("postgis", "pg_trgm", "unaccent")
+
+UNACCENT_LOWER = """
+    CREATE OR REPLACE FUNCTION unaccent_lower(text)
+    RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$
+"""
+
+INDEXES = (
+    "CREATE INDEX farms_geometry_idx ON farms USING GIST (geometry)",
+    "CREATE INDEX farms_municipio_idx ON farms (municipio)",
+    "CREATE INDEX farms_num_area_idx ON farms (num_area)",
+    "CREATE INDEX farms_cod_imovel_idx ON farms (cod_imovel)",
+    "CREATE INDEX farms_municipio_trgm_idx ON farms USING GIN (unaccent_lower(municipio) gin_trgm_ops)",
+    "CREATE INDEX farms_cod_imovel_trgm_idx ON farms USING GIN (unaccent_lower(cod_imovel) gin_trgm_ops)",
+)
+
+BUMP_VERSION = (
+    """
+    CREATE TABLE IF NOT EXISTS dataset_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    INSERT INTO dataset_version (id, version, updated_at)
+    VALUES (1, 1, now())
+    ON CONFLICT (id) DO UPDATE
+    SET version = dataset_version.version + 1, updated_at = now()
+    """,
+)
+
+
+def _ensure_database(url, database: str) -> None:
+    admin = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        exists = conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = :d"), {"d": database})
+        if not exists:
+            print(f"Criando banco {database}")
+            conn.exec_driver_sql(f'CREATE DATABASE "{database}"')
+    admin.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--farms", type=int, default=100_000)
+    parser.add_argument("--database", default="meuat_bench")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--median-area-ha", type=float, default=25)
+    parser.add_argument("--area-sigma", type=float, default=1.4)
+    parser.add_argument("--median-vertices", type=float, default=60)
+    parser.add_argument("--vertex-sigma", type=float, default=1.0)
+    parser.add_argument("--max-vertices", type=int, default=5000)
+    parser.add_argument(
+        "--replace-app-database",
+        action="store_true",
+        help="Permite sobrescrever farms no banco configurado para a API",
+    )
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.database == settings.postgres_db and not args.replace_app_database:
+        parser.error(
+            f"{args.database} é o banco da API; use --replace-app-database para sobrescrevê-lo"
+        )
+
+    url = make_url(settings.database_url)
+    _ensure_database(url, args.database)
+    engine = create_engine(url.set(database=args.database))
+
+    with engine.begin() as conn:
+        for extension in EXTENSIONS:
+            conn.exec_driver_sql(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+        conn.exec_driver_sql(UNACCENT_LOWER)
+        conn.exec_driver_sql("DROP TABLE IF EXISTS farms")
+        conn.exec_driver_sql(CREATE_TABLE)
+
+    params = {
+        "lat_min": SP_LATITUDES[0],
+        "lat_max": SP_LATITUDES[1],
+        "lon_min": SP_LONGITUDES[0],
+        "lon_max": SP_LONGITUDES[1],
+        "median_area": args.median_area_ha,
+        "area_sigma": args.area_sigma,
+        "median_vertices": args.median_vertices,
+        "vertex_sigma": args.vertex_sigma,
+        "max_vertices": args.max_vertices,
+    }
+
+    start = time.perf_counter()
+    for first_id in range(1, args.farms + 1, args.batch_size):
+        last_id = min(first_id + args.batch_size - 1, args.farms)
+        with engine.begin() as conn:
+            # Semente por lote (setseed aceita [-1, 1]), derivada de --seed e do primeiro ID
+            batch_seed = (args.seed * 7919 + first_id) % 2_000_001 / 1_000_000 - 1
+            conn.execute(text("SELECT setseed(:seed)"), {"seed": batch_seed})
+            conn.execute(text(INSERT_BATCH), {**params, "first_id": first_id, "last_id": last_id})
+        elapsed = time.perf_counter() - start
+        print(f"{last_id:>9}/{args.farms} fazendas ({last_id / elapsed:,.0f}/s)")
+
+    print("Criando índices e atualizando estatísticas")
+    with engine.begin() as conn:
+        for ddl in INDEXES:
+            conn.exec_driver_sql(ddl)
+        for statement in BUMP_VERSION:
+            conn.exec_driver_sql(statement)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("ANALYZE farms")
+        stats = conn.execute(
+            text(
+                "SELECT count(*), avg(ST_NPoints(geometry)), max(ST_NPoints(geometry)), "
+                "percentile_cont(0.5) WITHIN GROUP (ORDER BY num_area), "
+                "pg_size_pretty(pg_total_relation_size('farms')) FROM farms"
+            )
+        ).one()
+
+    print(
+        f"{stats[0]} fazendas em {time.perf_counter() - start:.0f}s: "
+        f"{stats[1]:.0f} vértices em média (máx. {stats[2]}), "
+        f"área mediana {stats[3]:.1f} ha, {stats[4]} em disco"
+    )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
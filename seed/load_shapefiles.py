@@ -1,15 +1,58 @@
+import hashlib
 import logging
 import os
+import re
 import sys
 import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 import psycopg2
+import psycopg2.errors
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 # Configura logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Carga blue/green: o shapefile vai para a staging, que assume o nome da tabela
+# da API numa única transação; a tabela anterior é descartada em seguida
+LIVE_TABLE = "farms"
+STAGING_TABLE = "farms_staging"
+PREVIOUS_TABLE = "farms_old"
+
+# Carga de vários shapefiles: cada arquivo vai para uma tabela UNLOGGED própria
+# (farms_part_<arquivo>) e ``PARTS_TABLE`` registra os já carregados, para
+# retomar a carga de onde parou
+PART_PREFIX = "farms_part_"
+PARTS_TABLE = "seed_parts"
+
+# Sincronização incremental: o conteúdo novo (um registro por cod_imovel) é
+# comparado com farms, e cada execução fica registrada em SYNC_RUNS_TABLE
+INCOMING_TABLE = "farms_incoming"
+SYNC_RUNS_TABLE = "seed_sync_runs"
+
+# Índices de farms como (sufixo do nome, definição). O nome é prefixado pela
+# tabela, de modo que os índices da staging não colidem com os da tabela em uso
+INDEXES = (
+    ("geometry_idx", "USING GIST (geometry)"),
+    ("municipio_idx", "(municipio)"),
+    ("num_area_idx", "(num_area)"),
+    ("cod_imovel_idx", "(cod_imovel)"),
+    ("municipio_trgm_idx", "USING GIN (unaccent_lower(municipio) gin_trgm_ops)"),
+    ("cod_imovel_trgm_idx", "USING GIN (unaccent_lower(cod_imovel) gin_trgm_ops)"),
+)
+
+# unaccent() é STABLE e não pode entrar num índice; o wrapper fixa o
+# dicionário e é IMMUTABLE (a API usa a mesma função nas consultas)
+UNACCENT_LOWER = """
+    CREATE OR REPLACE FUNCTION unaccent_lower(text)
+    RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$;
+"""
+
 
 def wait_for_db(host, port, user, password, database, max_retries=30):
     """Aguarda o banco de dados estar pronto."""
@@ -47,6 +90,12 @@ def setup_database(host, port, user, password, database):
         logger.info("Habilitando extensão PostGIS...")
         cur.execute("CREATE EXTENSION IF NOT EXISTS postgis;")
 
+        # Busca textual por trigramas, sem diferenciar acentos
+        logger.info("Habilitando extensões pg_trgm e unaccent...")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS unaccent;")
+        cur.execute(UNACCENT_LOWER)
+
         cur.close()
         conn.close()
         logger.info("Configuração do banco concluída com sucesso")
@@ -57,16 +106,19 @@ def setup_database(host, port, user, password, database):
         return False
 
 
-def load_shapefile(host, port, user, password, database, shapefile_path):
-    """Carrega shapefile no banco usando ogr2ogr."""
-    logger.info(f"Carregando shapefile: {shapefile_path}")
+def load_shapefile(
+    host, port, user, password, database, shapefile_path, table=LIVE_TABLE, unlogged=False
+):
+    """Carrega shapefile no banco usando ogr2ogr (COPY em tabela nova)."""
+    logger.info(f"Carregando shapefile: {shapefile_path} -> {table}")
 
     # Monta comando ogr2ogr
     # -f PostgreSQL: formato de saída
-    # -nln farms: nome da tabela
+    # -nln: nome da tabela
     # -nlt PROMOTE_TO_MULTI: promove geometria para MULTI*
     # -lco GEOMETRY_NAME=geometry: nome da coluna de geometria
-    # -lco SPATIAL_INDEX=GIST: cria índice espacial GIST
+    # -lco SPATIAL_INDEX=NONE: o índice espacial é criado depois, com os demais
+    # -lco UNLOGGED=ON: tabela intermediária sem WAL (perdida se o banco cair)
 
     pg_connection = f"PG:host={host} port={port} dbname={database} user={user} password={password}"
 
@@ -77,17 +129,24 @@ def load_shapefile(host, port, user, password, database, shapefile_path):
         pg_connection,
         shapefile_path,
         "-nln",
-        "farms",
+        table,
         "-nlt",
         "PROMOTE_TO_MULTI",
         "-lco",
         "GEOMETRY_NAME=geometry",
         "-lco",
+        "SPATIAL_INDEX=NONE",
+        "-lco",
         "PRECISION=NO",  # Evita overflow de campos numéricos
         "-t_srs",
         "EPSG:4326",
         "-overwrite",  # Sobrescreve se existir
+        "--config",
+        "PG_USE_COPY",
+        "YES",
     ]
+    if unlogged:
+        cmd += ["-lco", "UNLOGGED=ON"]
 
     logger.info(f"Executando: {' '.join(cmd)}")
 
@@ -105,9 +164,98 @@ def load_shapefile(host, port, user, password, database, shapefile_path):
         return False
 
 
-def post_process_data(host, port, user, password, database):
-    """Pós-processamento para adicionar índices."""
-    logger.info("Pós-processando dados...")
+def discover_shapefiles(data_dir, pattern="*.shp"):
+    """Shapefiles de ``data_dir`` e subpastas que casam com ``pattern``, em ordem de nome."""
+    return sorted(str(path) for path in Path(data_dir).rglob(pattern) if path.is_file())
+
+
+def _part_table(shapefile_path, unique=False):
+    """
+    Nome da tabela intermediária de um shapefile (``farms_part_<nome do arquivo>``).
+
+    Nomes acima do limite de 63 caracteres do Postgres (ou ``unique``) são
+    cortados e recebem um sufixo do hash do caminho, para não colidirem.
+    """
+    stem = re.sub(r"[^a-z0-9]+", "_", Path(shapefile_path).stem.lower()).strip("_")
+    name = f"{PART_PREFIX}{stem}"
+    if unique or len(name) > 63:
+        digest = hashlib.md5(str(shapefile_path).encode()).hexdigest()[:8]
+        name = f"{name[:54]}_{digest}"
+    return name
+
+
+def part_tables(shapefiles):
+    """
+    (shapefile, tabela) de cada arquivo, na ordem de ``shapefiles``.
+
+    Arquivos com o mesmo nome em pastas diferentes (p.ex. um diretório por
+    estado) recebem o sufixo do caminho em vez de colidirem na mesma tabela.
+    """
+    names = [_part_table(path) for path in shapefiles]
+    repeated = {name for name, count in Counter(names).items() if count > 1}
+    return [
+        (path, _part_table(path, unique=True) if name in repeated else name)
+        for path, name in zip(shapefiles, names, strict=False)
+    ]
+
+
+def pending_parts(parts, loaded, populated):
+    """
+    Partes que ainda precisam ser carregadas.
+
+    Uma parte é pulada quando ``PARTS_TABLE`` a registra com a mesma tabela,
+    tamanho e data de modificação do arquivo atual e a tabela existe com linhas.
+
+    Args:
+        parts: Lista de (shapefile, tabela)
+        loaded: {shapefile: (tabela, tamanho, mtime)} lidos de ``PARTS_TABLE``
+        populated: Tabelas intermediárias que existem e não estão vazias
+    """
+    pending = []
+    for path, table in parts:
+        stat = os.stat(path)
+        if loaded.get(path) == (table, stat.st_size, stat.st_mtime) and table in populated:
+            logger.info(f"{path} já carregado, pulando")
+            continue
+        pending.append((path, table))
+    return pending
+
+
+def _load_part(connection, shapefile_path, table):
+    """Worker do pool: carrega um shapefile na sua tabela UNLOGGED e conta as linhas."""
+    start = time.perf_counter()
+    if not load_shapefile(*connection, shapefile_path, table=table, unlogged=True):
+        return None
+
+    conn = psycopg2.connect(
+        host=connection[0],
+        port=connection[1],
+        user=connection[2],
+        password=connection[3],
+        database=connection[4],
+    )
+    cur = conn.cursor()
+    cur.execute(f"SELECT count(*) FROM {table};")
+    rows = cur.fetchone()[0]
+    cur.close()
+    conn.close()
+    return rows, time.perf_counter() - start
+
+
+def load_parts(host, port, user, password, database, shapefiles, workers=4):
+    """
+    Carrega os shapefiles em paralelo, um processo por arquivo, em tabelas UNLOGGED.
+
+    Os arquivos já registrados em ``PARTS_TABLE`` (mesmo tamanho e data de
+    modificação) são pulados, então rodar de novo depois de uma falha retoma
+    a carga. Tabelas UNLOGGED são esvaziadas se o banco cair; nesse caso a
+    tabela vazia invalida o registro e o arquivo é recarregado.
+
+    Returns:
+        Lista de (shapefile, tabela) na ordem de ``shapefiles``, ou None se algum falhou
+    """
+    connection = (host, port, user, password, database)
+    logger.info(f"Carregando {len(shapefiles)} shapefiles ({workers} processos)...")
 
     try:
         conn = psycopg2.connect(
@@ -115,43 +263,450 @@ def post_process_data(host, port, user, password, database):
         )
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cur = conn.cursor()
-
-        # Cria índice espacial se não existir
-        logger.info("Garantindo índice espacial...")
         cur.execute(
-            """
-            CREATE INDEX IF NOT EXISTS farms_geometry_idx
-            ON farms USING GIST (geometry);
+            f"""
+            CREATE TABLE IF NOT EXISTS {PARTS_TABLE} (
+                path TEXT PRIMARY KEY,
+                part_table TEXT NOT NULL,
+                size BIGINT NOT NULL,
+                mtime DOUBLE PRECISION NOT NULL,
+                rows BIGINT NOT NULL,
+                seconds DOUBLE PRECISION NOT NULL,
+                loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
         """
         )
 
-        # Índice em municipio
-        logger.info("Criando índice de município...")
-        cur.execute(
-            """
-            CREATE INDEX IF NOT EXISTS farms_municipio_idx
-            ON farms (municipio);
+        parts = part_tables(shapefiles)
+        if len({table for _, table in parts}) < len(parts):
+            logger.error("Shapefiles com nomes de tabela repetidos")
+            return None
+
+        cur.execute(f"SELECT path, part_table, size, mtime FROM {PARTS_TABLE};")
+        loaded = {path: (table, size, mtime) for path, table, size, mtime in cur.fetchall()}
+        registered = {table for table, _, _ in loaded.values()}
+        populated = set()
+        for _, table in parts:
+            if table not in registered:
+                continue
+            cur.execute("SELECT to_regclass(%s)", (table,))
+            if cur.fetchone()[0]:
+                cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table});")
+                if cur.fetchone()[0]:
+                    populated.add(table)
+
+        pending = pending_parts(parts, loaded, populated)
+
+        start = time.perf_counter()
+        total_rows = 0
+        failed = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_load_part, connection, path, table): (path, table)
+                for path, table in pending
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                path, table = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao carregar {path}: {e}")
+                    result = None
+                if result is None:
+                    failed.append(path)
+                    continue
+
+                rows, seconds = result
+                total_rows += rows
+                stat = os.stat(path)
+                cur.execute(
+                    f"""
+                    INSERT INTO {PARTS_TABLE} (path, part_table, size, mtime, rows, seconds)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (path) DO UPDATE
+                    SET part_table = EXCLUDED.part_table, size = EXCLUDED.size,
+                        mtime = EXCLUDED.mtime, rows = EXCLUDED.rows,
+                        seconds = EXCLUDED.seconds, loaded_at = now();
+                """,
+                    (path, table, stat.st_size, stat.st_mtime, rows, seconds),
+                )
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"[{done}/{len(pending)}] {path}: {rows} linhas em {seconds:.1f}s "
+                    f"({rows / seconds:,.0f}/s); total {total_rows / elapsed:,.0f} linhas/s"
+                )
+
+        cur.close()
+        conn.close()
+
+        if failed:
+            logger.error(f"{len(failed)} shapefiles falharam: {', '.join(failed)}")
+            return None
+
+        logger.info(f"{total_rows} linhas carregadas em {time.perf_counter() - start:.0f}s")
+        return parts
+
+    except Exception as e:
+        logger.error(f"Erro ao carregar shapefiles: {e}")
+        return None
+
+
+def _union_parts(cur, parts):
+    """
+    ``SELECT ... UNION ALL`` das tabelas intermediárias, com ``ogc_fid`` únicos.
+
+    O ``ogc_fid`` de cada arquivo é deslocado pelo maior ``ogc_fid`` dos
+    anteriores, de modo que os IDs são únicos e estáveis sem ordenar as linhas.
+
+    Returns:
+        (SQL da união, maior ``ogc_fid``)
+    """
+    # Colunas do shapefile, na ordem da primeira tabela (o CAR tem o mesmo layout por estado)
+    cur.execute(
         """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s AND column_name <> 'ogc_fid'
+        ORDER BY ordinal_position
+    """,
+        (parts[0][1],),
+    )
+    columns = [
+        "geometry::geometry(MultiPolygon, 4326) AS geometry" if name == "geometry" else name
+        for (name,) in cur.fetchall()
+    ]
+
+    selects = []
+    offset = 0
+    for _, part in parts:
+        selects.append(f"SELECT ogc_fid + {offset} AS ogc_fid, {', '.join(columns)} FROM {part}")
+        cur.execute(f"SELECT coalesce(max(ogc_fid), 0) FROM {part};")
+        offset += cur.fetchone()[0]
+
+    return " UNION ALL ".join(selects), offset
+
+
+def merge_parts(host, port, user, password, database, parts, table):
+    """Junta as tabelas intermediárias em ``table`` com um único ``CREATE TABLE AS``."""
+    logger.info(f"Juntando {len(parts)} tabelas em {table}...")
+
+    try:
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
         )
+        cur = conn.cursor()
 
-        # Índice em num_area
-        logger.info("Criando índice de área...")
+        union, offset = _union_parts(cur, parts)
+
+        start = time.perf_counter()
+        cur.execute(f"DROP TABLE IF EXISTS {table};")
+        cur.execute(f"CREATE TABLE {table} AS {union};")
+        cur.execute(f"ALTER TABLE {table} ALTER COLUMN ogc_fid SET NOT NULL;")
+        cur.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (ogc_fid);")
+        # Sequência para as inserções da sincronização incremental
         cur.execute(
-            """
-            CREATE INDEX IF NOT EXISTS farms_num_area_idx
-            ON farms (num_area);
+            f"ALTER TABLE {table} ALTER COLUMN ogc_fid ADD GENERATED BY DEFAULT AS IDENTITY "
+            f"(START WITH {offset + 1});"
+        )
+        conn.commit()
+        cur.close()
+        conn.close()
+
+        logger.info(f"{offset} linhas em {table} ({time.perf_counter() - start:.0f}s)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Erro ao juntar as tabelas: {e}")
+        return False
+
+
+def latest_first_order():
+    """
+    ``ORDER BY`` que põe primeiro o registro de ``dat_atuali`` mais recente.
+
+    ``dat_atuali`` é texto e o CAR o exporta como ``DD/MM/AAAA``, em que a
+    ordem de string não é a das datas; a chave o reescreve como ``AAAAMMDD``
+    (``AAAA-MM-DD`` também é aceito). Só usa ``substr``/``replace``, então uma
+    data inválida não interrompe a carga. Empates ficam com o maior ``ogc_fid``
+    (o arquivo e a linha carregados por último).
+    """
+    key = (
+        "CASE WHEN substr(dat_atuali, 3, 1) = '/' "
+        "THEN substr(dat_atuali, 7, 4) || substr(dat_atuali, 4, 2) || substr(dat_atuali, 1, 2) "
+        "ELSE replace(dat_atuali, '-', '') END"
+    )
+    return f"{key} DESC NULLS LAST, ogc_fid DESC"
+
+
+def sync_statements(columns, compare="dat_atuali"):
+    """
+    SQL da sincronização de ``farms`` com ``INCOMING_TABLE``: (remoção, atualização, inserção).
+
+    Registros de ``farms`` sem ``cod_imovel`` não são comparáveis com o
+    conteúdo novo e ficam como estão.
+
+    Args:
+        columns: Colunas copiadas do conteúdo novo (sem ``ogc_fid`` e ``cod_imovel``)
+        compare: ``dat_atuali`` ou ``geometry`` (também compara a geometria em EWKB)
+    """
+    changed = "i.dat_atuali IS DISTINCT FROM f.dat_atuali"
+    if compare == "geometry":
+        changed += " OR ST_AsEWKB(i.geometry) <> ST_AsEWKB(f.geometry)"
+
+    delete = f"""
+        DELETE FROM {LIVE_TABLE} f
+        WHERE f.cod_imovel IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM {INCOMING_TABLE} i WHERE i.cod_imovel = f.cod_imovel);
+    """
+    update = f"""
+        UPDATE {LIVE_TABLE} f
+        SET {", ".join(f"{name} = i.{name}" for name in columns)}
+        FROM {INCOMING_TABLE} i
+        WHERE i.cod_imovel = f.cod_imovel AND ({changed});
+    """
+    insert = f"""
+        INSERT INTO {LIVE_TABLE} (cod_imovel, {", ".join(columns)})
+        SELECT i.cod_imovel, {", ".join(f"i.{name}" for name in columns)}
+        FROM {INCOMING_TABLE} i
+        WHERE NOT EXISTS (SELECT 1 FROM {LIVE_TABLE} f WHERE f.cod_imovel = i.cod_imovel);
+    """
+    return delete, update, insert
+
+
+def delete_exceeds_limit(deleted, existing, max_delete_ratio):
+    """Se a remoção de ``deleted`` dos ``existing`` registros passa de ``max_delete_ratio``."""
+    return existing > 0 and deleted / existing > max_delete_ratio
+
+
+def sync_counts(incoming, inserted, updated, deleted):
+    """
+    Contagens de uma sincronização, como gravadas em ``SYNC_RUNS_TABLE``.
+
+    Todo registro novo foi inserido, atualizado ou ficou sem mudança; os
+    removidos vêm de ``farms`` e não entram nessa conta.
+    """
+    return {
+        "incoming": incoming,
+        "inserted": inserted,
+        "updated": updated,
+        "deleted": deleted,
+        "unchanged": incoming - inserted - updated,
+    }
+
+
+def sync_farms(
+    host, port, user, password, database, parts, compare="dat_atuali", max_delete_ratio=0.2
+):
+    """
+    Aplica em ``farms`` só as diferenças em relação aos shapefiles, por ``cod_imovel``.
+
+    Um registro existente é atualizado quando ``dat_atuali`` mudou (com
+    ``compare="geometry"``, também quando a geometria difere byte a byte);
+    os novos são inseridos e os que sumiram do CAR, removidos. Tudo numa
+    transação sobre a tabela em uso: os índices continuam valendo, a API vê o
+    estado anterior ou o novo, e a escrita (e o WAL) é proporcional às
+    mudanças. A versão do dataset só muda se algo mudou.
+
+    Se a remoção passar de ``max_delete_ratio`` de ``farms`` (p.ex. um
+    shapefile faltando no diretório), nada é aplicado. Registros sem
+    ``cod_imovel`` não são removidos nem contam para esse limite.
+    """
+    logger.info(f"Sincronizando {LIVE_TABLE} com {len(parts)} shapefiles ({compare})...")
+    start = time.perf_counter()
+
+    try:
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
+        )
+        cur = conn.cursor()
+
+        cur.execute("SELECT to_regclass(%s)", (LIVE_TABLE,))
+        if not cur.fetchone()[0]:
+            logger.error(f"{LIVE_TABLE} não existe; faça a primeira carga com SEED_MODE=swap")
+            conn.close()
+            return False
+
+        # Um registro por cod_imovel: o de dat_atuali mais recente
+        union, _ = _union_parts(cur, parts)
+        cur.execute(f"DROP TABLE IF EXISTS {INCOMING_TABLE};")
+        cur.execute(
+            f"""
+            CREATE UNLOGGED TABLE {INCOMING_TABLE} AS
+            SELECT DISTINCT ON (cod_imovel) * FROM ({union}) u
+            WHERE cod_imovel IS NOT NULL
+            ORDER BY cod_imovel, {latest_first_order()};
         """
         )
+        cur.execute(f"ALTER TABLE {INCOMING_TABLE} ADD PRIMARY KEY (cod_imovel);")
+        cur.execute(f"ANALYZE {INCOMING_TABLE};")
+        conn.commit()
 
-        # Índice em cod_imovel
-        logger.info("Criando índice de cod_imovel...")
+        # Colunas atualizadas: as do shapefile que existem em farms
         cur.execute(
             """
-            CREATE INDEX IF NOT EXISTS farms_cod_imovel_idx
-            ON farms (cod_imovel);
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+              AND column_name NOT IN ('ogc_fid', 'cod_imovel')
+            INTERSECT
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+        """,
+            (INCOMING_TABLE, LIVE_TABLE),
+        )
+        columns = sorted(name for (name,) in cur.fetchall())
+        delete, update, insert = sync_statements(columns, compare)
+
+        cur.execute(f"SELECT count(*) FROM {INCOMING_TABLE};")
+        incoming = cur.fetchone()[0]
+        cur.execute(f"SELECT count(*) FROM {LIVE_TABLE} WHERE cod_imovel IS NOT NULL;")
+        existing = cur.fetchone()[0]
+
+        cur.execute(delete)
+        deleted = cur.rowcount
+        if delete_exceeds_limit(deleted, existing, max_delete_ratio):
+            conn.rollback()
+            conn.close()
+            logger.error(
+                f"Sincronização removeria {deleted} de {existing} fazendas "
+                f"(limite {max_delete_ratio:.0%}); nada foi alterado"
+            )
+            return False
+
+        cur.execute(update)
+        updated = cur.rowcount
+        cur.execute(insert)
+        counts = sync_counts(incoming, cur.rowcount, updated, deleted)
+
+        changes = counts["inserted"] + counts["updated"] + counts["deleted"]
+        version = _increment_version(cur) if changes else None
+        seconds = time.perf_counter() - start
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SYNC_RUNS_TABLE} (
+                id BIGSERIAL PRIMARY KEY,
+                finished_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                compare TEXT NOT NULL,
+                files INTEGER NOT NULL,
+                incoming BIGINT NOT NULL,
+                inserted BIGINT NOT NULL,
+                updated BIGINT NOT NULL,
+                deleted BIGINT NOT NULL,
+                unchanged BIGINT NOT NULL,
+                seconds DOUBLE PRECISION NOT NULL,
+                dataset_version BIGINT
+            );
         """
         )
+        cur.execute(
+            f"""
+            INSERT INTO {SYNC_RUNS_TABLE}
+                (compare, files, incoming, inserted, updated, deleted, unchanged, seconds,
+                 dataset_version)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
+        """,
+            (
+                compare,
+                len(parts),
+                counts["incoming"],
+                counts["inserted"],
+                counts["updated"],
+                counts["deleted"],
+                counts["unchanged"],
+                seconds,
+                version,
+            ),
+        )
+        conn.commit()
+
+        conn.autocommit = True
+        cur.execute(f"DROP TABLE {INCOMING_TABLE};")
+        if version is not None:
+            cur.execute(f"ANALYZE {LIVE_TABLE};")
+        cur.close()
+        conn.close()
+
+        logger.info(
+            f"Sincronização em {seconds:.0f}s: {counts['inserted']} inseridas, "
+            f"{counts['updated']} atualizadas, {counts['deleted']} removidas, "
+            f"{counts['unchanged']} sem mudança"
+            + (f"; versão do dataset: {version}" if version is not None else "")
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Erro na sincronização: {e}")
+        return False
+
+
+def drop_parts(host, port, user, password, database):
+    """Remove as tabelas intermediárias e o registro da carga concluída."""
+    try:
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT tablename FROM pg_tables WHERE schemaname = current_schema() "
+            "AND starts_with(tablename, %s)",
+            (PART_PREFIX,),
+        )
+        for (table,) in cur.fetchall():
+            cur.execute(f"DROP TABLE {table};")
+        cur.execute(f"DROP TABLE IF EXISTS {PARTS_TABLE};")
+        cur.close()
+        conn.close()
+        return True
+
+    except Exception as e:
+        logger.error(f"Erro ao remover as tabelas intermediárias: {e}")
+        return False
+
 
+def _create_index(host, port, user, password, database, table, suffix, definition):
+    """Cria um índice em conexão própria, para rodar em paralelo com os demais."""
+    conn = psycopg2.connect(host=host, port=port, user=user, password=password, database=database)
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SET maintenance_work_mem = %s", (os.getenv("SEED_MAINTENANCE_WORK_MEM", "256MB"),)
+        )
+        start = time.perf_counter()
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_{suffix} ON {table} {definition};")
+        logger.info(f"Índice {table}_{suffix} criado em {time.perf_counter() - start:.1f}s")
+        cur.close()
+    finally:
+        conn.close()
+
+
+def post_process_data(host, port, user, password, database, table=LIVE_TABLE, workers=1):
+    """
+    Pós-processamento: índices de ``INDEXES`` e estatísticas do planner.
+
+    Com ``workers`` > 1 os índices são criados ao mesmo tempo, cada um numa
+    conexão (``CREATE INDEX`` só bloqueia escritas, então não se bloqueiam
+    entre si). O índice GIST, o mais demorado, vem primeiro.
+    """
+    logger.info(f"Pós-processando dados de {table} ({workers} conexões)...")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _create_index, host, port, user, password, database, table, suffix, definition
+                )
+                for suffix, definition in INDEXES
+            ]
+            for future in futures:
+                future.result()
+
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        cur = conn.cursor()
+        logger.info(f"Atualizando estatísticas de {table}...")
+        cur.execute(f"ANALYZE {table};")
         cur.close()
         conn.close()
 
@@ -163,6 +718,139 @@ def post_process_data(host, port, user, password, database):
         return False
 
 
+def _increment_version(cur):
+    """Incrementa a versão na tabela de linha única lida pela API (app/models/dataset_version.py)."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dataset_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version BIGINT NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """
+    )
+    cur.execute(
+        """
+        INSERT INTO dataset_version (id, version, updated_at)
+        VALUES (1, 1, now())
+        ON CONFLICT (id) DO UPDATE
+        SET version = dataset_version.version + 1, updated_at = now()
+        RETURNING version;
+    """
+    )
+    return cur.fetchone()[0]
+
+
+def rename_statements(old, new, indexes, sequence=None):
+    """
+    DDL que renomeia a tabela ``old`` para ``new`` com seus índices e a sequência.
+
+    Os índices com prefixo ``<old>_`` trocam de prefixo (``farms_staging_pkey`` →
+    ``farms_pkey``); renomear o índice de uma PK renomeia também a restrição.
+    Índices com outros nomes não colidem e ficam como estão. ``sequence`` é o
+    nome retornado por ``pg_get_serial_sequence`` (com o schema).
+    """
+    statements = [
+        f'ALTER INDEX "{index}" RENAME TO "{new}{index[len(old):]}";'
+        for index in indexes
+        if index.startswith(f"{old}_")
+    ]
+    if sequence:
+        statements.append(f"ALTER SEQUENCE {sequence} RENAME TO {new}_ogc_fid_seq;")
+    statements.append(f"ALTER TABLE {old} RENAME TO {new};")
+    return statements
+
+
+def _rename_table(cur, old, new):
+    """Renomeia a tabela com seus índices, restrições e a sequência do ``ogc_fid``."""
+    cur.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+        (old,),
+    )
+    indexes = [index for (index,) in cur.fetchall()]
+    cur.execute("SELECT pg_get_serial_sequence(%s, 'ogc_fid')", (old,))
+    sequence = cur.fetchone()[0]
+
+    for statement in rename_statements(old, new, indexes, sequence):
+        cur.execute(statement)
+
+
+def swap_tables(host, port, user, password, database, staging=STAGING_TABLE, retries=5):
+    """
+    Coloca a staging no lugar de ``farms`` e incrementa a versão do dataset.
+
+    Tudo numa transação: a API vê a tabela antiga ou a nova, já indexada e
+    analisada, nunca uma tabela vazia. O ``ALTER TABLE`` espera as consultas
+    em andamento; com ``lock_timeout`` a troca desiste em vez de enfileirar
+    as requisições novas atrás dela, e tenta de novo.
+    """
+    logger.info(f"Trocando {LIVE_TABLE} por {staging}...")
+    lock_timeout = os.getenv("SEED_SWAP_LOCK_TIMEOUT", "2s")
+
+    try:
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
+        )
+        cur = conn.cursor()
+
+        for attempt in range(1, retries + 1):
+            try:
+                cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+                cur.execute(f"DROP TABLE IF EXISTS {PREVIOUS_TABLE};")
+                cur.execute("SELECT to_regclass(%s)", (LIVE_TABLE,))
+                if cur.fetchone()[0]:
+                    _rename_table(cur, LIVE_TABLE, PREVIOUS_TABLE)
+                _rename_table(cur, staging, LIVE_TABLE)
+                version = _increment_version(cur)
+                conn.commit()
+                break
+            except psycopg2.errors.LockNotAvailable:
+                conn.rollback()
+                logger.warning(f"Tentativa {attempt}/{retries}: {LIVE_TABLE} em uso, aguardando...")
+                time.sleep(attempt)
+        else:
+            logger.error(f"Não foi possível bloquear {LIVE_TABLE} para a troca")
+            conn.close()
+            return False
+
+        # Fora da transação da troca, para não estender o bloqueio
+        conn.autocommit = True
+        cur.execute(f"DROP TABLE IF EXISTS {PREVIOUS_TABLE};")
+        cur.close()
+        conn.close()
+
+        logger.info(f"Tabela {LIVE_TABLE} trocada; versão do dataset: {version}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Erro ao trocar as tabelas: {e}")
+        return False
+
+
+def bump_dataset_version(host, port, user, password, database):
+    """Incrementa a versão do dataset, invalidando os caches da API."""
+    logger.info("Atualizando versão do dataset...")
+
+    try:
+        conn = psycopg2.connect(
+            host=host, port=port, user=user, password=password, database=database
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        cur = conn.cursor()
+
+        version = _increment_version(cur)
+
+        cur.close()
+        conn.close()
+
+        logger.info(f"Versão do dataset: {version}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Erro ao atualizar versão do dataset: {e}")
+        return False
+
+
 def main():
     """Função principal de seed."""
     # Obtém credenciais do ambiente
@@ -172,18 +860,36 @@ def main():
     db_password = os.getenv("POSTGRES_PASSWORD", "postgres")
     db_name = os.getenv("POSTGRES_DB", "meuat_fazendas")
 
-    # Caminho do Shapefile
-    data_dir = "/seed/data"
-    shapefile_name = "AREA_IMOVEL_1.shp"
-    shapefile_path = os.path.join(data_dir, shapefile_name)
+    # swap: carga blue/green sem indisponibilidade; overwrite: sobrescreve farms direto;
+    # sync: aplica só as mudanças por cod_imovel
+    seed_mode = os.getenv("SEED_MODE", "swap")
+    sync_compare = os.getenv("SEED_SYNC_COMPARE", "dat_atuali")
+    sync_max_delete_ratio = float(os.getenv("SEED_SYNC_MAX_DELETE_RATIO", "0.2"))
+    index_workers = int(os.getenv("SEED_INDEX_WORKERS", "4"))
+
+    load_workers = int(os.getenv("SEED_LOAD_WORKERS", "4"))
+
+    # Shapefiles do diretório de dados (SHP_FILE restringe a um arquivo ou padrão)
+    data_dir = os.getenv("SEED_DATA_DIR", "/seed/data")
+    pattern = os.getenv("SHP_FILE") or "*.shp"
+    shapefiles = discover_shapefiles(data_dir, pattern)
 
     logger.info("Iniciando processo de seed...")
     logger.info(f"Banco: {db_host}:{db_port}/{db_name}")
-    logger.info(f"Shapefile: {shapefile_path}")
+    logger.info(f"Shapefiles: {len(shapefiles)} em {data_dir} ({pattern})")
+    logger.info(f"Modo: {seed_mode}")
 
-    # Verifica se shapefile existe
-    if not os.path.exists(shapefile_path):
-        logger.error(f"Shapefile não encontrado: {shapefile_path}")
+    if seed_mode not in ("swap", "overwrite", "sync"):
+        logger.error(f"SEED_MODE inválido: {seed_mode} (use swap, overwrite ou sync)")
+        sys.exit(1)
+
+    if sync_compare not in ("dat_atuali", "geometry"):
+        logger.error(f"SEED_SYNC_COMPARE inválido: {sync_compare} (use dat_atuali ou geometry)")
+        sys.exit(1)
+
+    # Verifica se há shapefiles
+    if not shapefiles:
+        logger.error(f"Nenhum shapefile {pattern} em {data_dir}")
         logger.error("Verifique se o volume de dados está montado em /seed/data")
         sys.exit(1)
 
@@ -197,14 +903,54 @@ def main():
         logger.error("Falha ao configurar banco")
         sys.exit(1)
 
-    # Carrega shapefile
-    if not load_shapefile(db_host, db_port, db_user, db_password, db_name, shapefile_path):
-        logger.error("Falha ao carregar shapefile")
+    connection = (db_host, db_port, db_user, db_password, db_name)
+
+    # Carrega os shapefiles em paralelo; uma nova execução retoma os que faltam
+    parts = load_parts(*connection, shapefiles, workers=load_workers)
+    if parts is None:
+        logger.error("Falha ao carregar shapefiles; rode o seed de novo para retomar")
         sys.exit(1)
 
-    # Pós-processamento
-    if not post_process_data(db_host, db_port, db_user, db_password, db_name):
-        logger.warning("Pós-processamento teve problemas, mas continuando...")
+    if seed_mode == "sync":
+        # Escreve só as diferenças, com os índices de farms no ar
+        if not sync_farms(
+            *connection,
+            parts,
+            compare=sync_compare,
+            max_delete_ratio=sync_max_delete_ratio,
+        ):
+            logger.error("Falha na sincronização; farms não foi alterada")
+            sys.exit(1)
+    elif seed_mode == "swap":
+        # A API continua lendo farms até a troca; falhas deixam só a staging para trás
+        if not merge_parts(*connection, parts, STAGING_TABLE):
+            logger.error("Falha ao montar a staging; farms não foi alterada")
+            sys.exit(1)
+
+        if not post_process_data(*connection, table=STAGING_TABLE, workers=index_workers):
+            logger.error("Falha ao indexar a staging; farms não foi alterada")
+            sys.exit(1)
+
+        # Troca as tabelas e invalida os caches da API na mesma transação
+        if not swap_tables(*connection):
+            logger.error("Falha ao trocar as tabelas; farms não foi alterada")
+            sys.exit(1)
+    else:
+        # Substitui farms numa transação (a API espera o fim da junção)
+        if not merge_parts(*connection, parts, LIVE_TABLE):
+            logger.error("Falha ao carregar shapefiles")
+            sys.exit(1)
+
+        # Pós-processamento
+        if not post_process_data(*connection, workers=index_workers):
+            logger.warning("Pós-processamento teve problemas, mas continuando...")
+
+        # Invalida os caches da API
+        if not bump_dataset_version(*connection):
+            logger.warning("Versão do dataset não atualizada; caches da API expiram pelo TTL")
+
+    # Carga concluída: a próxima execução começa do zero
+    drop_parts(*connection)
 
     logger.info("Processo de seed concluído com sucesso!")
 
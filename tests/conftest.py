@@ -1,14 +1,61 @@
-from unittest.mock import MagicMock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from dotenv import load_dotenv
+from fastapi.testclient import TestClient
 
-from app.core.db import get_db
+from app.api import internal
+from app.core.db import get_async_db, get_async_sessionmaker, get_db
+from app.core.logging import stop_log_listener
 from app.main import app
+from app.services.cache import get_point_cache
+from app.services.dataset_version import get_dataset_version_tracker
+from app.services.document_cache import get_document_cache
+from app.services.tile_cache import get_tile_cache
 
 load_dotenv()
 
 
+class FixedDatasetVersion:
+    """Rastreador de versão do dataset com valor fixo (sem consultar o banco)."""
+
+    def __init__(self, version: int, updated_at=None):
+        self.version = version
+        self.updated_at = updated_at
+
+    async def current(self, db) -> int:
+        return self.version
+
+
+@pytest.fixture(autouse=True, scope="session")
+def flush_log_queue():
+    """Escreve os logs ainda na fila antes de o pytest fechar a captura da saída."""
+    yield
+    stop_log_listener()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """
+    Cliente com o lifespan da aplicação, para os testes contra o banco real.
+
+    Todas as requisições do módulo rodam no mesmo event loop: as conexões
+    asyncpg do pool não podem ser reaproveitadas em outro loop, e o lifespan
+    as fecha ao final.
+    """
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def internal_headers(monkeypatch):
+    """Configura ``INTERNAL_TOKEN`` e retorna o cabeçalho que libera os endpoints internos."""
+    monkeypatch.setattr(internal.settings, "debug", False)
+    monkeypatch.setattr(internal.settings, "internal_token", "test-token")
+    return {"Authorization": "Bearer test-token"}
+
+
 @pytest.fixture
 def mock_db():
     """Cria uma sessão de banco mockada."""
@@ -25,3 +72,36 @@ def override_get_db(mock_db):
     app.dependency_overrides[get_db] = _get_mock_db
     yield mock_db
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_async_db():
+    """Cria uma sessão assíncrona de banco mockada."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def override_get_async_db(mock_async_db):
+    """
+    Substitui a dependência get_async_db por um mock.
+
+    Também fixa a versão do dataset e desliga os caches de pontos, de
+    documentos e de tiles, para que cada teste controle exatamente as consultas enviadas
+    ao mock.
+    """
+
+    async def _get_mock_db():
+        yield mock_async_db
+
+    @asynccontextmanager
+    async def _mock_session():
+        yield mock_async_db
+
+    app.dependency_overrides[get_async_db] = _get_mock_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: _mock_session
+    app.dependency_overrides[get_dataset_version_tracker] = lambda: FixedDatasetVersion(1)
+    app.dependency_overrides[get_point_cache] = lambda: None
+    app.dependency_overrides[get_document_cache] = lambda: None
+    app.dependency_overrides[get_tile_cache] = lambda: None
+    yield mock_async_db
+    app.dependency_overrides.clear()
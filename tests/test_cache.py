@@ -0,0 +1,44 @@
+"""
+Testes unitários dos caches em memória.
+"""
+import pytest
+
+from app.services.cache import LRUCache, PointLookupCache
+
+pytestmark = pytest.mark.unit
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Testa o descarte da entrada menos usada ao exceder o limite."""
+    cache = LRUCache(maxsize=2, ttl_s=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" passa a ser a mais recente
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_expires_entries():
+    """Testa que entradas expiradas contam como falha."""
+    cache = LRUCache(maxsize=10, ttl_s=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 0
+
+
+def test_point_cache_snaps_coordinates():
+    """Testa que leituras próximas compartilham a mesma chave."""
+    cache = PointLookupCache(maxsize=10, ttl_s=60, precision=4)
+
+    assert cache.snap(-23.550512, -46.633349) == cache.snap(-23.550498, -46.633301)
+    assert cache.key(1, *cache.snap(-23.5505, -46.6333)) != cache.key(
+        2, *cache.snap(-23.5505, -46.6333)
+    )
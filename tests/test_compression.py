@@ -0,0 +1,101 @@
+"""
+Testes unitários da compressão das respostas.
+"""
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.core.config import get_settings
+from app.main import app
+from app.services.document_cache import InMemoryDocumentCache, get_document_cache
+from tests.test_farms_unit import _farm_row, _result
+
+pytestmark = pytest.mark.unit
+
+BIG_BODY = b'{"coordinates":[' + b"[-46.6333,-23.5505]," * 500 + b"[0,0]]}"
+
+demo = FastAPI()
+demo.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+
+@demo.get("/grande")
+async def big():
+    return Response(BIG_BODY, media_type="application/json", headers={"ETag": '"abc"'})
+
+
+@demo.get("/pequena")
+async def small():
+    return Response(b'{"ok":true}', media_type="application/json")
+
+
+@demo.get("/stream")
+async def stream():
+    async def body():
+        for _ in range(3):
+            yield BIG_BODY
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+demo_client = TestClient(demo)
+
+
+def test_negotiate_encoding_honors_quality():
+    """O cliente escolhe pelo q; sem suporte a nenhuma, não há compressão."""
+    assert negotiate_encoding("gzip, deflate", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+    assert negotiate_encoding("br, gzip", ("br", "gzip")) == "br"
+    assert negotiate_encoding("identity", ("br", "gzip")) is None
+    assert negotiate_encoding("gzip;q=0", ("gzip",)) is None
+    assert negotiate_encoding(None) is None
+
+
+def test_middleware_compresses_above_threshold():
+    """Respostas grandes saem comprimidas, com Vary e ETag fraco."""
+    response = demo_client.get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert int(response.headers["content-length"]) < len(BIG_BODY)
+    assert response.content == BIG_BODY
+
+
+def test_middleware_skips_small_responses_and_identity():
+    """Abaixo do mínimo, ou sem Accept-Encoding, a resposta sai como está."""
+    small = demo_client.get("/pequena", headers={"Accept-Encoding": "gzip"})
+    identity = demo_client.get("/grande", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.content == BIG_BODY
+
+
+def test_middleware_compresses_streaming_responses():
+    """Respostas em streaming são comprimidas bloco a bloco."""
+    response = demo_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BIG_BODY * 3
+
+
+def test_get_farm_serves_precompressed_document(override_get_async_db, monkeypatch):
+    """Com pré-compressão, o documento comprimido vem do cache e a rota o envia pronto."""
+    monkeypatch.setattr(get_settings(), "document_cache_precompressed", True)
+    cache = InMemoryDocumentCache(max_bytes=1024 * 1024, max_item_bytes=1024 * 1024)
+    app.dependency_overrides[get_document_cache] = lambda: cache
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    client = TestClient(app)
+    first = client.get("/fazendas/SP-1", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/fazendas/SP-1", headers={"Accept-Encoding": "gzip"})
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers["content-encoding"] == "gzip"
+    assert second.headers["etag"].startswith("W/")
+    assert second.json()["ogc_fid"] == 1
+    # O segundo acesso acerta a versão comprimida sem recomprimir
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,103 @@
+"""
+Testes unitários do cache de documentos de fazendas.
+"""
+import asyncio
+
+import pytest
+
+from app.services.document_cache import (
+    FarmDocumentCache,
+    InMemoryDocumentCache,
+    RedisDocumentCache,
+    document_key,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeRedis:
+    """Subconjunto do cliente ``redis.asyncio`` usado pelo cache (mget + pipeline)."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    async def execute(self):
+        for key, value, ex in self.commands:
+            self.client.data[key] = value
+            self.client.ttls[key] = ex
+
+
+def test_memory_cache_evicts_by_bytes():
+    """Testa o descarte LRU quando o total de bytes excede o limite."""
+    cache = InMemoryDocumentCache(max_bytes=10, max_item_bytes=10)
+
+    async def scenario():
+        await cache.set_many({"a": b"1234", "b": b"5678"})
+        await cache.get_many(["a"])  # "a" passa a ser a mais recente
+        await cache.set_many({"c": b"9012"})
+        return await cache.get_many(["a", "b", "c"])
+
+    found = asyncio.run(scenario())
+
+    assert found == {"a": b"1234", "c": b"9012"}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
+
+
+def test_memory_cache_skips_oversized_documents():
+    """Testa que documentos acima do limite por item não são armazenados."""
+    cache = InMemoryDocumentCache(max_bytes=100, max_item_bytes=4)
+
+    asyncio.run(cache.set_many({"grande": b"12345", "pequeno": b"1234"}))
+
+    assert asyncio.run(cache.get_many(["grande", "pequeno"])) == {"pequeno": b"1234"}
+    assert cache.stats()["skipped"] == 1
+
+
+def test_backend_must_implement_interface():
+    """Um backend sem ``set_many`` falha ao ser criado, não na primeira requisição."""
+
+    class ReadOnlyCache(FarmDocumentCache):
+        async def get_many(self, keys):
+            return {}
+
+    with pytest.raises(TypeError, match="set_many"):
+        ReadOnlyCache(max_item_bytes=1024)
+
+
+def test_redis_cache_round_trip():
+    """Testa o backend Redis com um cliente falso local."""
+    client = FakeRedis()
+    cache = RedisDocumentCache(client, ttl_s=60, max_item_bytes=100)
+    key = document_key(3, 42, "d9")
+
+    asyncio.run(cache.set_many({key: b'{"ogc_fid":42}'}))
+    found = asyncio.run(cache.get_many([key, document_key(3, 43, "d9")]))
+
+    assert found == {key: b'{"ogc_fid":42}'}
+    assert client.ttls[key] == 60
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
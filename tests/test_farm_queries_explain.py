@@ -0,0 +1,82 @@
+"""
+Testes de regressão de planos de execução (requerem PostGIS com dados carregados).
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.db import SessionLocal
+from app.core.slow_queries import plan_nodes
+from app.models.farm import Farm
+from app.schemas.farm import NameSearchMode
+from app.services.farm_queries import DEFAULT_RENDER, FarmQueryService, Projection
+
+pytestmark = pytest.mark.integration
+
+INDEX_SCAN_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def _explain(db, query) -> dict:
+    sql = query.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # Desliga o seq scan para provar que o índice é utilizável mesmo em tabelas
+    # pequenas; com o cast na coluna o planner cairia em seq scan de qualquer forma.
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = db.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    return result[0]["Plan"]
+
+
+def test_radius_search_uses_geometry_index():
+    """Teste: a busca por raio usa o índice GIST de farms.geometry."""
+    with SessionLocal() as db:
+        query = db.query(Farm.ogc_fid).filter(
+            *FarmQueryService.radius_filters(-23.5505, -46.6333, 5)
+        )
+        plan = _explain(db, query)
+        db.rollback()
+
+    index_nodes = [
+        node
+        for node in plan_nodes(plan)
+        if node["Node Type"] in INDEX_SCAN_NODES and "geometry" in node.get("Index Name", "")
+    ]
+    assert index_nodes, f"Plano sem index scan no índice espacial: {plan}"
+
+
+def test_nearest_search_orders_by_geometry_index():
+    """Teste: a busca dos mais próximos percorre o índice GIST na ordem do ``<->``."""
+    statement = FarmQueryService._nearest_statement(
+        -23.5505, -46.6333, 10, None, Projection.IDS, DEFAULT_RENDER
+    )
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    with SessionLocal() as db:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = db.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+        db.rollback()
+
+    knn_nodes = [
+        node
+        for node in plan_nodes(plan)
+        if node.get("Index Name") == "farms_geometry_idx" and "Order By" in node
+    ]
+    assert knn_nodes, f"Plano sem index scan ordenado pelo <->: {plan}"
+
+
+def test_name_search_uses_trigram_index():
+    """Teste: a busca por nome usa os índices GIN de trigramas (sem seq scan)."""
+    with SessionLocal() as db:
+        for mode in NameSearchMode:
+            connection = db.connection()
+            # Parâmetros vinculados: o "%" dos operadores não passa por literal_binds
+            compiled = FarmQueryService._name_statement("sao jose", mode, 21, 0).compile(
+                dialect=connection.dialect
+            )
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+            ).scalar()[0]["Plan"]
+            db.rollback()
+
+            index_names = {node.get("Index Name") for node in plan_nodes(plan)}
+            assert index_names & {"farms_municipio_trgm_idx", "farms_cod_imovel_trgm_idx"}, plan
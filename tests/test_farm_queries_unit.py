@@ -0,0 +1,105 @@
+"""
+Testes unitários do serviço de consultas espaciais (sem banco de dados real).
+"""
+import math
+
+import pytest
+
+from app.schemas.farm import GeometryMode, NameSearchMode
+from app.services.farm_queries import (
+    DEFAULT_RENDER,
+    NEAREST_CANDIDATE_FACTOR,
+    BaseFarmQueryService,
+    GeometryRender,
+    Projection,
+    normalize_search_text,
+    radius_envelope,
+    tile_attribute_columns,
+    zoom_tolerance,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_radius_envelope_contains_circle():
+    """O envelope cobre o raio em todas as direções (aprox. esférica de 6371 km)."""
+    latitude, longitude, radius_m = -23.5505, -46.6333, 50_000
+    xmin, ymin, xmax, ymax = radius_envelope(latitude, longitude, radius_m)
+
+    delta_lat = math.degrees(radius_m / 6_371_000)
+    delta_lon = delta_lat / math.cos(math.radians(latitude))
+
+    assert ymin <= latitude - delta_lat
+    assert ymax >= latitude + delta_lat
+    assert xmin <= longitude - delta_lon
+    assert xmax >= longitude + delta_lon
+
+
+def test_radius_envelope_clamps_latitude():
+    """O envelope nunca ultrapassa os polos."""
+    _, ymin, _, ymax = radius_envelope(-89.5, 0, 200_000)
+    assert ymin == -90.0
+    assert ymax <= 90.0
+
+
+def test_radius_envelope_antimeridian_covers_all_longitudes():
+    """Envelopes que cruzam o antimeridiano cobrem todas as longitudes."""
+    xmin, _, xmax, _ = radius_envelope(0, 179.9, 50_000)
+    assert (xmin, xmax) == (-180.0, 180.0)
+
+
+def test_geometry_render_variants_are_distinct():
+    """Cada combinação de modo, zoom e precisão tem sua própria chave de cache."""
+    renders = [
+        GeometryRender(),
+        GeometryRender(max_decimal_digits=5),
+        GeometryRender(mode=GeometryMode.SIMPLIFIED, zoom=8),
+        GeometryRender(mode=GeometryMode.SIMPLIFIED, zoom=12),
+        GeometryRender(mode=GeometryMode.BBOX),
+        GeometryRender(mode=GeometryMode.CENTROID),
+        GeometryRender(mode=GeometryMode.NONE),
+    ]
+    assert len({render.variant for render in renders}) == len(renders)
+
+
+def test_zoom_tolerance_halves_per_level():
+    """A tolerância da simplificação é o tamanho de um pixel no zoom."""
+    assert zoom_tolerance(0) == pytest.approx(360 / 256)
+    assert zoom_tolerance(13) == pytest.approx(zoom_tolerance(12) / 2)
+
+
+def test_tile_attributes_grow_with_zoom():
+    """Tiles de zoom baixo levam só o ogc_fid; os atributos entram ao aproximar."""
+    assert [column.key for column in tile_attribute_columns(5)] == ["ogc_fid"]
+    assert "municipio" in [column.key for column in tile_attribute_columns(10)]
+    assert len(tile_attribute_columns(14)) > len(tile_attribute_columns(10))
+
+
+def test_normalize_search_text_strips_accents():
+    """O texto de busca perde acentos e maiúsculas, como o unaccent_lower do banco."""
+    assert normalize_search_text("São José do Rio Preto") == "sao jose do rio preto"
+    assert normalize_search_text("CONCEIÇÃO") == "conceicao"
+
+
+def test_name_statement_uses_indexed_expression():
+    """As duas formas de busca filtram sobre unaccent_lower e ordenam pela similaridade."""
+    similar = str(BaseFarmQueryService._name_statement("Ribeirão", NameSearchMode.SIMILAR, 21, 0))
+    prefix = str(BaseFarmQueryService._name_statement("50%", NameSearchMode.PREFIX, 21, 0))
+
+    assert "<% unaccent_lower(farms.municipio)" in similar
+    assert "word_similarity" in similar
+    assert "unaccent_lower(farms.cod_imovel) LIKE" in prefix
+    assert "ESCAPE '/'" in prefix
+
+
+def test_nearest_statement_refines_index_order():
+    """Candidatos pelo <-> com LIMIT proporcional a k; ordem final pela distância geodésica."""
+    statement = BaseFarmQueryService._nearest_statement(
+        -23.5, -46.6, 5, 2000, Projection.IDS, DEFAULT_RENDER
+    )
+    sql = str(statement)
+
+    assert "ORDER BY farms.geometry <-> ST_SetSRID" in sql
+    assert "ST_DWithin" in sql
+    assert "ORDER BY ST_Distance(Geography(farms.geometry)" in sql
+    assert set(statement.compile().params.values()) >= {5, 5 * NEAREST_CANDIDATE_FACTOR}
@@ -1,9 +1,6 @@
 import logging
 
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
 
 # Aplica marcadores smoke e integration
 pytestmark = [pytest.mark.smoke, pytest.mark.integration]
@@ -11,10 +8,8 @@ pytestmark = [pytest.mark.smoke, pytest.mark.integration]
 # Configura logger para os testes
 logger = logging.getLogger(__name__)
 
-client = TestClient(app)
-
 
-def test_get_farm_not_found():
+def test_get_farm_not_found(client):
     """Teste: Buscar fazenda inexistente retorna 404."""
     farm_id = 999999
     logger.info(f"Testando busca de fazenda inexistente: ID {farm_id}")
@@ -25,7 +20,7 @@ def test_get_farm_not_found():
     assert response.status_code == 404
 
 
-def test_search_by_point_valid_request():
+def test_search_by_point_valid_request(client):
     """Teste: Busca por ponto com coordenadas válidas."""
     logger.info("Testando busca por ponto com coordenadas válidas")
     payload = {"latitude": -23.5505, "longitude": -46.6333}
@@ -46,7 +41,7 @@ def test_search_by_point_valid_request():
     assert isinstance(data["farms"], list)
 
 
-def test_search_by_point_invalid_latitude():
+def test_search_by_point_invalid_latitude(client):
     """Teste: Busca por ponto com latitude inválida (>90)."""
     logger.info("Testando busca por ponto com latitude inválida (>90)")
     payload = {
@@ -61,7 +56,7 @@ def test_search_by_point_invalid_latitude():
     assert response.status_code == 422
 
 
-def test_search_by_radius_valid_request():
+def test_search_by_radius_valid_request(client):
     """Teste: Busca por raio com parâmetros válidos."""
     logger.info("Testando busca por raio com parâmetros válidos (raio reduzido para 5km)")
     payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 5}
@@ -82,7 +77,7 @@ def test_search_by_radius_valid_request():
     assert isinstance(data["farms"], list)
 
 
-def test_search_by_radius_invalid_radius():
+def test_search_by_radius_invalid_radius(client):
     """Teste: Busca por raio inválido (negativo)."""
     logger.info("Testando busca por raio com raio negativo")
     payload = {
@@ -98,7 +93,7 @@ def test_search_by_radius_invalid_radius():
     assert response.status_code == 422
 
 
-def test_search_by_radius_with_pagination():
+def test_search_by_radius_with_pagination(client):
     """Teste: Busca por raio com paginação."""
     logger.info("Testando busca por raio com paginação (page=1, page_size=5, raio=5km)")
     payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 5}
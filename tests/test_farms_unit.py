@@ -1,15 +1,62 @@
 """
 Testes unitários para endpoints de fazendas (sem banco de dados real).
 """
+import json
+from collections import namedtuple
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.config import Settings
 from app.main import app
+from app.services.cache import PointLookupCache, get_point_cache
+from app.services.dataset_version import get_dataset_version_tracker
+from app.services.document_cache import InMemoryDocumentCache, get_document_cache
+from app.services.farm_queries import FARM_ATTRIBUTE_COLUMNS
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.tile_cache import get_tile_cache
+from tests.conftest import FixedDatasetVersion
 
 pytestmark = pytest.mark.unit
 
 client = TestClient(app)
 
+FarmRow = namedtuple("FarmRow", [column.key for column in FARM_ATTRIBUTE_COLUMNS] + ["geojson"])
+
+
+def _farm_row(**values) -> FarmRow:
+    """Cria uma linha projetada (atributos + GeoJSON) para os testes."""
+    defaults = dict.fromkeys(FarmRow._fields)
+    defaults["geojson"] = '{"type": "MultiPolygon", "coordinates": []}'
+    defaults.update(values)
+    return FarmRow(**defaults)
+
+
+def _result(rows: list) -> MagicMock:
+    """Simula o ``Result`` retornado por ``AsyncSession.execute``."""
+    result = MagicMock()
+    result.all.return_value = rows
+    result.first.return_value = rows[0] if rows else None
+    return result
+
+
+class _StreamResult:
+    """Simula o ``AsyncResult`` retornado por ``AsyncSession.stream``."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    async def __aiter__(self):
+        for row in self.rows:
+            yield row
+
+
+def _compiled_sql(db) -> list[str]:
+    """SQL das instruções enviadas à sessão mockada."""
+    return [str(call.args[0]) for call in db.execute.call_args_list]
+
 
 def test_search_by_point_invalid_latitude():
     """Testa busca por ponto com latitude inválida."""
@@ -41,3 +88,457 @@ def test_root_endpoint():
     assert "version" in data
     assert "docs" in data
     assert "health" in data
+
+
+def test_get_farm_uses_projected_geojson(override_get_async_db):
+    """Testa que a busca por ID usa o GeoJSON já renderizado na consulta."""
+    override_get_async_db.execute.return_value = _result(
+        [_farm_row(ogc_fid=1, cod_imovel="SP-123")]
+    )
+
+    response = client.get("/fazendas/SP-123")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ogc_fid"] == 1
+    assert data["geometry"] == {"type": "MultiPolygon", "coordinates": []}
+    # Revisão (sem geometria) e uma única consulta que já traz o GeoJSON
+    revision_sql, document_sql = _compiled_sql(override_get_async_db)
+    assert "ST_AsGeoJSON" not in revision_sql
+    assert "ST_AsGeoJSON" in document_sql
+
+
+def test_get_farm_not_found(override_get_async_db):
+    """Testa que uma fazenda inexistente retorna 404."""
+    override_get_async_db.execute.return_value = _result([])
+
+    response = client.get("/fazendas/inexistente")
+
+    assert response.status_code == 404
+
+
+def test_search_by_point_invalid_cursor(override_get_async_db):
+    """Testa que um cursor malformado retorna 400."""
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto?cursor=invalido", json=payload)
+    assert response.status_code == 400
+    override_get_async_db.execute.assert_not_called()
+
+
+def test_search_by_point_with_cursor_returns_next_cursor(override_get_async_db):
+    """Testa a paginação por cursor: seek por ogc_fid e next_cursor quando há mais."""
+    override_get_async_db.execute.return_value = _result(
+        [_farm_row(ogc_fid=fid) for fid in (6, 7, 8)]
+    )
+    override_get_async_db.scalar.return_value = 10
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    cursor = encode_cursor(5)
+    response = client.post(f"/fazendas/busca-ponto?cursor={cursor}&page_size=2", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [farm["ogc_fid"] for farm in data["farms"]] == [6, 7]
+    assert data["page"] is None
+    assert data["total"] == 10
+    assert decode_cursor(data["next_cursor"]) == 7
+
+    (sql,) = _compiled_sql(override_get_async_db)
+    assert "farms.ogc_fid >" in sql
+    assert "OFFSET" not in sql
+
+
+def test_search_by_point_count_none_skips_count(override_get_async_db):
+    """Testa count=none: sem count(*), total nulo e has_more pela linha extra."""
+    override_get_async_db.execute.return_value = _result(
+        [_farm_row(ogc_fid=fid) for fid in (1, 2, 3)]
+    )
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto?page_size=2&count=none", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert data["count"] == "none"
+    assert data["has_more"] is True
+    assert len(data["farms"]) == 2
+    override_get_async_db.scalar.assert_not_called()
+
+
+def test_search_by_point_last_page_skips_count(override_get_async_db):
+    """Testa que uma página incompleta já revela o total exato sem count(*)."""
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["has_more"] is False
+    override_get_async_db.scalar.assert_not_called()
+
+
+def test_search_by_radius_estimate_count_is_capped(override_get_async_db):
+    """Testa count=estimate: contagem limitada e total_capped ao atingir o limite."""
+    override_get_async_db.execute.return_value = _result(
+        [_farm_row(ogc_fid=fid) for fid in (1, 2, 3)]
+    )
+    override_get_async_db.scalar.return_value = 1000
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 50}
+    response = client.post("/fazendas/busca-raio?page_size=2&count=estimate", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1000
+    assert data["total_capped"] is True
+    count_sql = str(override_get_async_db.scalar.call_args.args[0])
+    assert "LIMIT" in count_sql
+
+
+def test_search_by_point_reuses_cached_ids(override_get_async_db):
+    """Testa que a segunda busca no mesmo ponto não repete o ST_Covers."""
+    cache = PointLookupCache(maxsize=10, ttl_s=60, precision=5)
+    app.dependency_overrides[get_point_cache] = lambda: cache
+
+    scalars = MagicMock()
+    scalars.all.return_value = [1, 2]
+    override_get_async_db.scalars.return_value = scalars
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=fid) for fid in (1, 2)])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    first = client.post("/fazendas/busca-ponto", json=payload)
+    second = client.post("/fazendas/busca-ponto", json=payload)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["total"] == 2
+    assert override_get_async_db.scalars.await_count == 1
+    assert cache.stats()["hits"] == 1
+    assert all("ST_Covers" not in sql for sql in _compiled_sql(override_get_async_db))
+
+
+def test_search_by_point_boundary_depends_on_point_cache(override_get_async_db):
+    """
+    Testa o arredondamento do cache perto da divisa entre fazendas.
+
+    Sem cache (padrão) cada ponto vai ao banco com as coordenadas exatas. Com
+    cache, pontos da mesma célula compartilham o resultado do ponto arredondado.
+    """
+    scalars = MagicMock()
+    scalars.all.return_value = [1]
+    override_get_async_db.scalars.return_value = scalars
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+    inside = {"latitude": -23.550504, "longitude": -46.633304}
+    across = {"latitude": -23.550496, "longitude": -46.633296}
+
+    client.post("/fazendas/busca-ponto", json=inside)
+    params = override_get_async_db.execute.call_args_list[0].args[0].compile().params
+    assert -23.550504 in params.values()
+    assert Settings.model_fields["point_cache_enabled"].default is False
+
+    cache = PointLookupCache(maxsize=10, ttl_s=60, precision=4)
+    app.dependency_overrides[get_point_cache] = lambda: cache
+    override_get_async_db.execute.reset_mock()
+
+    client.post("/fazendas/busca-ponto", json=inside)
+    covering_sql = override_get_async_db.scalars.call_args.args[0].compile()
+    client.post("/fazendas/busca-ponto", json=across)
+
+    assert -23.5505 in covering_sql.params.values()
+    assert override_get_async_db.scalars.await_count == 1  # "across" reusou "inside"
+    assert cache.stats()["hits"] == 1
+
+
+def test_get_farm_serves_cached_document(override_get_async_db):
+    """Testa que um documento em cache dispensa a consulta da geometria."""
+    cache = InMemoryDocumentCache(max_bytes=1024 * 1024, max_item_bytes=1024 * 1024)
+    app.dependency_overrides[get_document_cache] = lambda: cache
+
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    first = client.get("/fazendas/SP-123")
+    second = client.get("/fazendas/SP-123")
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert second.json()["ogc_fid"] == 1
+    # A geometria foi renderizada uma única vez; a segunda busca só leu a revisão
+    geometry_queries = [
+        sql for sql in _compiled_sql(override_get_async_db) if "ST_AsGeoJSON" in sql
+    ]
+    assert len(geometry_queries) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_search_by_radius_simplified_geometry(override_get_async_db):
+    """Testa geometry=simplified: simplificação e precisão calculadas no banco."""
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 50}
+    response = client.post(
+        "/fazendas/busca-raio?geometry=simplified&zoom=10&precision=4", json=payload
+    )
+
+    assert response.status_code == 200
+    sql = _compiled_sql(override_get_async_db)[0]
+    assert "ST_SimplifyPreserveTopology" in sql
+    params = override_get_async_db.execute.call_args.args[0].compile().params
+    assert 4 in params.values()
+
+
+def test_search_by_point_without_geometry(override_get_async_db):
+    """Testa geometry=none: nenhuma função de geometria no SELECT e geometria nula."""
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1, geojson=None)])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto?geometry=none", json=payload)
+
+    assert response.status_code == 200
+    assert response.json()["farms"][0]["geometry"] is None
+    assert "ST_AsGeoJSON" not in _compiled_sql(override_get_async_db)[0]
+
+
+def test_search_nearest_returns_distances(override_get_async_db):
+    """Testa a busca dos mais próximos: distância em metros junto de cada fazenda."""
+    NearestRow = namedtuple("NearestRow", [*FarmRow._fields, "distance_m"])
+    rows = [NearestRow(*_farm_row(ogc_fid=fid), distance_m=d) for fid, d in ((2, 0.0), (1, 850.5))]
+    override_get_async_db.execute.return_value = _result(rows)
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-proximas?k=2&max_distance_m=1000", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["k"], data["max_distance_m"]) == (2, 1000)
+    assert [(r["distance_m"], r["farm"]["ogc_fid"]) for r in data["results"]] == [
+        (0.0, 2),
+        (850.5, 1),
+    ]
+    assert "<->" in _compiled_sql(override_get_async_db)[0]
+
+
+def test_search_nearest_loads_cached_documents(override_get_async_db):
+    """Testa que, com cache de documentos, a busca retorna ``ogc_fid`` e mantém a ordem."""
+    cache = InMemoryDocumentCache(max_bytes=1024 * 1024, max_item_bytes=1024 * 1024)
+    app.dependency_overrides[get_document_cache] = lambda: cache
+    IdRow = namedtuple("IdRow", ["ogc_fid", "distance_m"])
+    override_get_async_db.execute.side_effect = [
+        _result([IdRow(3, 10.0), IdRow(1, 20.0)]),
+        _result([_farm_row(ogc_fid=1), _farm_row(ogc_fid=3)]),
+    ]
+
+    response = client.post(
+        "/fazendas/busca-proximas", json={"latitude": -23.5505, "longitude": -46.6333}
+    )
+
+    assert response.status_code == 200
+    assert [r["farm"]["ogc_fid"] for r in response.json()["results"]] == [3, 1]
+
+
+def test_search_by_point_invalid_precision(override_get_async_db):
+    """Testa que precisões fora de 0..15 são rejeitadas."""
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto?precision=20", json=payload)
+    assert response.status_code == 422
+
+
+def test_batch_lookup_streams_farms_and_missing_ids(override_get_async_db):
+    """Testa a busca em lote: uma única consulta ANY(:ids) e IDs ausentes separados."""
+    override_get_async_db.stream.return_value = _StreamResult(
+        [_farm_row(ogc_fid=1, cod_imovel="SP-1"), _farm_row(ogc_fid=3, cod_imovel="SP-3")]
+    )
+
+    payload = {"ids": ["SP-1", "SP-2", "SP-3", "SP-1"]}
+    response = client.post("/fazendas/lote", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [farm["cod_imovel"] for farm in data["farms"]] == ["SP-1", "SP-3"]
+    assert data["missing"] == ["SP-2"]
+    assert override_get_async_db.stream.await_count == 1
+    stmt = override_get_async_db.stream.call_args.args[0]
+    assert "ANY" in str(stmt)
+    assert stmt.compile().params["ids"] == ["SP-1", "SP-2", "SP-3"]
+
+
+def test_batch_lookup_by_ogc_fid_requires_integers(override_get_async_db):
+    """Testa que id_type=ogc_fid rejeita IDs não numéricos."""
+    response = client.post("/fazendas/lote", json={"ids": ["SP-1"], "id_type": "ogc_fid"})
+    assert response.status_code == 422
+    override_get_async_db.stream.assert_not_called()
+
+
+def test_search_by_points_single_spatial_join(override_get_async_db):
+    """Testa a busca por vários pontos: uma junção unnest + ST_Covers, resultado por ponto."""
+    override_get_async_db.execute.return_value = _result([(1, 10), (1, 11), (3, 12)])
+
+    payload = {"points": [[-23.55, -46.63], [-22.12, -47.56], [-21.0, -48.0]]}
+    response = client.post("/fazendas/busca-pontos", json=payload)
+
+    assert response.status_code == 200
+    assert response.json() == {"results": [[10, 11], [], [12]], "matched": 2}
+    assert override_get_async_db.execute.await_count == 1
+    sql = _compiled_sql(override_get_async_db)[0]
+    assert "unnest" in sql
+    assert "ST_Covers" in sql
+
+
+def test_search_by_points_invalid_latitude(override_get_async_db):
+    """Testa que um ponto fora da faixa invalida a requisição."""
+    response = client.post("/fazendas/busca-pontos", json={"points": [[-23.5, -46.6], [95, 0]]})
+    assert response.status_code == 422
+
+
+def test_export_by_radius_ndjson(override_get_async_db):
+    """Testa a exportação NDJSON: uma Feature por linha, lida por cursor no servidor."""
+    override_get_async_db.stream.return_value = _StreamResult(
+        [_farm_row(ogc_fid=fid, cod_imovel=f"SP-{fid}") for fid in (1, 2)]
+    )
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 200}
+    response = client.post("/fazendas/busca-raio/exportar", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    features = [json.loads(line) for line in response.text.splitlines()]
+    assert [feature["id"] for feature in features] == [1, 2]
+    assert features[0]["type"] == "Feature"
+    assert features[0]["geometry"]["type"] == "MultiPolygon"
+    assert features[1]["properties"]["cod_imovel"] == "SP-2"
+    stmt = override_get_async_db.stream.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] > 0
+    assert "LIMIT" not in str(stmt)
+
+
+def test_export_by_point_feature_collection(override_get_async_db):
+    """Testa a exportação como FeatureCollection, inclusive sem resultados."""
+    override_get_async_db.stream.return_value = _StreamResult([])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333}
+    response = client.post("/fazendas/busca-ponto/exportar?format=geojson", json=payload)
+
+    assert response.status_code == 200
+    assert response.json() == {"type": "FeatureCollection", "features": []}
+
+
+def test_get_tile_renders_mvt_and_honors_etag(override_get_async_db):
+    """Testa o tile MVT: ST_AsMVT no banco, cache por z/x/y e 304 com If-None-Match."""
+    cache = InMemoryDocumentCache(max_bytes=1024 * 1024, max_item_bytes=1024 * 1024)
+    app.dependency_overrides[get_tile_cache] = lambda: cache
+    override_get_async_db.scalar.return_value = b"\x1a\x05mvt"
+
+    first = client.get("/fazendas/tiles/12/1517/2323.mvt")
+    second = client.get("/fazendas/tiles/12/1517/2323.mvt")
+    not_modified = client.get(
+        "/fazendas/tiles/12/1517/2323.mvt", headers={"If-None-Match": first.headers["etag"]}
+    )
+
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert first.content == second.content == b"\x1a\x05mvt"
+    assert not_modified.status_code == 304
+    assert override_get_async_db.scalar.await_count == 1
+    sql = str(override_get_async_db.scalar.call_args.args[0])
+    assert "ST_AsMVT" in sql
+    assert "ST_TileEnvelope" in sql
+
+
+def test_get_tile_outside_grid(override_get_async_db):
+    """Testa que coordenadas fora da grade do zoom são rejeitadas."""
+    response = client.get("/fazendas/tiles/2/4/0.mvt")
+    assert response.status_code == 400
+
+
+def test_get_farm_conditional_requests(override_get_async_db):
+    """Testa ETag/Last-Modified: 304 sem carregar a geometria."""
+    app.dependency_overrides[get_dataset_version_tracker] = lambda: FixedDatasetVersion(
+        1, updated_at=datetime(2026, 1, 10, 12, 0, tzinfo=UTC)
+    )
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    first = client.get("/fazendas/SP-123")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"] == "Sat, 10 Jan 2026 12:00:00 GMT"
+    assert "max-age" in first.headers["cache-control"]
+
+    override_get_async_db.execute.reset_mock()
+    by_etag = client.get("/fazendas/SP-123", headers={"If-None-Match": etag})
+    by_date = client.get(
+        "/fazendas/SP-123", headers={"If-Modified-Since": "Sun, 11 Jan 2026 00:00:00 GMT"}
+    )
+    stale = client.get(
+        "/fazendas/SP-123", headers={"If-Modified-Since": "Fri, 09 Jan 2026 00:00:00 GMT"}
+    )
+
+    assert by_etag.status_code == by_date.status_code == 304
+    assert by_etag.headers["etag"] == etag
+    assert stale.status_code == 200
+    geometry_queries = [
+        sql for sql in _compiled_sql(override_get_async_db) if "ST_AsGeoJSON" in sql
+    ]
+    assert len(geometry_queries) == 1  # Apenas a requisição sem cache válido
+
+
+def test_search_etag_skips_query(override_get_async_db):
+    """Testa que a busca com If-None-Match igual responde 304 sem consultar as fazendas."""
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    payload = {"latitude": -23.5505, "longitude": -46.6333, "raio_km": 50}
+    first = client.post("/fazendas/busca-raio?name=Campinas", json=payload)
+    etag = first.headers["etag"]
+
+    override_get_async_db.execute.reset_mock()
+    same = client.post(
+        "/fazendas/busca-raio?name=CAMPINAS", json=payload, headers={"If-None-Match": etag}
+    )
+    other = client.post(
+        "/fazendas/busca-raio?page_size=10", json=payload, headers={"If-None-Match": etag}
+    )
+
+    assert same.status_code == 304
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+    assert override_get_async_db.execute.await_count == 1
+
+
+def test_search_by_name_ranks_without_geometry(override_get_async_db):
+    """Testa a busca por nome: não cai na rota /fazendas/{farm_id} e retorna o score."""
+    NameRow = namedtuple("NameRow", ["ogc_fid", "cod_imovel", "municipio", "num_area", "score"])
+    rows = [
+        NameRow(1, "SP-1", "São José dos Campos", 10.0, 0.9),
+        NameRow(2, "SP-2", "São José do Rio Preto", 20.0, 0.8),
+    ]
+    override_get_async_db.execute.return_value = _result(rows)
+
+    response = client.get("/fazendas/busca-nome?q=sao jose&page_size=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["mode"] == "similar"
+    assert data["has_more"] is True
+    assert data["results"] == [
+        {
+            "ogc_fid": 1,
+            "cod_imovel": "SP-1",
+            "municipio": "São José dos Campos",
+            "num_area": 10.0,
+            "score": 0.9,
+        }
+    ]
+    sql = _compiled_sql(override_get_async_db)[-1]
+    assert "word_similarity" in sql
+    assert "ST_AsGeoJSON" not in sql
+
+    same = client.get(
+        "/fazendas/busca-nome?q=SÃO JOSÉ&page_size=1",
+        headers={"If-None-Match": response.headers["etag"]},
+    )
+    assert same.status_code == 304
+
+
+def test_search_by_name_requires_two_characters():
+    """Testa que buscas por nome com menos de dois caracteres são rejeitadas."""
+    response = client.get("/fazendas/busca-nome?q=s")
+    assert response.status_code == 422
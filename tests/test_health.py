@@ -2,16 +2,11 @@
 Testes para health check endpoint.
 """
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
 
 pytestmark = [pytest.mark.smoke, pytest.mark.integration]
 
-client = TestClient(app)
-
 
-def test_health_endpoint_structure():
+def test_health_endpoint_structure(client):
     """Testa que o endpoint health retorna a estrutura correta."""
     response = client.get("/health")
 
@@ -0,0 +1,59 @@
+"""
+Testes unitários dos endpoints internos de diagnóstico.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import internal
+from app.core.db import PoolMetrics
+from app.main import app
+
+pytestmark = pytest.mark.unit
+
+client = TestClient(app)
+
+
+def test_pool_status_structure(internal_headers):
+    """Testa que o endpoint do pool retorna uso e métricas de espera."""
+    response = client.get("/internal/pool", headers=internal_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    for field in ("size", "checked_out", "overflow", "timeouts", "wait_ms_avg", "wait_ms_max"):
+        assert field in data
+
+
+def test_internal_endpoints_require_token(internal_headers, monkeypatch):
+    """Sem o token correto os endpoints internos não respondem; sem token configurado, 404."""
+    wrong = client.get("/internal/slow-queries", headers={"Authorization": "Bearer x"})
+    missing = client.get("/metrics")
+
+    assert wrong.status_code == missing.status_code == 401
+    assert missing.headers["www-authenticate"] == "Bearer"
+
+    monkeypatch.setattr(internal.settings, "internal_token", "")
+    assert client.get("/internal/cache", headers=internal_headers).status_code == 404
+
+
+def test_metrics_open_without_configured_token(monkeypatch):
+    """Na configuração padrão (sem token, sem DEBUG) o Prometheus ainda coleta /metrics."""
+    monkeypatch.setattr(internal.settings, "debug", False)
+    monkeypatch.setattr(internal.settings, "internal_token", "")
+
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/internal/pool").status_code == 404
+
+
+def test_pool_metrics_snapshot():
+    """Testa a agregação das esperas por conexão."""
+    metrics = PoolMetrics()
+    metrics.record_wait(0.010)
+    metrics.record_wait(0.030)
+    metrics.record_timeout()
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["checkouts"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms_avg"] == pytest.approx(20.0)
+    assert snapshot["wait_ms_max"] == pytest.approx(30.0)
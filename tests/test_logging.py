@@ -0,0 +1,55 @@
+"""
+Testes unitários da configuração de logs estruturados.
+"""
+import json
+import logging
+import queue
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.logging import LazyQueueHandler, SamplingFilter, StructuredFormatter
+
+pytestmark = pytest.mark.unit
+
+
+def _record(level: int = logging.INFO, msg: str = "Busca %s", args=("ok",), **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_formatter_outputs_json_with_extra_fields():
+    """Formata mensagem, horário UTC do registro e campos extras (inclusive não-JSON)."""
+    record = _record(extra_fields={"area": Decimal("12.5"), "status": 200})
+    record.created = 1_700_000_000.25
+
+    data = json.loads(StructuredFormatter().format(record))
+
+    assert data["message"] == "Busca ok"
+    assert data["timestamp"] == "2023-11-14T22:13:20.250000"
+    assert datetime.fromisoformat(data["timestamp"])
+    assert data["area"] == "12.5"
+    assert data["status"] == 200
+
+
+def test_queue_handler_enqueues_without_formatting():
+    """O registro vai para a fila com msg e args intactos; fila cheia descarta."""
+    log_queue = queue.Queue(1)
+    handler = LazyQueueHandler(log_queue)
+
+    handler.emit(_record())
+    handler.emit(_record())
+
+    queued = log_queue.get_nowait()
+    assert (queued.msg, queued.args) == ("Busca %s", ("ok",))
+    assert handler.dropped == 1
+
+
+def test_sampling_filter_keeps_warnings():
+    """Com taxa zero, linhas INFO são descartadas e avisos continuam passando."""
+    sampling = SamplingFilter(0.0)
+
+    assert not sampling.filter(_record(logging.INFO))
+    assert sampling.filter(_record(logging.WARNING))
@@ -0,0 +1,70 @@
+"""
+Testes unitários das métricas por rota e do endpoint /metrics.
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Histogram, RequestStats, _after_cursor_execute, request_stats
+from app.main import app
+from tests.test_farms_unit import _farm_row, _result
+
+pytestmark = pytest.mark.unit
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """O histograma segue o formato de texto do Prometheus."""
+    histogram = Histogram("latency_seconds", "Latência", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    lines = histogram.samples()
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_engine_hooks_accumulate_request_stats():
+    """Os hooks da engine somam consultas, tempo e linhas à requisição corrente."""
+
+    class Connection:
+        info = {"query_start": [0.0]}
+
+    class Cursor:
+        rowcount = 7
+
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    try:
+        _after_cursor_execute(Connection(), Cursor(), "SELECT 1", {}, None, False)
+    finally:
+        request_stats.reset(token)
+
+    assert stats.db_queries == 1
+    assert stats.rows == 7
+    assert stats.db_seconds > 0
+
+
+def test_metrics_endpoint_and_access_log(override_get_async_db, internal_headers, caplog):
+    """Requisições aparecem em /metrics pela rota (não pelo ID) e no log de acesso."""
+    override_get_async_db.execute.return_value = _result([_farm_row(ogc_fid=1)])
+
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        client.get("/fazendas/SP-METRICS")
+
+    body = client.get("/metrics", headers=internal_headers).text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_requests_total{method="GET",route="/fazendas/{farm_id}",status="200"}' in body
+    assert "SP-METRICS" not in body
+
+    record = next(r for r in caplog.records if r.name == "app.access")
+    assert record.extra_fields["route"] == "/fazendas/{farm_id}"
+    assert record.extra_fields["status"] == 200
+    assert record.extra_fields["render_ms"] >= 0
+    assert record.extra_fields["response_bytes"] > 0
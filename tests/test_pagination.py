@@ -0,0 +1,20 @@
+"""
+Testes unitários dos cursores de paginação por chave.
+"""
+import pytest
+
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.unit
+
+
+def test_cursor_round_trip():
+    """Testa que o cursor codificado volta ao mesmo ogc_fid."""
+    assert decode_cursor(encode_cursor(12345)) == 12345
+
+
+@pytest.mark.parametrize("cursor", ["", "não-base64", "eyJmb28iOjF9", "eyJpZCI6ImEifQ"])
+def test_decode_invalid_cursor(cursor):
+    """Testa que cursores malformados são rejeitados."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
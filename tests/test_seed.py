@@ -0,0 +1,354 @@
+"""
+Testes unitários do seed (montagem do SQL e decisões, sem banco).
+"""
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2.errors
+import pytest
+
+from seed import load_shapefiles as seed
+
+pytestmark = pytest.mark.unit
+
+
+class _SwapCursor:
+    """Cursor falso com o catálogo de farms e da staging; as primeiras tentativas ficam bloqueadas."""
+
+    INDEXES = {
+        "farms": ["farms_pkey", "farms_geometry_geom_idx"],
+        "farms_staging": ["farms_staging_pkey", "farms_staging_geometry_idx"],
+    }
+    SEQUENCES = {"farms": "public.farms_ogc_fid_seq", "farms_staging": None}
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = None
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        if sql.startswith("SET LOCAL lock_timeout") and self.conn.locked:
+            self.conn.locked -= 1
+            raise psycopg2.errors.LockNotAvailable()
+        if "to_regclass" in sql:
+            self.result = [("farms",)]
+        elif "pg_indexes" in sql:
+            self.result = [(name,) for name in self.INDEXES[params[0]]]
+        elif "pg_get_serial_sequence" in sql:
+            self.result = [(self.SEQUENCES[params[0]],)]
+        elif "RETURNING version" in sql:
+            self.result = [(7,)]
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class _SwapConnection:
+    def __init__(self, locked: int):
+        self.locked = locked
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.autocommit = False
+
+    def cursor(self):
+        return _SwapCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.statements.clear()
+
+    def close(self):
+        pass
+
+
+def test_rename_statements_staging_to_live():
+    """A staging assume os nomes da tabela em uso: índices, PK e sequência."""
+    statements = seed.rename_statements(
+        "farms_staging",
+        "farms",
+        ["farms_staging_pkey", "farms_staging_geometry_idx", "farms_staging_municipio_trgm_idx"],
+        "public.farms_staging_ogc_fid_seq",
+    )
+
+    assert statements == [
+        'ALTER INDEX "farms_staging_pkey" RENAME TO "farms_pkey";',
+        'ALTER INDEX "farms_staging_geometry_idx" RENAME TO "farms_geometry_idx";',
+        'ALTER INDEX "farms_staging_municipio_trgm_idx" RENAME TO "farms_municipio_trgm_idx";',
+        "ALTER SEQUENCE public.farms_staging_ogc_fid_seq RENAME TO farms_ogc_fid_seq;",
+        "ALTER TABLE farms_staging RENAME TO farms;",
+    ]
+
+
+def test_rename_statements_baseline_ogr2ogr_table():
+    """A tabela criada pelo ogr2ogr original (índice *_geom_idx, serial) sai do caminho inteira."""
+    statements = seed.rename_statements(
+        "farms",
+        "farms_old",
+        ["farms_pkey", "farms_geometry_geom_idx", "farms_geometry_idx", "idx_manual"],
+        "public.farms_ogc_fid_seq",
+    )
+
+    assert statements == [
+        'ALTER INDEX "farms_pkey" RENAME TO "farms_old_pkey";',
+        'ALTER INDEX "farms_geometry_geom_idx" RENAME TO "farms_old_geometry_geom_idx";',
+        'ALTER INDEX "farms_geometry_idx" RENAME TO "farms_old_geometry_idx";',
+        "ALTER SEQUENCE public.farms_ogc_fid_seq RENAME TO farms_old_ogc_fid_seq;",
+        "ALTER TABLE farms RENAME TO farms_old;",
+    ]
+
+
+def test_rename_statements_without_sequence():
+    """Tabela sem serial (p.ex. criada por CREATE TABLE AS) só renomeia índices e tabela."""
+    statements = seed.rename_statements("farms_staging", "farms", [], None)
+
+    assert statements == ["ALTER TABLE farms_staging RENAME TO farms;"]
+
+
+def test_swap_tables_retries_on_lock_timeout(monkeypatch):
+    """Com lock_timeout a troca desfaz a tentativa, espera e refaz tudo na mesma ordem."""
+    conn = _SwapConnection(locked=2)
+    monkeypatch.setattr(seed.psycopg2, "connect", lambda **kwargs: conn)
+    monkeypatch.setattr(seed.time, "sleep", lambda seconds: None)
+
+    assert seed.swap_tables("db", 5432, "u", "p", "meuat")
+
+    assert (conn.rollbacks, conn.commits) == (2, 1)
+    renames = [sql for sql in conn.statements if "RENAME" in sql]
+    assert renames == [
+        *seed.rename_statements(
+            "farms", "farms_old", _SwapCursor.INDEXES["farms"], "public.farms_ogc_fid_seq"
+        ),
+        *seed.rename_statements("farms_staging", "farms", _SwapCursor.INDEXES["farms_staging"]),
+    ]
+    assert conn.statements[-1] == "DROP TABLE IF EXISTS farms_old;"
+
+
+def test_swap_tables_gives_up_after_retries(monkeypatch):
+    """Sem conseguir o bloqueio, a troca desiste e farms fica como estava."""
+    conn = _SwapConnection(locked=10)
+    monkeypatch.setattr(seed.psycopg2, "connect", lambda **kwargs: conn)
+    monkeypatch.setattr(seed.time, "sleep", lambda seconds: None)
+
+    assert not seed.swap_tables("db", 5432, "u", "p", "meuat", retries=3)
+    assert (conn.rollbacks, conn.commits) == (3, 0)
+
+
+def test_discover_shapefiles_walks_subdirectories(tmp_path):
+    """Os shapefiles de todas as subpastas entram, em ordem de caminho; o resto fica de fora."""
+    for name in ("SP/AREA_IMOVEL.shp", "MG/AREA_IMOVEL.shp", "MG/AREA_IMOVEL.dbf", "leia-me.txt"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+    (tmp_path / "pasta.shp").mkdir()
+
+    assert seed.discover_shapefiles(tmp_path) == [
+        str(tmp_path / "MG/AREA_IMOVEL.shp"),
+        str(tmp_path / "SP/AREA_IMOVEL.shp"),
+    ]
+    assert seed.discover_shapefiles(tmp_path, "SP*") == []
+    assert seed.discover_shapefiles(tmp_path / "SP", "AREA_*.shp") == [
+        str(tmp_path / "SP/AREA_IMOVEL.shp")
+    ]
+
+
+def test_part_table_sanitizes_file_name():
+    assert seed._part_table("/dados/MG/AREA-IMOVEL MG.shp") == "farms_part_area_imovel_mg"
+    assert seed._part_table("__Área__2024__.shp") == "farms_part_rea_2024"
+
+
+def test_part_table_truncates_to_identifier_limit():
+    """Nomes longos cabem em 63 caracteres sem colidir quando só o final difere."""
+    first = seed._part_table(f"/dados/{'a' * 80}_sp.shp")
+    second = seed._part_table(f"/dados/{'a' * 80}_mg.shp")
+
+    assert len(first) == len(second) == 63
+    assert first.startswith("farms_part_aaaa")
+    assert first != second
+
+
+def test_part_tables_disambiguates_repeated_names():
+    """O mesmo nome em pastas diferentes vira tabelas distintas; os demais ficam como estão."""
+    parts = seed.part_tables(
+        ["/dados/MG/AREA_IMOVEL.shp", "/dados/SP/AREA_IMOVEL.shp", "/dados/RJ.shp"]
+    )
+
+    tables = [table for _, table in parts]
+    assert len(set(tables)) == 3
+    assert tables[0].startswith("farms_part_area_imovel_")
+    assert tables[1].startswith("farms_part_area_imovel_")
+    assert tables[2] == "farms_part_rj"
+    assert parts == seed.part_tables([path for path, _ in parts])
+
+
+def _shapefiles(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / f"{name}.shp"
+        path.write_bytes(b"shp")
+        paths.append(str(path))
+    return seed.part_tables(paths)
+
+
+def _manifest(path, table):
+    stat = os.stat(path)
+    return (table, stat.st_size, stat.st_mtime)
+
+
+def test_pending_parts_skips_registered_and_populated(tmp_path):
+    """Só pula a parte registrada com o mesmo tamanho/mtime e cuja tabela tem linhas."""
+    done, changed, emptied, new = _shapefiles(tmp_path, "done", "changed", "emptied", "new")
+    loaded = {
+        done[0]: _manifest(*done),
+        changed[0]: (changed[1], 1, 0.0),
+        emptied[0]: _manifest(*emptied),
+    }
+    populated = {done[1], changed[1]}
+
+    assert seed.pending_parts([done, changed, emptied, new], loaded, populated) == [
+        changed,
+        emptied,
+        new,
+    ]
+
+
+class _PartsCursor:
+    """Cursor falso do registro de partes: ``loaded`` já registradas, ``empty`` sem linhas."""
+
+    def __init__(self, loaded, empty):
+        self.loaded = loaded
+        self.empty = empty
+        self.registered = []
+        self.result = None
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT path, part_table"):
+            self.result = [(path, *entry) for path, entry in self.loaded.items()]
+        elif "to_regclass" in sql:
+            self.result = [(params[0],)]
+        elif "EXISTS" in sql:
+            self.result = [(not any(table in sql for table in self.empty),)]
+        elif "INSERT INTO seed_parts" in sql:
+            self.registered.append(params[0])
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class _PartsConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def set_isolation_level(self, level):
+        pass
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
+def test_load_parts_resumes_from_manifest(tmp_path, monkeypatch):
+    """Uma nova execução só manda para o pool os arquivos que faltam."""
+    done, emptied, new = _shapefiles(tmp_path, "done", "emptied", "new")
+    cursor = _PartsCursor(
+        {done[0]: _manifest(*done), emptied[0]: _manifest(*emptied)}, {emptied[1]}
+    )
+    submitted = []
+
+    def load_part(connection, path, table):
+        submitted.append(path)
+        return 10, 1.0
+
+    monkeypatch.setattr(seed.psycopg2, "connect", lambda **kwargs: _PartsConnection(cursor))
+    monkeypatch.setattr(seed, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(seed, "_load_part", load_part)
+
+    parts = seed.load_parts("db", 5432, "u", "p", "meuat", [done[0], emptied[0], new[0]])
+
+    assert parts == [done, emptied, new]
+    assert sorted(submitted) == sorted(cursor.registered) == [emptied[0], new[0]]
+
+
+def test_sync_statements_compare_dat_atuali():
+    """Por padrão só ``dat_atuali`` decide a atualização; as colunas vêm do conteúdo novo."""
+    delete, update, insert = seed.sync_statements(["dat_atuali", "geometry", "municipio"])
+
+    assert "SET dat_atuali = i.dat_atuali, geometry = i.geometry, municipio = i.municipio" in update
+    assert "AND (i.dat_atuali IS DISTINCT FROM f.dat_atuali);" in update
+    assert "ST_AsEWKB" not in update
+    assert "INSERT INTO farms (cod_imovel, dat_atuali, geometry, municipio)" in insert
+    assert "SELECT i.cod_imovel, i.dat_atuali, i.geometry, i.municipio" in insert
+
+
+def test_sync_statements_compare_geometry():
+    """Com ``compare="geometry"`` a geometria diferente em EWKB também conta como mudança."""
+    _, update, _ = seed.sync_statements(["dat_atuali", "geometry"], compare="geometry")
+
+    assert (
+        "AND (i.dat_atuali IS DISTINCT FROM f.dat_atuali"
+        " OR ST_AsEWKB(i.geometry) <> ST_AsEWKB(f.geometry));"
+    ) in update
+
+
+def test_sync_statements_keep_rows_without_cod_imovel():
+    """A remoção não alcança registros sem ``cod_imovel``, que nunca casam com o conteúdo novo."""
+    delete, _, _ = seed.sync_statements(["dat_atuali"])
+
+    assert "WHERE f.cod_imovel IS NOT NULL" in delete
+    assert "NOT EXISTS (SELECT 1 FROM farms_incoming i WHERE i.cod_imovel = f.cod_imovel)" in delete
+
+
+@pytest.mark.parametrize(
+    ("deleted", "existing", "exceeds"),
+    [(0, 0, False), (5, 0, False), (20, 100, False), (21, 100, True), (100, 100, True)],
+)
+def test_delete_exceeds_limit(deleted, existing, exceeds):
+    assert seed.delete_exceeds_limit(deleted, existing, 0.2) is exceeds
+
+
+def test_sync_counts():
+    """Cada registro novo é inserido, atualizado ou fica sem mudança; removidos ficam à parte."""
+    assert seed.sync_counts(incoming=1000, inserted=30, updated=70, deleted=12) == {
+        "incoming": 1000,
+        "inserted": 30,
+        "updated": 70,
+        "deleted": 12,
+        "unchanged": 900,
+    }
+
+
+def _latest_first(rows):
+    """Ordena (ogc_fid, dat_atuali) com o ``ORDER BY`` do seed, num SQLite em memória."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE u (ogc_fid INTEGER, dat_atuali TEXT)")
+    conn.executemany("INSERT INTO u VALUES (?, ?)", rows)
+    order = seed.latest_first_order()
+    return [fid for (fid,) in conn.execute(f"SELECT ogc_fid FROM u ORDER BY {order}")]
+
+
+def test_latest_first_order_compares_car_dates_as_dates():
+    """'20/12/2016' vem depois de '05/01/2023' como texto, mas a atualização de 2023 vence."""
+    assert _latest_first([(1, "05/01/2023"), (2, "20/12/2016")]) == [1, 2]
+    assert _latest_first([(1, "20/12/2016"), (2, "2023-01-05"), (3, None)]) == [2, 1, 3]
+
+
+def test_latest_first_order_breaks_ties_by_ogc_fid():
+    """Com a mesma data, fica o registro carregado por último (maior ogc_fid)."""
+    assert _latest_first([(7, "05/01/2023"), (9, "05/01/2023"), (8, "2023-01-05")]) == [9, 8, 7]
@@ -0,0 +1,51 @@
+"""
+Testes unitários da serialização rápida dos documentos de fazendas.
+"""
+import json
+from collections import namedtuple
+
+import pytest
+
+from app.core.serialization import FastJSONResponse
+from app.schemas.farm import FarmResponse
+from app.services.farm_documents import render_farm_document
+from app.services.farm_queries import FARM_ATTRIBUTE_COLUMNS
+
+pytestmark = pytest.mark.unit
+
+FarmRow = namedtuple("FarmRow", [column.key for column in FARM_ATTRIBUTE_COLUMNS] + ["geojson"])
+
+GEOJSON = (
+    '{"type":"MultiPolygon","coordinates":[[[[-46.63,-23.55],[-46.62,-23.55],[-46.63,-23.55]]]]}'
+)
+
+
+def _row(**values) -> FarmRow:
+    defaults = dict.fromkeys(FarmRow._fields)
+    defaults.update(values)
+    return FarmRow(**defaults)
+
+
+def test_render_farm_document_matches_schema():
+    """O documento montado sem Pydantic equivale ao ``FarmResponse`` serializado."""
+    row = _row(ogc_fid=7, cod_imovel="SP-7", num_area=12.5, municipio="São Paulo", geojson=GEOJSON)
+
+    document = render_farm_document(row)
+
+    values = {column.key: getattr(row, column.key) for column in FARM_ATTRIBUTE_COLUMNS}
+    expected = FarmResponse(**values, geometry=json.loads(GEOJSON)).model_dump(mode="json")
+    assert json.loads(document) == expected
+    # O GeoJSON do PostGIS entra no documento sem ser reescrito
+    assert GEOJSON.encode() in document
+
+
+def test_render_farm_document_without_geometry():
+    """Linhas sem geometria (geometry=none) geram ``"geometry": null``."""
+    document = json.loads(render_farm_document(_row(ogc_fid=1)))
+    assert document["geometry"] is None
+
+
+def test_fast_json_response_renders_compact_utf8():
+    """A resposta padrão da API serializa em JSON compacto UTF-8."""
+    response = FastJSONResponse({"municipio": "São Paulo", "total": 1})
+    assert response.body == '{"municipio":"São Paulo","total":1}'.encode()
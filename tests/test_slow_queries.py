@@ -0,0 +1,109 @@
+"""
+Testes unitários do registro de consultas lentas.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.db import slow_query_recorder
+from app.core.slow_queries import SlowQueryRecorder, explain_statement
+from app.main import app
+
+pytestmark = pytest.mark.unit
+
+client = TestClient(app)
+
+PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Limit",
+            "Plans": [{"Node Type": "Seq Scan", "Relation Name": "farms"}],
+        }
+    }
+]
+
+
+def test_record_keeps_last_entries_and_truncates_parameters():
+    """O buffer guarda as últimas consultas; listas longas de parâmetros são truncadas."""
+    recorder = SlowQueryRecorder(threshold_ms=100, capacity=2)
+    for index in range(3):
+        recorder.record(f"SELECT {index}", {"ids": list(range(50))}, 0.2)
+
+    entries = recorder.entries()
+
+    assert [entry["sql"] for entry in entries] == ["SELECT 2", "SELECT 1"]
+    assert entries[0]["duration_ms"] == 200.0
+    assert entries[0]["parameters"]["ids"][-1] == "... (+30)"
+    assert entries[0]["plan_status"] == "skipped"
+
+
+def test_explain_captures_plan_and_seq_scans():
+    """Consultas amostradas recebem o plano e as tabelas lidas sem índice."""
+    recorder = SlowQueryRecorder(threshold_ms=100, explain_sample_rate=1.0)
+    calls = []
+
+    def explain(entry, parameters):
+        calls.append(parameters)
+        recorder._finish(entry, PLAN)
+
+    recorder.record("SELECT * FROM farms WHERE x = %(x)s", {"x": -23.5}, 1.5, explain)
+
+    entry = recorder.entries()[0]
+    assert calls == [{"x": -23.5}]
+    assert entry["plan_status"] == "captured"
+    assert entry["seq_scans"] == ["farms"]
+
+
+def test_explain_runs_one_at_a_time():
+    """Com um EXPLAIN em andamento, ou para comandos sem plano, o plano não é capturado."""
+    recorder = SlowQueryRecorder(threshold_ms=100, explain_sample_rate=1.0)
+    pending = []
+
+    recorder.record("SELECT 1", (), 1.0, lambda entry, parameters: pending.append(entry))
+    second = recorder.record("SELECT 2", (), 1.0, lambda entry, parameters: pending.append(entry))
+    recorder._finish(pending[0], PLAN)
+    commit = recorder.record("COMMIT", (), 1.0, lambda entry, parameters: pending.append(entry))
+
+    assert len(pending) == 1
+    assert pending[0].plan_status == "captured"
+    assert second.plan_status == "skipped"
+    assert commit.plan_status == "skipped"
+
+
+def test_explain_analyzes_only_plain_select():
+    """Escritas e WITH (que pode conter DELETE) não são executadas de novo pelo EXPLAIN."""
+    assert explain_statement("\n  select * from farms").startswith("EXPLAIN (ANALYZE, BUFFERS,")
+    for statement in (
+        "WITH d AS (DELETE FROM farms RETURNING ogc_fid) SELECT count(*) FROM d",
+        "UPDATE farms SET municipio = 'x'",
+        "SELECTED",
+    ):
+        assert explain_statement(statement) == f"EXPLAIN (FORMAT JSON) {statement}"
+
+    recorder = SlowQueryRecorder(threshold_ms=100, explain_sample_rate=1.0)
+    write = recorder.record(
+        "WITH d AS (DELETE FROM farms RETURNING ogc_fid) SELECT count(*) FROM d",
+        (),
+        1.0,
+        lambda entry, parameters: recorder._finish(entry, PLAN),
+    )
+    read = recorder.record(
+        "SELECT 1", (), 1.0, lambda entry, parameters: recorder._finish(entry, PLAN)
+    )
+
+    assert (write.plan_status, write.plan_analyzed) == ("captured", False)
+    assert (read.plan_status, read.plan_analyzed) == ("captured", True)
+
+
+def test_slow_queries_endpoint(internal_headers):
+    """O endpoint retorna as consultas lentas mais recentes primeiro."""
+    slow_query_recorder.clear()
+    slow_query_recorder.record("SELECT 1", (-23.5, -46.6, 5000.0), 0.8)
+    slow_query_recorder.record("SELECT 2", (), 0.9)
+
+    response = client.get("/internal/slow-queries?limit=1", headers=internal_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["sql"] == "SELECT 2"
+    slow_query_recorder.clear()